@@ -1,5 +1,8 @@
+import multiprocessing
 import os
 from base64 import b64decode
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
 
 import falcon
 import sentry_sdk
@@ -10,6 +13,9 @@ from sentry_sdk import configure_scope
 from sentry_sdk.integrations.falcon import FalconIntegration
 
 import ebl.error_handler
+from ebl.bibliography.application.cached_bibliography_repository import (
+    CachedBibliographyRepository,
+)
 from ebl.bibliography.infrastructure.bibliography import MongoBibliographyRepository
 from ebl.bibliography.web.bootstrap import create_bibliography_routes
 from ebl.cdli.web.bootstrap import create_cdli_routes
@@ -22,17 +28,25 @@ from ebl.dictionary.infrastructure.dictionary import MongoWordRepository
 from ebl.dictionary.web.bootstrap import create_dictionary_routes
 from ebl.files.infrastructure.grid_fs_file_repository import GridFsFileRepository
 from ebl.files.web.bootstrap import create_files_route
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecIndex
+from ebl.fragmentarium.application.line_to_vec_store import MappedLineToVecIndex
 from ebl.fragmentarium.infrastructure.fragment_repository import MongoFragmentRepository
 from ebl.fragmentarium.infrastructure.mongo_annotations_repository import (
     MongoAnnotationsRepository,
 )
+from ebl.fragmentarium.infrastructure.mongo_line_to_vec_neighbours_repository import (
+    MongoLineToVecNeighboursRepository,
+)
 from ebl.fragmentarium.web.bootstrap import create_fragmentarium_routes
 from ebl.lemmatization.infrastrcuture.mongo_suggestions_finder import (
     MongoLemmaRepository,
 )
 from ebl.lemmatization.web.bootstrap import create_lemmatization_routes
 from ebl.signs.infrastructure.mongo_sign_repository import MongoSignRepository
+from ebl.signs.infrastructure.preloaded_sign_repository import PreloadedSignRepository
 from ebl.signs.web.bootstrap import create_signs_routes
+from ebl.transliteration.application.signs_index import SignsIndex
 
 from ebl.users.infrastructure.auth0 import Auth0Backend
 
@@ -47,6 +61,26 @@ def set_sentry_user(id_: str) -> None:
         scope.user = {"id": id_}
 
 
+def create_line_to_vec_index(
+    fragment_repository: FragmentRepository, changelog: Changelog
+) -> LineToVecIndex:
+    store = os.environ.get("LINE_TO_VEC_STORE")
+    return (
+        MappedLineToVecIndex(fragment_repository, changelog, store)
+        if store
+        else LineToVecIndex(fragment_repository)
+    )
+
+
+def create_atf_parser_executor() -> Optional[Executor]:
+    workers = int(os.environ.get("ATF_PARSER_WORKERS", 0))
+    return (
+        ProcessPoolExecutor(workers, multiprocessing.get_context("spawn"))
+        if workers > 1
+        else None
+    )
+
+
 def create_context():
     client = MongoClient(os.environ["MONGODB_URI"])
     database = client.get_database(os.environ.get("MONGODB_DB"))
@@ -56,19 +90,45 @@ def create_context():
         os.environ["AUTH0_ISSUER"],
         set_sentry_user,
     )
+    fragment_repository = MongoFragmentRepository(database)
+    text_repository = MongoTextRepository(database)
+    sign_repository = MongoSignRepository(database)
+    changelog = Changelog(database)
+    use_signs_index = os.environ.get("SIGNS_INDEX", "").lower() == "true"
     return Context(
         auth_backend=auth_backend,
         word_repository=MongoWordRepository(database),
-        sign_repository=MongoSignRepository(database),
+        sign_repository=PreloadedSignRepository(
+            sign_repository, sign_repository.find_all, sign_repository.find_version
+        ),
         public_file_repository=GridFsFileRepository(database, "fs"),
         photo_repository=GridFsFileRepository(database, "photos"),
         folio_repository=GridFsFileRepository(database, "folios"),
-        fragment_repository=MongoFragmentRepository(database),
-        changelog=Changelog(database),
-        bibliography_repository=MongoBibliographyRepository(database),
-        text_repository=MongoTextRepository(database),
+        fragment_repository=fragment_repository,
+        changelog=changelog,
+        bibliography_repository=CachedBibliographyRepository(
+            MongoBibliographyRepository(database)
+        ),
+        text_repository=text_repository,
         annotations_repository=MongoAnnotationsRepository(database),
         lemma_repository=MongoLemmaRepository(database),
+        line_to_vec_index=create_line_to_vec_index(fragment_repository, changelog),
+        line_to_vec_neighbours_repository=MongoLineToVecNeighboursRepository(database),
+        line_to_vec_workers=int(os.environ.get("LINE_TO_VEC_WORKERS", 0)),
+        fragment_signs_index=(
+            SignsIndex(
+                fragment_repository.query_transliterated_signs,
+                fragment_repository.query_signs_version,
+            )
+            if use_signs_index
+            else None
+        ),
+        chapter_signs_index=(
+            SignsIndex(text_repository.query_signs, text_repository.query_signs_version)
+            if use_signs_index
+            else None
+        ),
+        atf_parser_executor=create_atf_parser_executor(),
     )
 
 
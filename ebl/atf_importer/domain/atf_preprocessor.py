@@ -1,9 +1,9 @@
 import codecs
 import logging
+import os
 import re
 import traceback
 
-from lark import Lark
 
 from ebl.atf_importer.domain.atf_conversions import (
     Convert_Line_Dividers,
@@ -15,17 +15,16 @@ from ebl.atf_importer.domain.atf_conversions import (
     Line_Serializer,
 )
 from ebl.atf_importer.domain.atf_preprocessor_util import Util
+from ebl.transliteration.domain.lark_parser_cache import get_atf_parser, open_parser
+
+ORACC_GRAMMAR = os.path.join(os.path.dirname(__file__), "lark-oracc", "oracc_atf.lark")
 
 
 class ATFPreprocessor:
     def __init__(self, logdir, style):
-        self.EBL_PARSER = Lark.open(
-            "../../transliteration/domain/ebl_atf.lark",
-            maybe_placeholders=True,
-            rel_to=__file__,
-        )
-        self.ORACC_PARSER = Lark.open(
-            "lark-oracc/oracc_atf.lark", maybe_placeholders=True, rel_to=__file__
+        self.EBL_PARSER = get_atf_parser()
+        self.ORACC_PARSER = open_parser(
+            ORACC_GRAMMAR, ("start",), maybe_placeholders=True
         )
 
         self.logger = logging.getLogger("Atf-Preprocessor")
@@ -233,7 +232,7 @@ class ATFPreprocessor:
         return (None, None, None, None)
 
     def check_original_line(self, atf):
-        self.EBL_PARSER.parse(atf)
+        self.EBL_PARSER.parse(atf, start="start")
 
         # special case convert note lines in cdli atf
         if self.style == 2 and atf[0] == "#" and atf[1] == " ":
@@ -305,7 +304,7 @@ class ATFPreprocessor:
 
     def check_converted_line(self, original_atf, tree, conversion):
         try:
-            self.EBL_PARSER.parse(conversion[0])
+            self.EBL_PARSER.parse(conversion[0], start="start")
             self.logger.debug("Successfully parsed converted line")
             self.logger.debug(conversion[0])
             self.logger.debug(
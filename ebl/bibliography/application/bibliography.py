@@ -27,6 +27,13 @@ class Bibliography:
     def find(self, id_: str):
         return self._repository.query_by_id(id_)
 
+    def find_many(self, ids: Sequence[str]) -> Sequence[dict]:
+        entries = {entry["id"]: entry for entry in self._repository.query_by_ids(ids)}
+        missing = [id_ for id_ in dict.fromkeys(ids) if id_ not in entries]
+        if missing:
+            raise NotFoundError(f'Unknown bibliography entries: {", ".join(missing)}.')
+        return [entries[id_] for id_ in ids]
+
     def update(self, entry, user: User):
         old_entry = self._repository.query_by_id(entry["id"])
         self._changelog.create(
@@ -94,17 +101,7 @@ class Bibliography:
         )
 
     def validate_references(self, references: Sequence[Reference]):
-        def is_invalid(reference):
-            try:
-                self.find(reference.id)
-                return False
-            except NotFoundError:
-                return True
-
-        invalid_references = [
-            reference.id for reference in references if is_invalid(reference)
-        ]
-        if invalid_references:
-            raise DataError(
-                "Unknown bibliography entries: " f'{", ".join(invalid_references)}.'
-            )
+        try:
+            self.find_many([reference.id for reference in references])
+        except NotFoundError as error:
+            raise DataError(error) from error
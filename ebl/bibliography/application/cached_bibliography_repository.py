@@ -0,0 +1,113 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from ebl.bibliography.application.bibliography_repository import BibliographyRepository
+from ebl.cache import CacheInfo
+
+MAX_SIZE = int(os.environ.get("EBL_BIBLIOGRAPHY_CACHE_SIZE", 10_000))
+TTL = float(os.environ.get("EBL_BIBLIOGRAPHY_CACHE_TTL", 60))
+
+
+class CachedBibliographyRepository(BibliographyRepository):
+    # Entries are cached by id. Creating or updating an entry through the
+    # repository drops it from the cache, changes made by other processes are
+    # seen when the entry expires.
+    def __init__(
+        self,
+        delegate: BibliographyRepository,
+        maxsize: int = MAX_SIZE,
+        ttl: float = TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._delegate = delegate
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def create(self, entry) -> str:
+        try:
+            return self._delegate.create(entry)
+        finally:
+            self._invalidate(entry["id"])
+
+    def query_by_id(self, id_: str) -> dict:
+        entry = self._get(id_)
+        if entry is None:
+            entry = self._delegate.query_by_id(id_)
+            self._put([entry])
+        return copy.deepcopy(entry)
+
+    def query_by_ids(self, ids: Sequence[str]) -> Sequence[dict]:
+        entries: Dict[str, Optional[dict]] = {
+            id_: self._get(id_) for id_ in dict.fromkeys(ids)
+        }
+        missing = [id_ for id_, entry in entries.items() if entry is None]
+        if missing:
+            fetched = self._delegate.query_by_ids(missing)
+            self._put(fetched)
+            entries.update((entry["id"], entry) for entry in fetched)
+        return [copy.deepcopy(entry) for entry in entries.values() if entry]
+
+    def update(self, entry) -> None:
+        try:
+            self._delegate.update(entry)
+        finally:
+            self._invalidate(entry["id"])
+
+    def query_by_author_year_and_title(
+        self, author: Optional[str], year: Optional[int], title: Optional[str]
+    ) -> Sequence[dict]:
+        return self._delegate.query_by_author_year_and_title(author, year, title)
+
+    def query_by_container_title_and_collection_number(
+        self, container_title_short: Optional[str], collection_number: Optional[str]
+    ) -> Sequence[dict]:
+        return self._delegate.query_by_container_title_and_collection_number(
+            container_title_short, collection_number
+        )
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def _get(self, id_: str) -> Optional[dict]:
+        with self._lock:
+            if id_ in self._entries:
+                expires, entry = self._entries[id_]
+                if expires > self._clock():
+                    self._hits += 1
+                    self._entries.move_to_end(id_)
+                    return entry
+                del self._entries[id_]
+            self._misses += 1
+            return None
+
+    def _put(self, entries: Sequence[dict]) -> None:
+        with self._lock:
+            if self._maxsize > 0 and self._ttl > 0:
+                expires = self._clock() + self._ttl
+                for entry in entries:
+                    self._entries[entry["id"]] = (expires, entry)
+                    self._entries.move_to_end(entry["id"])
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+
+    def _invalidate(self, id_: str) -> None:
+        with self._lock:
+            self._entries.pop(id_, None)
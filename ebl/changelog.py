@@ -1,6 +1,8 @@
 import datetime
+from typing import List
 
 import dictdiffer
+import pymongo
 
 from ebl.mongo_collection import MongoCollection
 
@@ -26,3 +28,15 @@ class Changelog:
             user_profile, resource_type, old["_id"], list(dictdiffer.diff(old, new))
         )
         return self._collection.insert_one(entry)
+
+    def create_indexes(self) -> None:
+        self._collection.create_index(
+            [("resource_type", pymongo.ASCENDING), ("date", pymongo.ASCENDING)]
+        )
+
+    def query_resource_ids(self, resource_type: str, since: str) -> List[str]:
+        cursor = self._collection.find_many(
+            {"resource_type": resource_type, "date": {"$gte": since}},
+            projection={"resource_id": True},
+        )
+        return list(dict.fromkeys(entry["resource_id"] for entry in cursor))
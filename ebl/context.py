@@ -1,20 +1,34 @@
+from concurrent.futures import Executor
+from typing import Optional
+
 import attr
 from falcon_auth.backends import AuthBackend
 
 from ebl.bibliography.application.bibliography import Bibliography
 from ebl.bibliography.application.bibliography_repository import BibliographyRepository
 from ebl.changelog import Changelog
+from ebl.corpus.domain.chapter import ChapterId
 from ebl.corpus.infrastructure.mongo_text_repository import MongoTextRepository
 from ebl.dictionary.application.word_repository import WordRepository
 from ebl.files.application.file_repository import FileRepository
 from ebl.fragmentarium.application.annotations_repository import AnnotationsRepository
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.fragment_matcher import FragmentMatcher
 from ebl.fragmentarium.application.fragment_updater import FragmentUpdater
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecIndex
+from ebl.fragmentarium.application.line_to_vec_neighbours_repository import (
+    LineToVecNeighboursRepository,
+)
+from ebl.fragmentarium.application.parallel_fragment_matcher import (
+    ParallelFragmentMatcher,
+)
 from ebl.fragmentarium.application.transliteration_update_factory import (
     TransliterationUpdateFactory,
 )
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
 from ebl.lemmatization.application.suggestion_finder import LemmaRepository
 from ebl.transliteration.application.sign_repository import SignRepository
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.transliteration.application.transliteration_query_factory import (
     TransliterationQueryFactory,
 )
@@ -34,6 +48,12 @@ class Context:
     text_repository: MongoTextRepository
     annotations_repository: AnnotationsRepository
     lemma_repository: LemmaRepository
+    line_to_vec_index: LineToVecIndex
+    line_to_vec_neighbours_repository: LineToVecNeighboursRepository
+    line_to_vec_workers: int = 0
+    fragment_signs_index: Optional[SignsIndex[MuseumNumber]] = None
+    chapter_signs_index: Optional[SignsIndex[ChapterId]] = None
+    atf_parser_executor: Optional[Executor] = None
 
     def get_bibliography(self):
         return Bibliography(self.bibliography_repository, self.changelog)
@@ -44,10 +64,31 @@ class Context:
             self.changelog,
             self.get_bibliography(),
             self.photo_repository,
+            self.line_to_vec_index,
+            self.fragment_signs_index,
+            self.lemma_repository,
+        )
+
+    def get_fragment_matcher(self) -> FragmentMatcher:
+        return (
+            ParallelFragmentMatcher(
+                self.fragment_repository,
+                self.line_to_vec_index,
+                self.line_to_vec_neighbours_repository,
+                self.line_to_vec_workers,
+            )
+            if self.line_to_vec_workers > 1
+            else FragmentMatcher(
+                self.fragment_repository,
+                self.line_to_vec_index,
+                self.line_to_vec_neighbours_repository,
+            )
         )
 
     def get_transliteration_update_factory(self):
-        return TransliterationUpdateFactory(self.sign_repository)
+        return TransliterationUpdateFactory(
+            self.sign_repository, self.atf_parser_executor
+        )
 
     def get_transliteration_query_factory(self):
         return TransliterationQueryFactory(self.sign_repository)
@@ -1,4 +1,4 @@
-from typing import cast, Iterable, List, Optional, Sequence
+from typing import cast, Dict, Iterable, List, Optional, Sequence
 
 import attr
 from singledispatchmethod import singledispatchmethod
@@ -15,6 +15,7 @@ class ChapterHydartor(ChapterVisitor):
         self._bibliography: Bibliography = bibliography
         self._chapter: Optional[Chapter] = None
         self._manuscripts: List[Manuscript] = []
+        self._documents: Dict[str, dict] = {}
 
     @property
     def chapter(self) -> Chapter:
@@ -29,6 +30,7 @@ class ChapterHydartor(ChapterVisitor):
 
     @visit.register(Chapter)  # pyre-ignore[56]
     def _visit_chapter(self, chapter: Chapter) -> None:
+        self._fetch_documents(chapter.manuscripts)
         for manuscript in chapter.manuscripts:
             self.visit(manuscript)
 
@@ -39,7 +41,14 @@ class ChapterHydartor(ChapterVisitor):
     def _visit_manuscript(self, manuscript: Manuscript) -> None:
         self._manuscripts.append(self.hydrate_manuscript(manuscript))
 
+    def hydrate_manuscripts(
+        self, manuscripts: Sequence[Manuscript]
+    ) -> Sequence[Manuscript]:
+        self._fetch_documents(manuscripts)
+        return tuple(self.hydrate_manuscript(manuscript) for manuscript in manuscripts)
+
     def hydrate_manuscript(self, manuscript: Manuscript) -> Manuscript:
+        self._fetch_documents([manuscript])
         references = self._hydrate_references(manuscript.references)
         return attr.evolve(manuscript, references=references)
 
@@ -49,5 +58,16 @@ class ChapterHydartor(ChapterVisitor):
         return tuple(self._hydrate_reference(reference) for reference in references)
 
     def _hydrate_reference(self, reference: Reference) -> Reference:
-        document = self._bibliography.find(reference.id)
-        return attr.evolve(reference, document=document)
+        return attr.evolve(reference, document=self._documents[reference.id])
+
+    def _fetch_documents(self, manuscripts: Iterable[Manuscript]) -> None:
+        ids = list(
+            dict.fromkeys(
+                reference.id
+                for manuscript in manuscripts
+                for reference in manuscript.references
+                if reference.id not in self._documents
+            )
+        )
+        if ids:
+            self._documents.update(zip(ids, self._bibliography.find_many(ids)))
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Sequence
+from concurrent.futures import Executor
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 from ebl.corpus.application.alignment_updater import AlignmentUpdater
 from ebl.corpus.application.chapter_hydrator import ChapterHydartor
@@ -19,13 +20,27 @@ from ebl.corpus.domain.parser import parse_chapter
 from ebl.corpus.domain.text import Text, TextId
 from ebl.errors import Defect, NotFoundError, DataError
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.lemmatization.application.suggestion_finder import LemmaRepository
+from ebl.lemmatization.domain.lemma_counts import count_lemmas
 from ebl.transliteration.application.sign_repository import SignRepository
+from ebl.transliteration.application.signs_index import SignsIndex
+from ebl.transliteration.domain.text_line import TextLine
+from ebl.transliteration.domain.tokens import Token
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 from ebl.users.domain.user import User
 
 COLLECTION = "chapters"
 
 
+def get_tokens(chapter: Chapter) -> Iterator[Token]:
+    for line in chapter.lines:
+        for variant in line.variants:
+            yield from variant.reconstruction
+            for manuscript in variant.manuscripts:
+                if isinstance(manuscript.line, TextLine):
+                    yield from manuscript.line.content
+
+
 class TextRepository(ABC):
     @abstractmethod
     def create(self, text: Text) -> None:
@@ -43,6 +58,10 @@ class TextRepository(ABC):
     def find_chapter(self, id_: ChapterId) -> Chapter:
         ...
 
+    @abstractmethod
+    def find_chapters(self, ids: Sequence[ChapterId]) -> List[Chapter]:
+        ...
+
     @abstractmethod
     def list(self) -> List[Text]:
         ...
@@ -55,6 +74,14 @@ class TextRepository(ABC):
     def query_by_transliteration(self, query: TransliterationQuery) -> List[Chapter]:
         ...
 
+    @abstractmethod
+    def query_signs(self) -> List[Tuple[ChapterId, Sequence[str]]]:
+        ...
+
+    @abstractmethod
+    def query_signs_version(self) -> int:
+        ...
+
 
 class Corpus:
     def __init__(
@@ -63,11 +90,17 @@ class Corpus:
         bibliography,
         changelog,
         sign_repository: SignRepository,
+        signs_index: Optional[SignsIndex[ChapterId]] = None,
+        parser_executor: Optional[Executor] = None,
+        lemma_repository: Optional[LemmaRepository] = None,
     ):
         self._repository: TextRepository = repository
         self._bibliography = bibliography
         self._changelog = changelog
         self._sign_repository = sign_repository
+        self._signs_index = signs_index
+        self._parser_executor = parser_executor
+        self._lemma_repository = lemma_repository
 
     def find(self, id_: TextId) -> Text:
         return self._repository.find(id_)
@@ -82,10 +115,17 @@ class Corpus:
             if query.is_empty()
             else [
                 ChapterInfo.of(chapter, query)
-                for chapter in self._repository.query_by_transliteration(query)
+                for chapter in self._query_by_transliteration(query)
             ]
         )
 
+    def _query_by_transliteration(self, query: TransliterationQuery) -> List[Chapter]:
+        return (
+            self._repository.find_chapters(self._signs_index.search(query))
+            if self._signs_index
+            else self._repository.query_by_transliteration(query)
+        )
+
     def list(self) -> List[Text]:
         return self._repository.list()
 
@@ -108,9 +148,7 @@ class Corpus:
     ) -> Chapter:
         try:
             hydrator = ChapterHydartor(self._bibliography)
-            manuscripts = tuple(
-                hydrator.hydrate_manuscript(manuscript) for manuscript in manuscripts
-            )
+            manuscripts = hydrator.hydrate_manuscripts(manuscripts)
         except NotFoundError as error:
             raise DataError(error) from error
 
@@ -122,7 +160,7 @@ class Corpus:
 
     def import_lines(self, id_: ChapterId, atf: str, user: User) -> Chapter:
         chapter = self.find_chapter(id_)
-        lines = parse_chapter(atf, chapter.manuscripts)
+        lines = parse_chapter(atf, chapter.manuscripts, executor=self._parser_executor)
         return self.update_lines(id_, LinesUpdate(lines, set(), {}), user)
 
     def update_lines(self, id_: ChapterId, lines: LinesUpdate, user: User) -> Chapter:
@@ -144,6 +182,12 @@ class Corpus:
         self._validate_chapter(updated)
         self._create_changelog(old, updated, user)
         self._repository.update(id_, updated)
+        if self._signs_index:
+            self._signs_index.update(id_, updated.signs)
+        if self._lemma_repository:
+            self._lemma_repository.update_chapter_lemmas(
+                id_, count_lemmas(get_tokens(updated))
+            )
 
     def _validate_chapter(self, chapter: Chapter) -> None:
         TextValidator().visit(chapter)
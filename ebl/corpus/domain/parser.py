@@ -1,24 +1,69 @@
+import re
+from concurrent.futures import Executor
 from typing import Iterable, Optional, Sequence, Union
 
+from lark.tree import Tree
+
 from ebl.corpus.domain.chapter_transformer import ChapterTransformer
 from ebl.corpus.domain.line import Line
 from ebl.corpus.domain.manuscript import Manuscript
 from ebl.errors import DataError
 from ebl.transliteration.domain.dollar_line import DollarLine
-from ebl.transliteration.domain.lark_parser import CHAPTER_PARSER, PARSE_ERRORS
+from ebl.transliteration.domain.lark_parser import (
+    PARALLEL_THRESHOLD,
+    PARSE_ERRORS,
+    create_batches,
+)
+from ebl.transliteration.domain.lark_parser_cache import get_atf_parser
 from ebl.transliteration.domain.note_line import NoteLine
+from ebl.transliteration.domain.parse_cache import PARSE_CACHE
+
+CHAPTER_LINE_SEPARATOR = re.compile(r"(?:\r?\n){2,}")
 
 
 def parse_chapter(
-    atf: str, manuscripts: Iterable[Manuscript], start: Optional[str] = None
+    atf: str,
+    manuscripts: Iterable[Manuscript],
+    start: Optional[str] = None,
+    executor: Optional[Executor] = None,
 ) -> Sequence[Line]:
     try:
-        tree = CHAPTER_PARSER.parse(atf, start=start)
+        tree = (
+            get_atf_parser().parse(atf, start=start)
+            if start
+            else parse_chapter_tree(atf, executor)
+        )
         return ChapterTransformer(manuscripts).transform(tree)
     except PARSE_ERRORS as error:
         raise DataError(error) from error
 
 
+def parse_chapter_tree(atf: str, executor: Optional[Executor] = None) -> Tree:
+    lines = CHAPTER_LINE_SEPARATOR.split(atf)
+    try:
+        batches = (
+            executor.map(parse_chapter_line_trees, create_batches(lines))
+            if executor is not None and atf.count("\n") >= PARALLEL_THRESHOLD
+            else [parse_chapter_line_trees(lines)]
+        )
+        return Tree("chapter", [tree for batch in batches for tree in batch])
+    except PARSE_ERRORS:
+        # Parse the whole chapter to get the error with the correct position.
+        return get_atf_parser().parse(atf, start="chapter")
+
+
+def parse_chapter_line_trees(lines: Sequence[str]) -> Sequence[Tree]:
+    return [parse_chapter_line_tree(line) for line in lines]
+
+
+def parse_chapter_line_tree(atf: str) -> Tree:
+    # Trees are cached instead of lines, because the transformation depends on
+    # the manuscripts.
+    return PARSE_CACHE.get(
+        "chapter_line", atf, lambda: get_atf_parser().parse(atf, start="chapter_line")
+    )
+
+
 def parse_paratext(atf: str) -> Union[NoteLine, DollarLine]:
-    tree = CHAPTER_PARSER.parse(atf, start="paratext")
+    tree = get_atf_parser().parse(atf, start="paratext")
     return ChapterTransformer(tuple()).transform(tree)
@@ -1,14 +1,22 @@
-from typing import List
+from typing import List, Sequence, Tuple
 
 import pymongo
 
 from ebl.bibliography.infrastructure.bibliography import join_reference_documents
 from ebl.corpus.application.corpus import TextRepository
+from ebl.corpus.application.id_schemas import TextIdSchema
 from ebl.corpus.domain.chapter import Chapter, ChapterId
+from ebl.corpus.domain.stage import Stage
 from ebl.corpus.domain.text import Text, TextId
 from ebl.errors import NotFoundError
 from ebl.mongo_collection import MongoCollection
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+from ebl.transliteration.infrastructure.queries import (
+    SIGN_NGRAMS,
+    match_signs,
+    sign_ngrams,
+)
+from ebl.transliteration.infrastructure.signs_versions import SignsVersions
 from ebl.corpus.application.schemas import ChapterSchema, TextSchema
 
 
@@ -66,6 +74,7 @@ class MongoTextRepository(TextRepository):
     def __init__(self, database):
         self._texts = MongoCollection(database, TEXTS_COLLECTION)
         self._chapters = MongoCollection(database, CHAPTERS_COLLECTION)
+        self._signs_versions = SignsVersions(database, CHAPTERS_COLLECTION)
 
     def create_indexes(self) -> None:
         self._texts.create_index(
@@ -101,12 +110,18 @@ class MongoTextRepository(TextRepository):
             ],
             unique=True,
         )
+        self._chapters.create_index([(SIGN_NGRAMS, pymongo.ASCENDING)])
 
     def create(self, text: Text) -> None:
         self._texts.insert_one(TextSchema(exclude=["chapters"]).dump(text))
 
     def create_chapter(self, chapter: Chapter) -> None:
-        self._chapters.insert_one(ChapterSchema().dump(chapter))
+        try:
+            self._chapters.insert_one(
+                {**ChapterSchema().dump(chapter), **sign_ngrams(chapter.signs)}
+            )
+        finally:
+            self._signs_versions.bump()
 
     def find(self, id_: TextId) -> Text:
         try:
@@ -133,12 +148,25 @@ class MongoTextRepository(TextRepository):
     def find_chapter(self, id_: ChapterId) -> Chapter:
         try:
             chapter = self._chapters.find_one(
-                chapter_id_query(id_), projection={"_id": False}
+                chapter_id_query(id_), projection={"_id": False, SIGN_NGRAMS: False}
             )
             return ChapterSchema().load(chapter)
         except NotFoundError:
             raise chapter_not_found(id_)
 
+    def find_chapters(self, ids: Sequence[ChapterId]) -> List[Chapter]:
+        if not ids:
+            return []
+        chapters = ChapterSchema().load(
+            self._chapters.find_many(
+                {"$or": [chapter_id_query(id_) for id_ in ids]},
+                projection={"_id": False, SIGN_NGRAMS: False},
+            ),
+            many=True,
+        )
+        chapters_by_id = {chapter.id_: chapter for chapter in chapters}
+        return [chapters_by_id[id_] for id_ in ids if id_ in chapters_by_id]
+
     def list(self) -> List[Text]:
         return TextSchema().load(
             self._texts.aggregate(
@@ -157,27 +185,51 @@ class MongoTextRepository(TextRepository):
         )
 
     def update(self, id_: ChapterId, chapter: Chapter) -> None:
-        self._chapters.update_one(
-            chapter_id_query(id_),
-            {
-                "$set": ChapterSchema(
-                    only=[
-                        "manuscripts",
-                        "uncertain_fragments",
-                        "lines",
-                        "signs",
-                        "parser_version",
-                    ]
-                ).dump(chapter)
-            },
-        )
+        try:
+            self._chapters.update_one(
+                chapter_id_query(id_),
+                {
+                    "$set": {
+                        **ChapterSchema(
+                            only=[
+                                "manuscripts",
+                                "uncertain_fragments",
+                                "lines",
+                                "signs",
+                                "parser_version",
+                            ]
+                        ).dump(chapter),
+                        **sign_ngrams(chapter.signs),
+                    }
+                },
+            )
+        finally:
+            self._signs_versions.bump()
 
     def query_by_transliteration(self, query: TransliterationQuery) -> List[Chapter]:
         return ChapterSchema().load(
             self._chapters.find_many(
-                {"signs": {"$regex": query.regexp}},
-                projection={"_id": False},
+                match_signs(query),
+                projection={"_id": False, SIGN_NGRAMS: False},
                 limit=100,
             ),
             many=True,
         )
+
+    def query_signs(self) -> List[Tuple[ChapterId, Sequence[str]]]:
+        return [
+            (
+                ChapterId(
+                    TextIdSchema().load(chapter["textId"]),
+                    Stage(chapter["stage"]),
+                    chapter["name"],
+                ),
+                chapter.get("signs", []),
+            )
+            for chapter in self._chapters.find_many(
+                {}, projection=["textId", "stage", "name", "signs"]
+            )
+        ]
+
+    def query_signs_version(self) -> int:
+        return self._signs_versions.find()
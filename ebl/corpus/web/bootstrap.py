@@ -19,6 +19,9 @@ def create_corpus_routes(api: falcon.API, context: Context):
         context.get_bibliography(),
         context.changelog,
         context.sign_repository,
+        context.chapter_signs_index,
+        context.atf_parser_executor,
+        context.lemma_repository,
     )
     context.text_repository.create_indexes()
 
@@ -19,8 +19,14 @@ class Dictionary:
     def find(self, id_):
         return self._repository.query_by_id(id_)
 
-    def search(self, query: str) -> Sequence:
-        return self._repository.query_by_lemma_form_or_meaning(query)
+    def find_many(self, ids: Sequence[WordId]) -> Sequence:
+        return self._repository.query_by_ids(ids)
+
+    def search(self, query: str, page: int = 0) -> Sequence:
+        return self._repository.query_by_lemma_form_or_meaning(query, page)
+
+    def count(self, query: str) -> int:
+        return self._repository.count_by_lemma_form_or_meaning(query)
 
     def search_lemma(self, lemma: str) -> Sequence:
         return self._repository.query_by_lemma_prefix(lemma)
@@ -3,8 +3,14 @@ from typing import Sequence
 
 from ebl.dictionary.domain.word import WordId
 
+SEARCH_PAGE_SIZE = 100
+
 
 class WordRepository(ABC):
+    @abstractmethod
+    def create_indexes(self) -> None:
+        ...
+
     @abstractmethod
     def create(self, word) -> WordId:
         ...
@@ -14,7 +20,15 @@ class WordRepository(ABC):
         ...
 
     @abstractmethod
-    def query_by_lemma_form_or_meaning(self, query: str) -> Sequence:
+    def query_by_ids(self, ids: Sequence[WordId]) -> Sequence:
+        ...
+
+    @abstractmethod
+    def query_by_lemma_form_or_meaning(self, query: str, page: int = 0) -> Sequence:
+        ...
+
+    @abstractmethod
+    def count_by_lemma_form_or_meaning(self, query: str) -> int:
         ...
 
     @abstractmethod
@@ -1,13 +1,72 @@
 import re
-from typing import Sequence
+import unicodedata
+from typing import Iterable, List, Mapping, Sequence
+
+import pymongo
+from pymongo import UpdateOne
 
 from ebl.changelog import Changelog
-from ebl.dictionary.application.word_repository import WordRepository
+from ebl.dictionary.application.word_repository import SEARCH_PAGE_SIZE, WordRepository
 from ebl.dictionary.domain.word import WordId
+from ebl.errors import NotFoundError
 from ebl.mongo_collection import MongoCollection
 
 COLLECTION = "words"
 LEMMA_SEARCH_LIMIT = 15
+LEMMA_KEYS = "lemmaKeys"
+MEANING_TOKENS = "meaningTokens"
+LEMMA_COLLATION = {"locale": "en", "strength": 1, "normalization": True}
+
+
+def fold_lemma(text: str) -> str:
+    # Approximates the primary strength collation used by the old search.
+    return "".join(
+        character
+        for character in unicodedata.normalize("NFD", text)
+        if not unicodedata.combining(character)
+    ).casefold()
+
+
+def create_lemma_keys(word) -> Sequence[str]:
+    lemmas = [word["lemma"], *(form["lemma"] for form in word.get("forms", []))]
+    return sorted(
+        {fold_lemma("".join(f"{part} " for part in lemma)) for lemma in lemmas}
+    )
+
+
+def tokenize_meaning(text: str) -> Sequence[str]:
+    return re.findall(r"\w+", fold_lemma(text))
+
+
+def create_search_keys(word) -> Mapping[str, Sequence[str]]:
+    return {
+        LEMMA_KEYS: create_lemma_keys(word),
+        MEANING_TOKENS: sorted(set(tokenize_meaning(word.get("meaning", "")))),
+    }
+
+
+def _create_meaning_queries(query: str) -> Sequence[dict]:
+    # Words saved before the tokens were added.
+    queries = [{MEANING_TOKENS: None, "meaning": {"$regex": re.escape(query)}}]
+    tokens = tokenize_meaning(query)
+    if tokens:
+        # The last token may not have been typed to the end.
+        *complete, last = tokens
+        queries.append(
+            {MEANING_TOKENS: {"$all": [*complete, re.compile(f"^{re.escape(last)}")]}}
+        )
+    return queries
+
+
+def _create_lemma_form_or_meaning_match(query: str) -> dict:
+    lemma = query.split(" ")
+    return {
+        "$or": [
+            {"lemma": lemma},
+            {"forms": {"$elemMatch": {"lemma": lemma}}},
+            *_create_meaning_queries(query),
+        ]
+    }
 
 
 def _create_substring_expression(query, _input):
@@ -31,28 +90,9 @@ def _create_substring_expression(query, _input):
     }
 
 
-def _create_lemma_search_pipeline(query):
+def _create_lemma_search_pipeline(match: dict) -> Sequence[dict]:
     return [
-        {
-            "$match": {
-                "$or": [
-                    {"$expr": _create_substring_expression(query, "$lemma")},
-                    {
-                        "$expr": {
-                            "$anyElementTrue": {
-                                "$map": {
-                                    "input": "$forms",
-                                    "as": "form",
-                                    "in": _create_substring_expression(
-                                        query, "$$form.lemma"
-                                    ),
-                                }
-                            }
-                        }
-                    },
-                ]
-            }
-        },
+        {"$match": match},
         {
             "$addFields": {
                 "lemmaLength": {
@@ -68,10 +108,42 @@ def _create_lemma_search_pipeline(query):
         },
         {"$sort": {"lemmaLength": 1, "_id": 1}},
         {"$limit": LEMMA_SEARCH_LIMIT},
-        {"$project": {"lemmaLength": 0}},
+        {"$project": {"lemmaLength": 0, LEMMA_KEYS: 0, MEANING_TOKENS: 0}},
     ]
 
 
+def _create_lemma_keys_match(query: str) -> dict:
+    return {LEMMA_KEYS: {"$regex": f"^{re.escape(fold_lemma(query))}"}}
+
+
+def _create_legacy_lemma_match(query: str) -> dict:
+    # Words saved before the keys were added. Has to be run with
+    # LEMMA_COLLATION to ignore case and diacritics.
+    return {
+        LEMMA_KEYS: None,
+        "$or": [
+            {"$expr": _create_substring_expression(query, "$lemma")},
+            {
+                "$expr": {
+                    "$anyElementTrue": {
+                        "$map": {
+                            "input": "$forms",
+                            "as": "form",
+                            "in": _create_substring_expression(query, "$$form.lemma"),
+                        }
+                    }
+                }
+            },
+        ],
+    }
+
+
+def _sort_by_lemma_length(words: Iterable[dict]) -> List[dict]:
+    return sorted(
+        words, key=lambda word: (sum(len(part) for part in word["lemma"]), word["_id"])
+    )[:LEMMA_SEARCH_LIMIT]
+
+
 class MongoDictionary:
     def __init__(self, database):
         self._collection = MongoCollection(database, COLLECTION)
@@ -99,8 +171,15 @@ class MongoDictionary:
 
     def search_lemma(self, query):
         cursor = self._collection.aggregate(
-            _create_lemma_search_pipeline(query),
-            collation={"locale": "en", "strength": 1, "normalization": True},
+            _create_lemma_search_pipeline(
+                {
+                    "$or": [
+                        _create_lemma_keys_match(query),
+                        _create_legacy_lemma_match(query),
+                    ]
+                }
+            ),
+            collation=LEMMA_COLLATION,
         )
 
         return [word for word in cursor]
@@ -116,33 +195,106 @@ class MongoWordRepository(WordRepository):
         self._collection = MongoCollection(database, COLLECTION)
         self._changelog = Changelog(database)
 
+    def create_indexes(self) -> None:
+        self._collection.create_index([(LEMMA_KEYS, pymongo.ASCENDING)])
+        self._collection.create_index([(MEANING_TOKENS, pymongo.ASCENDING)])
+        self._collection.create_index([("lemma", pymongo.ASCENDING)])
+        self._collection.create_index([("forms.lemma", pymongo.ASCENDING)])
+
     def create(self, document):
-        return self._collection.insert_one(document)
+        return self._collection.insert_one({**document, **create_search_keys(document)})
 
     def query_by_id(self, id_: WordId):
-        return self._collection.find_one_by_id(id_)
+        return self._collection.find_one(
+            {"_id": id_}, projection={LEMMA_KEYS: False, MEANING_TOKENS: False}
+        )
+
+    def query_by_ids(self, ids: Sequence[WordId]) -> Sequence:
+        words = {
+            word["_id"]: word
+            for word in self._collection.find_many(
+                {"_id": {"$in": list(set(ids))}},
+                projection={LEMMA_KEYS: False, MEANING_TOKENS: False},
+            )
+        }
+        missing = [id_ for id_ in ids if id_ not in words]
+        if missing:
+            raise NotFoundError(f"Words {missing} not found.")
+        return [words[id_] for id_ in ids]
 
-    def query_by_lemma_form_or_meaning(self, query: str) -> Sequence:
+    def query_by_lemma_form_or_meaning(self, query: str, page: int = 0) -> Sequence:
         lemma = query.split(" ")
-        cursor = self._collection.find_many(
-            {
-                "$or": [
-                    {"lemma": lemma},
-                    {"forms": {"$elemMatch": {"lemma": lemma}}},
-                    {"meaning": {"$regex": re.escape(query)}},
-                ]
-            }
+        cursor = self._collection.aggregate(
+            [
+                {"$match": _create_lemma_form_or_meaning_match(query)},
+                {
+                    "$addFields": {
+                        "rank": {
+                            "$switch": {
+                                "branches": [
+                                    {"case": {"$eq": ["$lemma", lemma]}, "then": 0},
+                                    {
+                                        "case": {
+                                            "$in": [
+                                                lemma,
+                                                {"$ifNull": ["$forms.lemma", []]},
+                                            ]
+                                        },
+                                        "then": 1,
+                                    },
+                                ],
+                                "default": 2,
+                            }
+                        }
+                    }
+                },
+                {"$sort": {"rank": 1, "_id": 1}},
+                {"$skip": page * SEARCH_PAGE_SIZE},
+                {"$limit": SEARCH_PAGE_SIZE},
+                {"$project": {"rank": 0, LEMMA_KEYS: 0, MEANING_TOKENS: 0}},
+            ]
         )
 
         return [word for word in cursor]
 
-    def query_by_lemma_prefix(self, query: str) -> Sequence:
-        cursor = self._collection.aggregate(
-            _create_lemma_search_pipeline(query),
-            collation={"locale": "en", "strength": 1, "normalization": True},
+    def count_by_lemma_form_or_meaning(self, query: str) -> int:
+        return self._collection.count_documents(
+            _create_lemma_form_or_meaning_match(query)
         )
 
-        return [word for word in cursor]
+    def query_by_lemma_prefix(self, query: str) -> Sequence:
+        # The keys are matched without a collation so that the index is used.
+        # The collation only applies to the words without keys, which are
+        # found through the same index.
+        return _sort_by_lemma_length(
+            [
+                *self._collection.aggregate(
+                    _create_lemma_search_pipeline(_create_lemma_keys_match(query))
+                ),
+                *self._collection.aggregate(
+                    _create_lemma_search_pipeline(_create_legacy_lemma_match(query)),
+                    collation=LEMMA_COLLATION,
+                ),
+            ]
+        )
 
     def update(self, word) -> None:
-        self._collection.update_one({"_id": word["_id"]}, {"$set": word})
+        self._collection.update_one(
+            {"_id": word["_id"]}, {"$set": {**word, **create_search_keys(word)}}
+        )
+
+    def update_search_keys(self) -> int:
+        words = list(
+            self._collection.find_many(
+                {}, projection=["lemma", "forms.lemma", "meaning"]
+            )
+        )
+        if words:
+            self._collection.bulk_write(
+                [
+                    UpdateOne({"_id": word["_id"]}, {"$set": create_search_keys(word)})
+                    for word in words
+                ],
+                ordered=False,
+            )
+        return len(words)
@@ -0,0 +1,13 @@
+import os
+
+from pymongo import MongoClient
+
+from ebl.dictionary.infrastructure.dictionary import MongoWordRepository
+
+if __name__ == "__main__":
+    client = MongoClient(os.environ["MONGODB_URI"])
+    repository = MongoWordRepository(client.get_database(os.environ.get("MONGODB_DB")))
+    repository.create_indexes()
+    updated = repository.update_search_keys()
+
+    print(f"Updated the search keys of {updated} words.")
@@ -7,6 +7,7 @@ from ebl.dictionary.web.words import WordsResource
 
 
 def create_dictionary_routes(api: falcon.API, context: Context):
+    context.word_repository.create_indexes()
     dictionary = Dictionary(context.word_repository, context.changelog)
     words = WordsResource(dictionary)
     word_search = WordSearch(dictionary)
@@ -1,18 +1,51 @@
+from urllib.parse import urlencode
+
 import falcon
 
+from ebl.dictionary.application.word_repository import SEARCH_PAGE_SIZE
 from ebl.dispatcher import create_dispatcher
+from ebl.errors import DataError
 from ebl.users.web.require_scope import require_scope
 
 
 class WordSearch:
     def __init__(self, dictionary):
+        self._dictionary = dictionary
         self._dispatch = create_dispatcher(
             {
                 frozenset(["query"]): lambda value: dictionary.search(**value),
+                frozenset(["query", "page"]): lambda value: dictionary.search(
+                    value["query"], self._validate_page(value["page"])
+                ),
                 frozenset(["lemma"]): lambda value: dictionary.search_lemma(**value),
             }
         )
 
+    @staticmethod
+    def _validate_page(page: str) -> int:
+        try:
+            number = int(page)
+        except ValueError:
+            raise DataError(f'Page "{page}" not numeric.')
+        if number < 0:
+            raise DataError(f'Page "{page}" is negative.')
+        return number
+
     @falcon.before(require_scope, "read:words")
     def on_get(self, req, resp):
         resp.media = self._dispatch(req.params)
+        if "query" in req.params:
+            self._add_paging(req, resp)
+
+    def _add_paging(self, req, resp) -> None:
+        # Query searches are paged. The body stays a list of words, the total
+        # and the next page are returned in headers.
+        query = req.params["query"]
+        page = self._validate_page(req.params.get("page", "0"))
+        total = self._dictionary.count(query)
+        resp.set_header("X-Total-Count", str(total))
+        resp.set_header("Access-Control-Expose-Headers", "Link, X-Total-Count")
+        if (page + 1) * SEARCH_PAGE_SIZE < total:
+            resp.add_link(
+                f"{req.path}?{urlencode({'query': query, 'page': page + 1})}", "next"
+            )
@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from ebl.bibliography.application.bibliography import Bibliography
 from ebl.dictionary.application.dictionary import Dictionary
@@ -8,6 +8,7 @@ from ebl.fragmentarium.domain.folios import Folio
 from ebl.fragmentarium.domain.fragment import Fragment
 from ebl.fragmentarium.domain.fragment_info import FragmentInfo
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 
 
@@ -19,6 +20,7 @@ class FragmentFinder:
         dictionary: Dictionary,
         photos: FileRepository,
         folios: FileRepository,
+        signs_index: Optional[SignsIndex[MuseumNumber]] = None,
     ):
 
         self._bibliography = bibliography
@@ -26,6 +28,7 @@ class FragmentFinder:
         self._dictionary = dictionary
         self._photos = photos
         self._folios = folios
+        self._signs_index = signs_index
 
     def find(self, number: MuseumNumber) -> Tuple[Fragment, bool]:
         return (
@@ -45,10 +48,18 @@ class FragmentFinder:
         self, id: str, pages: str
     ) -> List[FragmentInfo]:
         fragment_infos = self.search_references(id, pages)
+        ids = list(
+            dict.fromkeys(
+                reference.id
+                for fragment_info in fragment_infos
+                for reference in fragment_info.references
+            )
+        )
+        documents = dict(zip(ids, self._bibliography.find_many(ids))) if ids else {}
         fragment_infos_with_documents = []
         for fragment_info in fragment_infos:
             references_with_documents = [
-                reference.set_document(self._bibliography.find(reference.id))
+                reference.set_document(documents[reference.id])
                 for reference in fragment_info.references
             ]
             fragment_infos_with_documents.append(
@@ -74,9 +85,16 @@ class FragmentFinder:
         else:
             return [
                 FragmentInfo.of(fragment, fragment.get_matching_lines(query))
-                for fragment in self._repository.query_by_transliteration(query)
+                for fragment in self._query_by_transliteration(query)
             ]
 
+    def _query_by_transliteration(self, query: TransliterationQuery) -> List[Fragment]:
+        return (
+            self._repository.query_by_museum_numbers(self._signs_index.search(query))
+            if self._signs_index
+            else self._repository.query_by_transliteration(query)
+        )
+
     def find_random(self) -> List[FragmentInfo]:
         return list(
             map(FragmentInfo.of, self._repository.query_random_by_transliterated())
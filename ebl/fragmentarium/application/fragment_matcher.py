@@ -1,44 +1,85 @@
-from typing import ClassVar, List, Tuple
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 import attr
 
+from ebl.errors import NotFoundError
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
-from ebl.fragmentarium.application.line_to_vec import LineToVecScore
-from ebl.fragmentarium.application.matches.line_to_vec_score import (
-    score,
-    score_weighted,
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry, LineToVecScore
+from ebl.fragmentarium.application.line_to_vec_index import (
+    LineToVecIndex,
+    LineToVecSnapshot,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours_repository import (
+    LineToVecNeighboursRepository,
 )
 from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncodings
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
 
 
+RankedScore = Tuple[int, int, LineToVecScore]
+Versions = Mapping[MuseumNumber, Tuple[str, str]]
+
+VERSIONS_TTL = float(os.environ.get("EBL_LINE_TO_VEC_NEIGHBOURS_TTL", 60))
+# Stored neighbours are not used if more fragments have changed since they
+# were computed.
+MAX_CHANGED = 1000
+
+
 def sort_scores_to_list(results: List[LineToVecScore]) -> List[LineToVecScore]:
     return sorted(results, key=lambda item: -item.score)
 
 
+def sort_ranked_scores(results: List[RankedScore]) -> List[LineToVecScore]:
+    return [item for *_, item in sorted(results, reverse=True)]
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class LineToVecRanking:
     score: List[LineToVecScore]
     score_weighted: List[LineToVecScore]
 
 
+def _is_positive(_, attribute: attr.Attribute, value: int) -> None:
+    if value < 1:
+        raise ValueError(f"Attribute {attribute.name} must be positive.")
+
+
 @attr.s(auto_attribs=True, frozen=True)
 class LineToVecRanker:
     NUMBER_OF_RESULTS_TO_RETURN: ClassVar[int] = 15
-    _score_results: List[LineToVecScore] = attr.ib(factory=list, init=False)
-    _score_weighted_results: List[LineToVecScore] = attr.ib(factory=list, init=False)
+    MAX_NUMBER_OF_RESULTS: ClassVar[int] = 100
+    number_of_results: int = attr.ib(
+        default=NUMBER_OF_RESULTS_TO_RETURN, validator=_is_positive
+    )
+    _score_results: List[RankedScore] = attr.ib(factory=list, init=False)
+    _score_weighted_results: List[RankedScore] = attr.ib(factory=list, init=False)
+    _insertion_order: Iterator[int] = attr.ib(factory=itertools.count, init=False)
 
     @property
     def score(self) -> List[LineToVecScore]:
-        return sort_scores_to_list(self._score_results)[
-            : LineToVecRanker.NUMBER_OF_RESULTS_TO_RETURN
-        ]
+        return sort_ranked_scores(self._score_results)
 
     @property
     def score_weighted(self) -> List[LineToVecScore]:
-        return sort_scores_to_list(self._score_weighted_results)[
-            : LineToVecRanker.NUMBER_OF_RESULTS_TO_RETURN
-        ]
+        return sort_ranked_scores(self._score_weighted_results)
 
     @property
     def ranking(self) -> LineToVecRanking:
@@ -49,46 +90,197 @@ class LineToVecRanker:
         line_to_vec_score: LineToVecScore,
         line_to_vec_score_weighted: LineToVecScore,
     ) -> None:
-        self._insert_score(line_to_vec_score, self._score_results)
-        self._insert_score(line_to_vec_score_weighted, self._score_weighted_results)
+        order = next(self._insertion_order)
+        self._insert_score(line_to_vec_score, order, self._score_results)
+        self._insert_score(
+            line_to_vec_score_weighted, order, self._score_weighted_results
+        )
 
     def _insert_score(
-        self, line_to_vec_score: LineToVecScore, score_results: List[LineToVecScore]
+        self,
+        line_to_vec_score: LineToVecScore,
+        order: int,
+        score_results: List[RankedScore],
     ) -> None:
-        score_results.append(line_to_vec_score)
+        # Among equal scores the earlier insertion ranks higher, as with a
+        # stable sort.
+        ranked_score = (line_to_vec_score.score, -order, line_to_vec_score)
+        if len(score_results) < self.number_of_results:
+            heapq.heappush(score_results, ranked_score)
+        elif ranked_score > score_results[0]:
+            heapq.heapreplace(score_results, ranked_score)
+
+
+def create_ranking(
+    entries: Sequence[LineToVecEntry],
+    scores: Iterable[Tuple[int, int, int]],
+    excluded: MuseumNumber,
+    number_of_results: int,
+) -> LineToVecRanking:
+    ranker = LineToVecRanker(number_of_results)
+    for index, entry_score, entry_weighted_score in scores:
+        entry = entries[index]
+        if entry.museum_number != excluded:
+            ranker.insert_score(
+                LineToVecScore(entry.museum_number, entry.script, entry_score),
+                LineToVecScore(entry.museum_number, entry.script, entry_weighted_score),
+            )
+    return ranker.ranking
 
 
 class FragmentMatcher:
-    def __init__(self, fragment_repository: FragmentRepository):
+    # Stored neighbours are used if the candidate and its neighbours have not
+    # changed since they were computed. The fragments changed in the meanwhile
+    # are found by comparing the digests of the snapshot with the versions of
+    # the stored neighbours, which are reloaded at most once per ttl seconds,
+    # and scored together with the stored neighbours.
+    def __init__(
+        self,
+        fragment_repository: FragmentRepository,
+        line_to_vec_index: LineToVecIndex,
+        neighbours_repository: LineToVecNeighboursRepository,
+        versions_ttl: float = VERSIONS_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self._fragment_repository = fragment_repository
+        self._line_to_vec_index = line_to_vec_index
+        self._neighbours_repository = neighbours_repository
+        self._versions_ttl = versions_ttl
+        self._clock = clock
+        self._versions_lock = threading.Lock()
+        self._versions: Versions = {}
+        self._versions_loaded_at = -math.inf
+        self._positions: Optional[
+            Tuple[LineToVecSnapshot, Mapping[MuseumNumber, int]]
+        ] = None
+        self._changed_for: Optional[Tuple[LineToVecSnapshot, Versions]] = None
+        self._changed: Dict[str, Sequence[int]] = {}
 
     def _parse_candidate(self, candidate: str) -> Tuple[LineToVecEncodings, ...]:
         return self._fragment_repository.query_by_museum_number(
             MuseumNumber.of(candidate)
         ).line_to_vec
 
-    def rank_line_to_vec(self, candidate: str) -> LineToVecRanking:
+    def rank_line_to_vec(
+        self,
+        candidate: str,
+        number_of_results: int = LineToVecRanker.NUMBER_OF_RESULTS_TO_RETURN,
+    ) -> LineToVecRanking:
         candidate_line_to_vecs = self._parse_candidate(candidate)
-        line_to_vec_entries = (
-            self._fragment_repository.query_transliterated_line_to_vec()
-        )
-        ranker = LineToVecRanker()
+        candidate_number = MuseumNumber.of(candidate)
         if candidate_line_to_vecs:
-            for entry in filter(
-                lambda line_to_vec_entry: line_to_vec_entry.museum_number
-                != MuseumNumber.of(candidate),
-                line_to_vec_entries,
-            ):
-                line_to_vec_score = LineToVecScore(
-                    entry.museum_number,
-                    entry.script,
-                    score(candidate_line_to_vecs, entry.line_to_vec),
+            snapshot = self._line_to_vec_index.snapshot
+            return self._find_neighbours(
+                snapshot, candidate_number, number_of_results
+            ) or create_ranking(
+                snapshot.entries,
+                self._score(snapshot, candidate_line_to_vecs, number_of_results),
+                candidate_number,
+                number_of_results,
+            )
+        else:
+            return LineToVecRanking([], [])
+
+    def _find_neighbours(
+        self,
+        snapshot: LineToVecSnapshot,
+        candidate_number: MuseumNumber,
+        number_of_results: int,
+    ) -> Optional[LineToVecRanking]:
+        try:
+            neighbours = self._neighbours_repository.query_by_museum_number(
+                candidate_number
+            )
+        except NotFoundError:
+            return None
+        positions = self._find_positions(snapshot)
+        changed = (
+            []
+            if neighbours.corpus == snapshot.fingerprint
+            else self._find_changed(snapshot, neighbours.corpus)
+        )
+        position = positions.get(candidate_number)
+        stored = [positions.get(number) for number in neighbours.neighbour_numbers]
+        if (
+            position is None
+            or snapshot.digests[position] != neighbours.digest
+            or number_of_results > neighbours.number_of_neighbours
+            or len(changed) > MAX_CHANGED
+            or any(neighbour is None for neighbour in stored)
+            or not set(changed).isdisjoint(stored)
+        ):
+            return None
+        elif changed:
+            # The stored neighbours are still the best among the unchanged
+            # fragments, so only the changed fragments need to be scored.
+            return create_ranking(
+                snapshot.entries,
+                sorted(
+                    snapshot.score_subset(
+                        snapshot.entries[position].line_to_vec,
+                        [*changed, *cast(List[int], stored)],
+                    )
+                ),
+                candidate_number,
+                number_of_results,
+            )
+        else:
+            return LineToVecRanking(
+                list(neighbours.score[:number_of_results]),
+                list(neighbours.score_weighted[:number_of_results]),
+            )
+
+    def _find_positions(
+        self, snapshot: LineToVecSnapshot
+    ) -> Mapping[MuseumNumber, int]:
+        with self._versions_lock:
+            if self._positions is None or self._positions[0] is not snapshot:
+                self._positions = (
+                    snapshot,
+                    {
+                        entry.museum_number: position
+                        for position, entry in enumerate(snapshot.entries)
+                    },
                 )
-                line_to_vec_weighted_score = LineToVecScore(
-                    entry.museum_number,
-                    entry.script,
-                    score_weighted(candidate_line_to_vecs, entry.line_to_vec),
+            return self._positions[1]
+
+    def _find_changed(self, snapshot: LineToVecSnapshot, corpus: str) -> Sequence[int]:
+        with self._versions_lock:
+            now = self._clock()
+            if now >= self._versions_loaded_at + self._versions_ttl:
+                self._versions = self._neighbours_repository.query_versions()
+                self._versions_loaded_at = now
+            if (
+                self._changed_for is None
+                or self._changed_for[0] is not snapshot
+                or self._changed_for[1] is not self._versions
+            ):
+                self._changed_for = (snapshot, self._versions)
+                self._changed = {}
+            if corpus not in self._changed:
+                self._changed[corpus] = self._compare_versions(
+                    snapshot, self._versions, corpus
                 )
-                ranker.insert_score(line_to_vec_score, line_to_vec_weighted_score)
+            return self._changed[corpus]
 
-        return ranker.ranking
+    @staticmethod
+    def _compare_versions(
+        snapshot: LineToVecSnapshot, versions: Versions, corpus: str
+    ) -> Sequence[int]:
+        # Fragments without neighbours computed for the same corpus may have
+        # changed and are included.
+        return [
+            position
+            for position, (entry, digest) in enumerate(
+                zip(snapshot.entries, snapshot.digests)
+            )
+            if versions.get(entry.museum_number) != (digest, corpus)
+        ]
+
+    def _score(
+        self,
+        snapshot: LineToVecSnapshot,
+        candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+        number_of_results: int,
+    ) -> Iterable[Tuple[int, int, int]]:
+        return snapshot.score(candidate_line_to_vecs, number_of_results)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence, Tuple
 
 from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
 from ebl.fragmentarium.domain.fragment import Fragment
@@ -29,6 +29,12 @@ class FragmentRepository(ABC):
     def query_by_museum_number(self, number: MuseumNumber) -> Fragment:
         ...
 
+    @abstractmethod
+    def query_by_museum_numbers(
+        self, numbers: Sequence[MuseumNumber]
+    ) -> List[Fragment]:
+        ...
+
     @abstractmethod
     def query_by_id_and_page_in_references(
         self, id_: str, pages: str
@@ -63,10 +69,24 @@ class FragmentRepository(ABC):
     def query_transliterated_numbers(self) -> List[MuseumNumber]:
         ...
 
+    @abstractmethod
+    def query_transliterated_signs(self) -> List[Tuple[MuseumNumber, str]]:
+        ...
+
+    @abstractmethod
+    def query_signs_version(self) -> int:
+        ...
+
     @abstractmethod
     def query_transliterated_line_to_vec(self,) -> List[LineToVecEntry]:
         ...
 
+    @abstractmethod
+    def query_transliterated_line_to_vec_by_numbers(
+        self, numbers: Sequence[MuseumNumber]
+    ) -> List[LineToVecEntry]:
+        ...
+
     @abstractmethod
     def query_next_and_previous_folio(
         self, folio_name: str, folio_number: str, number: MuseumNumber
@@ -1,4 +1,4 @@
-from typing import Sequence, Tuple
+from typing import Optional, Sequence, Tuple
 
 from ebl.bibliography.application.bibliography import Bibliography
 from ebl.bibliography.domain.reference import Reference
@@ -6,10 +6,14 @@ from ebl.changelog import Changelog
 from ebl.files.application.file_repository import FileRepository
 from ebl.fragmentarium.application.fragment_repository import FragmentRepository
 from ebl.fragmentarium.application.fragment_schema import FragmentSchema
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecIndex
 from ebl.fragmentarium.domain.fragment import Fragment, Genre
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
 from ebl.fragmentarium.domain.transliteration_update import TransliterationUpdate
+from ebl.lemmatization.application.suggestion_finder import LemmaRepository
+from ebl.lemmatization.domain.lemma_counts import count_lemmas
 from ebl.lemmatization.domain.lemmatization import Lemmatization
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.users.domain.user import User
 
 COLLECTION = "fragments"
@@ -22,12 +26,18 @@ class FragmentUpdater:
         changelog: Changelog,
         bibliography: Bibliography,
         photos: FileRepository,
+        line_to_vec_index: LineToVecIndex,
+        signs_index: Optional[SignsIndex[MuseumNumber]] = None,
+        lemma_repository: Optional[LemmaRepository] = None,
     ):
 
         self._repository = repository
         self._changelog = changelog
         self._bibliography = bibliography
         self._photos = photos
+        self._line_to_vec_index = line_to_vec_index
+        self._signs_index = signs_index
+        self._lemma_repository = lemma_repository
 
     def update_transliteration(
         self, number: MuseumNumber, transliteration: TransliterationUpdate, user: User
@@ -37,6 +47,10 @@ class FragmentUpdater:
         updated_fragment = fragment.update_transliteration(transliteration, user)
         self._create_changlelog(user, fragment, updated_fragment)
         self._repository.update_transliteration(updated_fragment)
+        self._line_to_vec_index.update(updated_fragment)
+        if self._signs_index:
+            self._signs_index.update(number, [updated_fragment.signs or ""])
+        self._update_lemma_counts(updated_fragment)
 
         return (updated_fragment, self._photos.query_if_file_exists(f"{number}.jpg"))
 
@@ -59,6 +73,7 @@ class FragmentUpdater:
 
         self._create_changlelog(user, fragment, updated_fragment)
         self._repository.update_lemmatization(updated_fragment)
+        self._update_lemma_counts(updated_fragment)
 
         return (updated_fragment, self._photos.query_if_file_exists(f"{number}.jpg"))
 
@@ -78,6 +93,15 @@ class FragmentUpdater:
             self._photos.query_if_file_exists(f"{number}.jpg"),
         )
 
+    def _update_lemma_counts(self, fragment: Fragment) -> None:
+        if self._lemma_repository:
+            self._lemma_repository.update_fragment_lemmas(
+                fragment.number,
+                count_lemmas(
+                    token for line in fragment.text.text_lines for token in line.content
+                ),
+            )
+
     def _create_changlelog(
         self, user: User, fragment: Fragment, updated_fragment: Fragment
     ) -> None:
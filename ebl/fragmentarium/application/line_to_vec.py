@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import FrozenSet, Sequence, Tuple
 
 import attr
 
@@ -18,3 +18,26 @@ class LineToVecScore:
     museum_number: MuseumNumber
     script: str
     score: int
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LineToVecNeighbours:
+    museum_number: MuseumNumber
+    digest: str
+    corpus: str
+    number_of_neighbours: int
+    score: Sequence[LineToVecScore]
+    score_weighted: Sequence[LineToVecScore]
+
+    @property
+    def neighbour_numbers(self) -> FrozenSet[MuseumNumber]:
+        return frozenset(
+            neighbour.museum_number for neighbour in [*self.score, *self.score_weighted]
+        )
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LineToVecNeighboursRun:
+    corpus: str
+    changed: FrozenSet[MuseumNumber]
+    removed: FrozenSet[MuseumNumber]
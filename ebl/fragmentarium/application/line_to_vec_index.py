@@ -0,0 +1,181 @@
+import hashlib
+import threading
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import attr
+
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import LineToVecMatrix
+from ebl.fragmentarium.application.matches.line_to_vec_ngram_index import (
+    LineToVecNgramIndex,
+    score_pruned,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncodings
+from ebl.fragmentarium.domain.fragment import Fragment
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+
+def create_digest(entry: LineToVecEntry) -> str:
+    line_to_vec = ";".join(
+        ",".join(str(encoding.value) for encoding in split)
+        for split in entry.line_to_vec
+    )
+    return hashlib.sha1(
+        f"{entry.museum_number}|{entry.script}|{line_to_vec}".encode()
+    ).hexdigest()
+
+
+def create_fingerprint(digests: Iterable[str]) -> str:
+    return hashlib.sha1("\n".join(sorted(digests)).encode()).hexdigest()
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class LineToVecSnapshot:
+    entries: Sequence[LineToVecEntry]
+    matrix: LineToVecMatrix
+    ngram_index: LineToVecNgramIndex
+    digests: Sequence[str]
+    fingerprint: str
+    store_path: Optional[str] = None
+
+    @staticmethod
+    def of(entries: Collection[LineToVecEntry]) -> "LineToVecSnapshot":
+        digests = [create_digest(entry) for entry in entries]
+        matrix = LineToVecMatrix([entry.line_to_vec for entry in entries])
+        return LineToVecSnapshot(
+            tuple(entries),
+            matrix,
+            LineToVecNgramIndex(matrix),
+            digests,
+            create_fingerprint(digests),
+        )
+
+    def score(
+        self,
+        candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+        number_of_results: int,
+    ) -> Iterable[Tuple[int, int, int]]:
+        indices, scores, weighted_scores = score_pruned(
+            self.matrix, self.ngram_index, candidate_line_to_vecs, number_of_results
+        )
+        return zip(indices.tolist(), scores.tolist(), weighted_scores.tolist())
+
+    def score_subset(
+        self,
+        candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+        positions: Sequence[int],
+    ) -> Iterable[Tuple[int, int, int]]:
+        scores, weighted_scores = LineToVecMatrix(
+            [self.entries[position].line_to_vec for position in positions]
+        ).score(candidate_line_to_vecs)
+        return zip(positions, scores.tolist(), weighted_scores.tolist())
+
+
+class LineToVecIndex:
+    # Updates are applied to the entries right away. The snapshot used for
+    # matching is rebuilt in the background and the previous snapshot is
+    # served until the rebuild is done.
+    def __init__(self, fragment_repository: FragmentRepository):
+        self._fragment_repository = fragment_repository
+        self._lock = threading.Lock()
+        self._entries: Optional[MutableMapping[MuseumNumber, LineToVecEntry]] = None
+        self._snapshot: Optional[LineToVecSnapshot] = None
+        self._version = 0
+        self._snapshot_version = 0
+        self._rebuild_thread: Optional[threading.Thread] = None
+
+    @property
+    def entries(self) -> Collection[LineToVecEntry]:
+        with self._lock:
+            return tuple(self._load().values())
+
+    @property
+    def snapshot(self) -> LineToVecSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._install(self._prepare()(), self._version)
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._entries is not None
+
+    def update(self, fragment: Fragment) -> None:
+        entry = (
+            LineToVecEntry(fragment.number, fragment.script, fragment.line_to_vec)
+            if fragment.text.lines
+            else None
+        )
+        with self._lock:
+            if self.is_loaded:
+                self._version += 1
+                self._apply(fragment.number, entry)
+                if self._snapshot is not None and self._rebuild_thread is None:
+                    self._rebuild_thread = threading.Thread(
+                        target=self._rebuild, daemon=True
+                    )
+                    self._rebuild_thread.start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = None
+            self._snapshot = None
+
+    def join(self) -> None:
+        thread = self._rebuild_thread
+        if thread is not None:
+            thread.join()
+
+    def _apply(self, number: MuseumNumber, entry: Optional[LineToVecEntry]) -> None:
+        entries = self._load()
+        if entry is None:
+            entries.pop(number, None)
+        else:
+            entries[number] = entry
+
+    def _prepare(self) -> Callable[[], LineToVecSnapshot]:
+        # Called with the lock held. The returned function builds the
+        # snapshot and may run without the lock.
+        entries = tuple(self._load().values())
+        return lambda: LineToVecSnapshot.of(entries)
+
+    def _install(self, snapshot: LineToVecSnapshot, version: int) -> None:
+        self._snapshot = snapshot
+        self._snapshot_version = version
+
+    def _rebuild(self) -> None:
+        while True:
+            with self._lock:
+                version = self._version
+                build = self._prepare() if self._snapshot is not None else None
+            snapshot = None if build is None else build()
+            with self._lock:
+                if (
+                    snapshot is not None
+                    and self._snapshot is not None
+                    and self._snapshot_version < version
+                ):
+                    self._install(snapshot, version)
+                if self._snapshot is None or self._snapshot_version >= self._version:
+                    self._rebuild_thread = None
+                    return
+
+    def _load(self) -> MutableMapping[MuseumNumber, LineToVecEntry]:
+        if self._entries is None:
+            self._entries = {
+                entry.museum_number: entry
+                for entry in self._fragment_repository.query_transliterated_line_to_vec()
+            }
+        return self._entries
@@ -0,0 +1,169 @@
+from typing import Iterable, Mapping, Optional, Sequence, Tuple
+
+from ebl.fragmentarium.application.fragment_matcher import (
+    LineToVecRanking,
+    create_ranking,
+)
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecNeighbours,
+    LineToVecNeighboursRun,
+)
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecSnapshot
+from ebl.fragmentarium.application.line_to_vec_neighbours_repository import (
+    LineToVecNeighboursRepository,
+)
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import LineToVecMatrix
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+
+class LineToVecNeighboursUpdater:
+    def __init__(
+        self,
+        repository: LineToVecNeighboursRepository,
+        snapshot: LineToVecSnapshot,
+        number_of_neighbours: int,
+    ):
+        self._repository = repository
+        self._snapshot = snapshot
+        self._number_of_neighbours = number_of_neighbours
+        self._positions: Mapping[MuseumNumber, int] = {
+            entry.museum_number: position
+            for position, entry in enumerate(snapshot.entries)
+        }
+
+    def plan(self) -> Tuple[LineToVecNeighboursRun, Sequence[MuseumNumber]]:
+        versions = self._repository.query_versions()
+        changed = {
+            entry.museum_number
+            for entry, digest in zip(self._snapshot.entries, self._snapshot.digests)
+            if versions.get(entry.museum_number, (None, None))[0] != digest
+        }
+        removed = set(versions) - set(self._positions)
+
+        # An interrupted run may have updated some of the changed fragments
+        # already, so its changes are carried over.
+        previous_run = self._repository.query_run()
+        if previous_run:
+            changed |= previous_run.changed & set(self._positions)
+            removed |= previous_run.removed - set(self._positions)
+
+        run = LineToVecNeighboursRun(
+            self._snapshot.fingerprint, frozenset(changed), frozenset(removed)
+        )
+        self._repository.save_run(run)
+        outdated = [
+            entry.museum_number
+            for entry in self._snapshot.entries
+            if versions.get(entry.museum_number, (None, None))[1] != run.corpus
+        ]
+        return run, outdated
+
+    def update(
+        self, run: LineToVecNeighboursRun, numbers: Iterable[MuseumNumber]
+    ) -> int:
+        if run.corpus != self._snapshot.fingerprint:
+            raise ValueError(
+                f"The corpus {self._snapshot.fingerprint} does not match the run."
+            )
+
+        numbers = list(numbers)
+        changed = sorted(self._positions[number] for number in run.changed)
+        changed_matrix = LineToVecMatrix(
+            [self._snapshot.entries[position].line_to_vec for position in changed]
+        )
+        stored = {
+            neighbours.museum_number: neighbours
+            for neighbours in self._repository.query_by_museum_numbers(numbers)
+        }
+        updated = [
+            self._update_neighbours(
+                run, changed, changed_matrix, number, stored.get(number)
+            )
+            for number in numbers
+        ]
+        self._repository.update(updated)
+        return len(updated)
+
+    def finish(self, run: LineToVecNeighboursRun, corpus: str) -> bool:
+        # The corpus is the fingerprint of the fragments after the update. If
+        # they changed in the meanwhile the run is kept for the next update.
+        if corpus != run.corpus:
+            return False
+        _, outdated = self.plan()
+        if outdated:
+            return False
+        else:
+            self._repository.delete(run.removed)
+            self._repository.delete_run()
+            return True
+
+    def find_neighbours(self, number: MuseumNumber) -> LineToVecNeighbours:
+        position = self._positions[number]
+        return self._create_neighbours(
+            position,
+            self._snapshot.score(
+                self._snapshot.entries[position].line_to_vec, self._number_of_neighbours
+            ),
+        )
+
+    def _update_neighbours(
+        self,
+        run: LineToVecNeighboursRun,
+        changed: Sequence[int],
+        changed_matrix: LineToVecMatrix,
+        number: MuseumNumber,
+        stored: Optional[LineToVecNeighbours],
+    ) -> LineToVecNeighbours:
+        if (
+            stored is None
+            or number in run.changed
+            or stored.number_of_neighbours != self._number_of_neighbours
+            or not stored.neighbour_numbers.isdisjoint(run.changed | run.removed)
+            or not stored.neighbour_numbers <= self._positions.keys()
+        ):
+            return self.find_neighbours(number)
+        else:
+            # The stored neighbours are still the best among the unchanged
+            # fragments, so only the changed fragments need to be scored.
+            position = self._positions[number]
+            scores, weighted_scores = changed_matrix.score(
+                self._snapshot.entries[position].line_to_vec
+            )
+            return self._create_neighbours(
+                position,
+                sorted(
+                    [
+                        *zip(changed, scores.tolist(), weighted_scores.tolist()),
+                        *self._snapshot.score_subset(
+                            self._snapshot.entries[position].line_to_vec,
+                            [
+                                self._positions[neighbour]
+                                for neighbour in stored.neighbour_numbers
+                            ],
+                        ),
+                    ]
+                ),
+            )
+
+    def _create_neighbours(
+        self, position: int, scores: Iterable[Tuple[int, int, int]]
+    ) -> LineToVecNeighbours:
+        entry = self._snapshot.entries[position]
+        ranking = (
+            create_ranking(
+                self._snapshot.entries,
+                scores,
+                entry.museum_number,
+                self._number_of_neighbours,
+            )
+            if entry.line_to_vec
+            else LineToVecRanking([], [])
+        )
+        return LineToVecNeighbours(
+            entry.museum_number,
+            self._snapshot.digests[position],
+            self._snapshot.fingerprint,
+            self._number_of_neighbours,
+            ranking.score,
+            ranking.score_weighted,
+        )
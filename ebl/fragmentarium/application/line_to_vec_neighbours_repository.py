@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, Mapping, Optional, Sequence, Tuple
+
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecNeighbours,
+    LineToVecNeighboursRun,
+)
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+
+class LineToVecNeighboursRepository(ABC):
+    @abstractmethod
+    def query_by_museum_number(self, number: MuseumNumber) -> LineToVecNeighbours:
+        ...
+
+    @abstractmethod
+    def query_by_museum_numbers(
+        self, numbers: Iterable[MuseumNumber]
+    ) -> Sequence[LineToVecNeighbours]:
+        ...
+
+    @abstractmethod
+    def query_versions(self) -> Mapping[MuseumNumber, Tuple[str, str]]:
+        ...
+
+    @abstractmethod
+    def update(self, neighbours: Sequence[LineToVecNeighbours]) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, numbers: Iterable[MuseumNumber]) -> None:
+        ...
+
+    @abstractmethod
+    def query_run(self) -> Optional[LineToVecNeighboursRun]:
+        ...
+
+    @abstractmethod
+    def save_run(self, run: LineToVecNeighboursRun) -> None:
+        ...
+
+    @abstractmethod
+    def delete_run(self) -> None:
+        ...
@@ -0,0 +1,45 @@
+from marshmallow import Schema, fields, post_load
+
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecNeighbours,
+    LineToVecNeighboursRun,
+)
+from ebl.fragmentarium.application.line_to_vec_ranking_schema import (
+    LineToVecScoreSchema,
+)
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+
+class MuseumNumberString(fields.Field):
+    def _serialize(self, value, attr, obj, **kwargs):
+        return str(value)
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        return MuseumNumber.of(value)
+
+
+class LineToVecNeighboursSchema(Schema):
+    museum_number = MuseumNumberString(required=True, data_key="_id")
+    digest = fields.String(required=True)
+    corpus = fields.String(required=True)
+    number_of_neighbours = fields.Int(required=True, data_key="numberOfNeighbours")
+    score = fields.Nested(LineToVecScoreSchema, many=True, required=True)
+    score_weighted = fields.Nested(
+        LineToVecScoreSchema, many=True, required=True, data_key="scoreWeighted"
+    )
+
+    @post_load
+    def make_neighbours(self, data, **kwargs) -> LineToVecNeighbours:
+        return LineToVecNeighbours(**data)
+
+
+class LineToVecNeighboursRunSchema(Schema):
+    corpus = fields.String(required=True)
+    changed = fields.List(MuseumNumberString(), required=True)
+    removed = fields.List(MuseumNumberString(), required=True)
+
+    @post_load
+    def make_run(self, data, **kwargs) -> LineToVecNeighboursRun:
+        return LineToVecNeighboursRun(
+            data["corpus"], frozenset(data["changed"]), frozenset(data["removed"])
+        )
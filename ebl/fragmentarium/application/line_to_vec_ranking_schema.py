@@ -1,6 +1,7 @@
-from marshmallow import Schema, fields, pre_dump
+from marshmallow import Schema, fields, post_load, pre_dump
 
 from ebl.fragmentarium.application.line_to_vec import LineToVecScore
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
 
 
 class LineToVecScoreSchema(Schema):
@@ -16,6 +17,12 @@ class LineToVecScoreSchema(Schema):
             "score": line_to_vec_score.score,
         }
 
+    @post_load
+    def make_line_to_vec_score(self, data, **kwargs) -> LineToVecScore:
+        return LineToVecScore(
+            MuseumNumber.of(data["museum_number"]), data["script"], data["score"]
+        )
+
 
 class LineToVecRankingSchema(Schema):
     score = fields.Nested(LineToVecScoreSchema, many=True)
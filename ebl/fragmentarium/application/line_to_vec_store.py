@@ -0,0 +1,539 @@
+import datetime
+import fcntl
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import (
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+import numpy as np
+
+from ebl.changelog import Changelog
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.fragment_updater import COLLECTION
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.line_to_vec_index import (
+    LineToVecIndex,
+    LineToVecSnapshot,
+    create_digest,
+    create_fingerprint,
+)
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import LineToVecMatrix
+from ebl.fragmentarium.application.matches.line_to_vec_ngram_index import (
+    LineToVecNgramIndex,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+MAGIC = b"EBLL2V02"
+ALIGNMENT = 64
+CURRENT = "current"
+LOCK = "lock"
+KEPT_STORES = 2
+WATERMARK_MARGIN = datetime.timedelta(minutes=5)
+
+
+def create_watermark() -> str:
+    # Changes are logged before they are saved, so the changes logged shortly
+    # before the line to vecs are queried are applied again.
+    return (datetime.datetime.utcnow() - WATERMARK_MARGIN).isoformat()
+
+
+def encode_strings(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def decode_string(blob: np.ndarray, offsets: np.ndarray, index: int) -> str:
+    return blob[offsets[index] : offsets[index + 1]].tobytes().decode()
+
+
+def decode_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    data = blob.tobytes()
+    return [
+        data[start:end].decode()
+        for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    ]
+
+
+def write_arrays(
+    path: str, header: Mapping[str, object], arrays: Mapping[str, np.ndarray]
+) -> None:
+    offset = 0
+    layout = {}
+    for name, array in arrays.items():
+        layout[name] = [offset, array.dtype.str, list(array.shape)]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    encoded_header = json.dumps({**header, "arrays": layout}).encode()
+    start = -(-(len(MAGIC) + 8 + len(encoded_header)) // ALIGNMENT) * ALIGNMENT
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(len(encoded_header).to_bytes(8, "little"))
+        file.write(encoded_header)
+        for name, array in arrays.items():
+            file.seek(start + layout[name][0])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(start + offset)
+    os.replace(temporary_path, path)
+
+
+def map_arrays(path: str) -> Tuple[Mapping[str, object], Mapping[str, np.ndarray]]:
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a line to vec store.")
+        header_length = int.from_bytes(file.read(8), "little")
+        header = json.loads(file.read(header_length))
+    start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+    return (
+        header,
+        {
+            name: (
+                np.memmap(path, dtype, "r", start + offset, tuple(shape))
+                if np.prod(shape)
+                else np.empty(shape, dtype)
+            )
+            for name, (offset, dtype, shape) in header["arrays"].items()
+        },
+    )
+
+
+class StoredEntries(Sequence[LineToVecEntry]):
+    def __init__(self, store: "LineToVecStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @overload
+    def __getitem__(self, index: int) -> LineToVecEntry:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[LineToVecEntry]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[LineToVecEntry, Sequence[LineToVecEntry]]:
+        if isinstance(index, slice):
+            return [self._store.get_entry(item) for item in range(len(self))[index]]
+        elif -len(self) <= index < len(self):
+            return self._store.get_entry(index % len(self))
+        else:
+            raise IndexError(f"Line to vec entry {index} out of range.")
+
+
+class UpdatedEntries(Sequence[LineToVecEntry]):
+    def __init__(
+        self,
+        stored: Sequence[LineToVecEntry],
+        order: Sequence[int],
+        updated: Sequence[LineToVecEntry],
+    ):
+        self._stored = stored
+        self._order = order
+        self._updated = updated
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @overload
+    def __getitem__(self, index: int) -> LineToVecEntry:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[LineToVecEntry]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[LineToVecEntry, Sequence[LineToVecEntry]]:
+        if isinstance(index, slice):
+            return [self[item] for item in range(len(self))[index]]
+        elif -len(self) <= index < len(self):
+            source = self._order[index % len(self)]
+            return (
+                self._stored[source]
+                if source < len(self._stored)
+                else self._updated[source - len(self._stored)]
+            )
+        else:
+            raise IndexError(f"Line to vec entry {index} out of range.")
+
+
+class LineToVecStore:
+    def __init__(self, path: str):
+        self.path = path
+        header, arrays = map_arrays(path)
+        self.fingerprint = str(header["fingerprint"])
+        self.watermark = str(header["watermark"])
+        self._ngram_lengths = [int(length) for length in header["ngram_lengths"]]
+        self._arrays = arrays
+        self._size = len(arrays["number_offsets"]) - 1
+        self.matrix = LineToVecMatrix.of_arrays(self._size, arrays)
+        self._first_rows = np.searchsorted(arrays["owners"], np.arange(self._size + 1))
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def entries(self) -> Sequence[LineToVecEntry]:
+        return StoredEntries(self)
+
+    @property
+    def ngram_index(self) -> LineToVecNgramIndex:
+        return LineToVecNgramIndex.of_arrays(self._ngram_lengths, self._arrays)
+
+    @property
+    def museum_numbers(self) -> List[str]:
+        return decode_strings(self._arrays["numbers"], self._arrays["number_offsets"])
+
+    @property
+    def scripts(self) -> List[str]:
+        return decode_strings(self._arrays["scripts"], self._arrays["script_offsets"])
+
+    @property
+    def digests(self) -> List[str]:
+        return [digest.decode() for digest in self._arrays["digests"].tolist()]
+
+    def get_entry(self, index: int) -> LineToVecEntry:
+        lengths = self._arrays["lengths"]
+        left = self._arrays["left"]
+        return LineToVecEntry(
+            MuseumNumber.of(
+                decode_string(
+                    self._arrays["numbers"], self._arrays["number_offsets"], index
+                )
+            ),
+            decode_string(
+                self._arrays["scripts"], self._arrays["script_offsets"], index
+            ),
+            tuple(
+                LineToVecEncoding.from_list(left[row, : lengths[row]].tolist())
+                for row in range(self._first_rows[index], self._first_rows[index + 1])
+            ),
+        )
+
+    def create_snapshot(self) -> LineToVecSnapshot:
+        return LineToVecSnapshot(
+            self.entries,
+            self.matrix,
+            self.ngram_index,
+            self.digests,
+            self.fingerprint,
+            self.path,
+        )
+
+
+def write_store(
+    path: str,
+    matrix: LineToVecMatrix,
+    numbers: Sequence[str],
+    scripts: Sequence[str],
+    digests: Sequence[str],
+    watermark: str,
+) -> None:
+    number_blob, number_offsets = encode_strings(numbers)
+    script_blob, script_offsets = encode_strings(scripts)
+    ngram_index = LineToVecNgramIndex(matrix)
+    write_arrays(
+        path,
+        {
+            "fingerprint": create_fingerprint(digests),
+            "watermark": watermark,
+            "ngram_lengths": list(ngram_index.lengths),
+        },
+        {
+            **matrix.arrays,
+            **ngram_index.arrays,
+            "numbers": number_blob,
+            "number_offsets": number_offsets,
+            "scripts": script_blob,
+            "script_offsets": script_offsets,
+            "digests": np.array(digests, dtype="S40").reshape(len(digests)),
+        },
+    )
+
+
+def export_entries(
+    path: str, entries: Collection[LineToVecEntry], watermark: str
+) -> None:
+    write_store(
+        path,
+        LineToVecMatrix([entry.line_to_vec for entry in entries]),
+        [str(entry.museum_number) for entry in entries],
+        [entry.script for entry in entries],
+        [create_digest(entry) for entry in entries],
+        watermark,
+    )
+
+
+def arrange_entries(
+    store: LineToVecStore, entries: Iterable[LineToVecEntry]
+) -> Tuple[np.ndarray, List[LineToVecEntry]]:
+    # The entries are arranged in the order of the database. Unchanged
+    # entries refer to the store and changed entries to the returned list.
+    stored = {
+        number: (index, digest)
+        for index, (number, digest) in enumerate(
+            zip(store.museum_numbers, store.digests)
+        )
+    }
+    order = []
+    changed: List[LineToVecEntry] = []
+    for entry in entries:
+        index, digest = stored.get(str(entry.museum_number), (-1, ""))
+        if digest == create_digest(entry):
+            order.append(index)
+        else:
+            order.append(len(store) + len(changed))
+            changed.append(entry)
+    return np.array(order, dtype=np.intp), changed
+
+
+def arrange_updates(
+    store: LineToVecStore, updates: Mapping[MuseumNumber, Optional[LineToVecEntry]]
+) -> Tuple[np.ndarray, List[LineToVecEntry]]:
+    # Updated entries are replaced in place and new entries are appended as
+    # in LineToVecIndex, so that ties are ranked the same.
+    pending = {str(number): entry for number, entry in updates.items()}
+    order = []
+    updated: List[LineToVecEntry] = []
+    for index, number in enumerate(store.museum_numbers):
+        if number in pending:
+            entry = pending.pop(number)
+            if entry is not None:
+                order.append(len(store) + len(updated))
+                updated.append(entry)
+        else:
+            order.append(index)
+    for entry in pending.values():
+        if entry is not None:
+            order.append(len(store) + len(updated))
+            updated.append(entry)
+    return np.array(order, dtype=np.intp), updated
+
+
+def arrange_digests(
+    store: LineToVecStore, order: np.ndarray, entries: Sequence[LineToVecEntry]
+) -> List[str]:
+    digests = [*store.digests, *map(create_digest, entries)]
+    return [digests[source] for source in order.tolist()]
+
+
+def export_arranged(
+    path: str,
+    store: LineToVecStore,
+    order: np.ndarray,
+    entries: Sequence[LineToVecEntry],
+    watermark: str,
+) -> None:
+    # Unchanged entries are copied from the mapped arrays.
+    numbers = [*store.museum_numbers, *(str(entry.museum_number) for entry in entries)]
+    scripts = [*store.scripts, *(entry.script for entry in entries)]
+    write_store(
+        path,
+        store.matrix.append(
+            LineToVecMatrix([entry.line_to_vec for entry in entries])
+        ).select(order),
+        [numbers[source] for source in order.tolist()],
+        [scripts[source] for source in order.tolist()],
+        arrange_digests(store, order, entries),
+        watermark,
+    )
+
+
+def create_updated_snapshot(
+    store: LineToVecStore, updates: Mapping[MuseumNumber, Optional[LineToVecEntry]]
+) -> LineToVecSnapshot:
+    # The stored n-gram index is reused and only the updated entries are
+    # indexed.
+    order, entries = arrange_updates(store, updates)
+    is_stored = order < len(store)
+    positions = np.full(len(store), -1, dtype=np.intp)
+    positions[order[is_stored]] = np.flatnonzero(is_stored)
+    updated = LineToVecMatrix([entry.line_to_vec for entry in entries])
+    digests = arrange_digests(store, order, entries)
+    return LineToVecSnapshot(
+        UpdatedEntries(store.entries, order.tolist(), entries),
+        store.matrix.append(updated).select(order),
+        store.ngram_index.update(positions, updated, np.flatnonzero(~is_stored)),
+        digests,
+        create_fingerprint(digests),
+    )
+
+
+class LineToVecStoreDirectory:
+    # Stores are only written by one process at a time. Other processes
+    # keep mapping the store they opened.
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def open(self) -> Optional[LineToVecStore]:
+        try:
+            with open(os.path.join(self._directory, CURRENT), encoding="utf-8") as file:
+                return LineToVecStore(
+                    os.path.join(self._directory, file.read().strip())
+                )
+        except FileNotFoundError:
+            return None
+
+    def export(
+        self, entries: Collection[LineToVecEntry], watermark: str
+    ) -> LineToVecStore:
+        with self._lock():
+            return self._save(lambda path: export_entries(path, entries, watermark))
+
+    def synchronize(
+        self, entries: Collection[LineToVecEntry], watermark: str
+    ) -> LineToVecStore:
+        # The current store is compared to the entries from the database and
+        # only the changed entries are converted.
+        with self._lock():
+            store = self.open()
+            if store is None:
+                return self._save(lambda path: export_entries(path, entries, watermark))
+            order, changed = arrange_entries(store, entries)
+            return self._save(
+                lambda path: export_arranged(path, store, order, changed, watermark)
+            )
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        os.makedirs(self._directory, exist_ok=True)
+        # Closing the file releases the lock.
+        with open(os.path.join(self._directory, LOCK), "w") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            yield
+
+    def _save(self, write: Callable[[str], None]) -> LineToVecStore:
+        temporary_path = self._create_temporary_file()
+        try:
+            write(temporary_path)
+            name = f"{LineToVecStore(temporary_path).fingerprint}.l2v"
+            os.replace(temporary_path, os.path.join(self._directory, name))
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+        current_path = self._create_temporary_file()
+        with open(current_path, "w", encoding="utf-8") as file:
+            file.write(name)
+        os.replace(current_path, os.path.join(self._directory, CURRENT))
+        self._remove_old_stores(name)
+        return LineToVecStore(os.path.join(self._directory, name))
+
+    def _create_temporary_file(self) -> str:
+        descriptor, path = tempfile.mkstemp(".tmp", dir=self._directory)
+        os.close(descriptor)
+        return path
+
+    def _remove_old_stores(self, current: str) -> None:
+        # Workers may still map the previous store, so it is kept as well.
+        stores = sorted(
+            (
+                entry
+                for entry in os.scandir(self._directory)
+                if entry.name.endswith(".l2v") and entry.name != current
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in stores[KEPT_STORES - 1 :]:
+            os.remove(entry.path)
+
+
+class MappedLineToVecIndex(LineToVecIndex):
+    # The current store is opened as is and the changes logged since it was
+    # written are applied in memory. Stores are only written by
+    # update_line_to_vec_store. Without a store the line to vecs are loaded
+    # from the database.
+    def __init__(
+        self,
+        fragment_repository: FragmentRepository,
+        changelog: Changelog,
+        directory: str,
+    ):
+        super().__init__(fragment_repository)
+        self._changelog = changelog
+        self._directory = LineToVecStoreDirectory(directory)
+        self._is_opened = False
+        self._store: Optional[LineToVecStore] = None
+        self._updates: MutableMapping[MuseumNumber, Optional[LineToVecEntry]] = {}
+
+    @property
+    def entries(self) -> Collection[LineToVecEntry]:
+        return self.snapshot.entries
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._is_opened
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = None
+            self._snapshot = None
+            self._is_opened = False
+            self._store = None
+            self._updates = {}
+
+    def _apply(self, number: MuseumNumber, entry: Optional[LineToVecEntry]) -> None:
+        if self._open() is None:
+            super()._apply(number, entry)
+        else:
+            self._updates[number] = entry
+
+    def _prepare(self) -> Callable[[], LineToVecSnapshot]:
+        store = self._open()
+        if store is None:
+            return super()._prepare()
+        updates = dict(self._updates)
+        return (
+            (lambda: create_updated_snapshot(store, updates))
+            if updates
+            else store.create_snapshot
+        )
+
+    def _open(self) -> Optional[LineToVecStore]:
+        if not self._is_opened:
+            self._store = self._directory.open()
+            self._updates = (
+                {} if self._store is None else self._query_changes(self._store)
+            )
+            self._is_opened = True
+        return self._store
+
+    def _query_changes(
+        self, store: LineToVecStore
+    ) -> MutableMapping[MuseumNumber, Optional[LineToVecEntry]]:
+        numbers = [
+            MuseumNumber.of(resource_id)
+            for resource_id in self._changelog.query_resource_ids(
+                COLLECTION, store.watermark
+            )
+        ]
+        entries = {
+            entry.museum_number: entry
+            for entry in (
+                self._fragment_repository.query_transliterated_line_to_vec_by_numbers(
+                    numbers
+                )
+            )
+        }
+        return {number: entries.get(number) for number in numbers}
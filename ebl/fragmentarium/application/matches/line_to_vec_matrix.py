@@ -0,0 +1,204 @@
+from typing import Mapping, Sequence, Tuple
+
+import numpy as np
+
+from ebl.fragmentarium.application.matches.line_to_vec_score import WEIGHTING
+from ebl.fragmentarium.domain.line_to_vec_encoding import (
+    LineToVecEncoding,
+    LineToVecEncodings,
+)
+
+PADDING: int = -1
+OUT_OF_BOUNDS: int = -2
+ENCODING_TYPE = np.int8
+WEIGHTS: np.ndarray = np.array(
+    [WEIGHTING[encoding] for encoding in LineToVecEncoding], dtype=np.int64
+)
+
+
+def rank(scores: np.ndarray, number_of_results: int) -> np.ndarray:
+    return np.lexsort((np.arange(len(scores)), -scores))[:number_of_results]
+
+
+def hash_ngrams(ngrams: np.ndarray) -> np.ndarray:
+    return ngrams.astype(np.int64) @ (
+        len(LineToVecEncoding) ** np.arange(ngrams.shape[-1], dtype=np.int64)
+    )
+
+
+def encode(line_to_vec: LineToVecEncodings) -> np.ndarray:
+    return np.fromiter(
+        (encoding.value for encoding in line_to_vec),
+        dtype=ENCODING_TYPE,
+        count=len(line_to_vec),
+    )
+
+
+class LineToVecMatrix:
+    def __init__(self, line_to_vecs: Sequence[Tuple[LineToVecEncodings, ...]]):
+        splits = [
+            (index, encode(split))
+            for index, line_to_vec in enumerate(line_to_vecs)
+            for split in line_to_vec
+        ]
+        self._size = len(line_to_vecs)
+        self._owners = np.array([index for index, _ in splits], dtype=np.intp)
+        self._lengths = np.array([len(split) for _, split in splits], dtype=np.int64)
+        self._width = int(self._lengths.max(initial=0))
+        self._left = np.full((len(splits), self._width), PADDING, ENCODING_TYPE)
+        self._right = np.full((len(splits), self._width), PADDING, ENCODING_TYPE)
+        for row, (_, split) in enumerate(splits):
+            self._left[row, : len(split)] = split
+            self._right[row, self._width - len(split) :] = split
+        self._weights = np.where(
+            self._left == PADDING, 0, WEIGHTS[self._left.astype(np.intp)]
+        ).sum(axis=1)
+
+    @staticmethod
+    def of_arrays(size: int, arrays: Mapping[str, np.ndarray]) -> "LineToVecMatrix":
+        matrix = LineToVecMatrix([])
+        matrix._size = size
+        matrix._owners = arrays["owners"]
+        matrix._lengths = arrays["lengths"]
+        matrix._width = arrays["left"].shape[1]
+        matrix._left = arrays["left"]
+        matrix._right = arrays["right"]
+        matrix._weights = arrays["weights"]
+        return matrix
+
+    @property
+    def arrays(self) -> Mapping[str, np.ndarray]:
+        return {
+            "owners": self._owners,
+            "lengths": self._lengths,
+            "left": self._left,
+            "right": self._right,
+            "weights": self._weights,
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, other: "LineToVecMatrix") -> "LineToVecMatrix":
+        width = max(self._width, other._width)
+        return LineToVecMatrix.of_arrays(
+            self._size + other._size,
+            {
+                "owners": np.concatenate([self._owners, other._owners + self._size]),
+                "lengths": np.concatenate([self._lengths, other._lengths]),
+                "left": np.concatenate(
+                    [
+                        self._widen(self._left, width, False),
+                        other._widen(other._left, width, False),
+                    ]
+                ),
+                "right": np.concatenate(
+                    [
+                        self._widen(self._right, width, True),
+                        other._widen(other._right, width, True),
+                    ]
+                ),
+                "weights": np.concatenate([self._weights, other._weights]),
+            },
+        )
+
+    def shard(self, start: int, stop: int) -> "LineToVecMatrix":
+        first, last = np.searchsorted(self._owners, [start, stop])
+        return self._subset(
+            slice(first, last), self._owners[first:last] - start, stop - start
+        )
+
+    def select(self, indices: np.ndarray) -> "LineToVecMatrix":
+        # The entries are arranged in the order of the indices.
+        positions = np.full(self._size, -1, dtype=np.intp)
+        positions[indices] = np.arange(len(indices))
+        owners = positions[self._owners]
+        rows = np.flatnonzero(owners >= 0)
+        rows = rows[np.argsort(owners[rows], kind="stable")]
+        return self._subset(rows, owners[rows], len(indices))
+
+    def ngrams(self, length: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        keys = []
+        owners = []
+        boundaries = []
+        for offset in range(self._width - length + 1):
+            rows = self._lengths >= offset + length
+            keys.append(hash_ngrams(self._left[rows, offset : offset + length]))
+            owners.append(self._owners[rows])
+            boundaries.append((offset == 0) | (self._lengths[rows] == offset + length))
+        return (
+            np.concatenate([np.empty(0, np.int64), *keys]),
+            np.concatenate([np.empty(0, np.intp), *owners]),
+            np.concatenate([np.empty(0, bool), *boundaries]),
+        )
+
+    def _widen(self, splits: np.ndarray, width: int, align_right: bool) -> np.ndarray:
+        padding = np.full((len(splits), width - self._width), PADDING, ENCODING_TYPE)
+        return np.hstack([padding, splits] if align_right else [splits, padding])
+
+    def _subset(self, rows, owners: np.ndarray, size: int) -> "LineToVecMatrix":
+        subset = LineToVecMatrix([])
+        subset._size = size
+        subset._owners = owners
+        subset._lengths = self._lengths[rows]
+        subset._width = self._width
+        subset._left = self._left[rows]
+        subset._right = self._right[rows]
+        subset._weights = self._weights[rows]
+        return subset
+
+    def score(
+        self, candidate: Tuple[LineToVecEncodings, ...]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        split_scores = np.zeros(len(self._owners), dtype=np.int64)
+        split_weighted_scores = np.zeros(len(self._owners), dtype=np.int64)
+        for split in candidate:
+            for matches, length, weight in self._find_overlaps(encode(split)):
+                split_scores = np.maximum(split_scores, np.where(matches, length, 0))
+                split_weighted_scores = np.maximum(
+                    split_weighted_scores, np.where(matches, weight, 0)
+                )
+
+        scores = np.zeros(self._size, dtype=np.int64)
+        weighted_scores = np.zeros(self._size, dtype=np.int64)
+        np.maximum.at(scores, self._owners, split_scores)
+        np.maximum.at(weighted_scores, self._owners, split_weighted_scores)
+        return scores, weighted_scores
+
+    def _find_overlaps(self, candidate: np.ndarray):
+        length = len(candidate)
+        weights = WEIGHTS[candidate.astype(np.intp)]
+
+        for overlap in range(1, min(length, self._width) + 1):
+            yield (
+                (self._left[:, :overlap] == candidate[length - overlap :]).all(axis=1),
+                overlap,
+                weights[length - overlap :].sum(),
+            )
+            yield (
+                (self._right[:, self._width - overlap :] == candidate[:overlap]).all(
+                    axis=1
+                ),
+                overlap,
+                weights[:overlap].sum(),
+            )
+
+        for offset in range(self._width - length + 1 if length else 0):
+            yield (
+                (self._left[:, offset : offset + length] == candidate).all(axis=1),
+                length,
+                weights.sum(),
+            )
+
+        extended = np.concatenate(
+            [candidate, np.full(self._width, OUT_OF_BOUNDS, ENCODING_TYPE)]
+        )
+        for offset in range(length):
+            yield (
+                (
+                    (self._left == extended[offset : offset + self._width])
+                    | (self._left == PADDING)
+                ).all(axis=1),
+                self._lengths,
+                self._weights,
+            )
@@ -0,0 +1,225 @@
+from typing import Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import (
+    WEIGHTS,
+    LineToVecMatrix,
+    encode,
+    hash_ngrams,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncodings
+
+NGRAM_LENGTHS: Sequence[int] = (16, 12, 8, 6, 4)
+MAX_CANDIDATE_RATIO: float = 0.5
+POSTINGS_KINDS: Sequence[str] = ("boundaries", "ngrams")
+POSTINGS_PARTS: Sequence[str] = ("keys", "starts", "owners")
+
+Postings = Tuple[np.ndarray, np.ndarray, np.ndarray]
+ScoredCandidates = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def create_postings(keys: np.ndarray, owners: np.ndarray) -> Postings:
+    order = np.lexsort((owners, keys))
+    keys = keys[order]
+    owners = owners[order]
+    distinct = np.ones(len(keys), dtype=bool)
+    distinct[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+    keys = keys[distinct]
+    unique_keys, starts = np.unique(keys, return_index=True)
+    return unique_keys, np.append(starts, len(keys)), owners[distinct]
+
+
+def create_stored_postings(
+    arrays: Mapping[str, np.ndarray], kind: str, length: int
+) -> Postings:
+    keys, starts, owners = (arrays[f"{kind}{length}_{part}"] for part in POSTINGS_PARTS)
+    return keys, starts, owners
+
+
+def find_postings(postings: Postings, keys: Iterable[int]) -> Sequence[np.ndarray]:
+    unique_keys, starts, owners = postings
+    found = []
+    for key in keys:
+        position = np.searchsorted(unique_keys, key)
+        if position < len(unique_keys) and unique_keys[position] == key:
+            found.append(owners[starts[position] : starts[position + 1]])
+    return found
+
+
+def find_windows(split: np.ndarray, length: int) -> np.ndarray:
+    return (
+        hash_ngrams(np.lib.stride_tricks.sliding_window_view(split, length))
+        if len(split) >= length
+        else np.empty(0, np.int64)
+    )
+
+
+def weight_bound(candidate: Sequence[np.ndarray], length: int) -> int:
+    # Every overlap is a window of the candidate, so a window of the given
+    # length weighs at least as much as any shorter overlap.
+    return max(
+        (
+            int(
+                np.convolve(
+                    WEIGHTS[split.astype(np.intp)],
+                    np.ones(min(length, len(split)), dtype=np.int64),
+                    "valid",
+                ).max()
+            )
+            for split in candidate
+            if len(split) and length > 0
+        ),
+        default=0,
+    )
+
+
+class LineToVecNgramIndex:
+    def __init__(self, matrix: LineToVecMatrix, lengths: Sequence[int] = NGRAM_LENGTHS):
+        self._postings: Mapping[int, Tuple[Postings, Postings]] = {}
+        for length in sorted(lengths, reverse=True):
+            keys, owners, boundaries = matrix.ngrams(length)
+            self._postings[length] = (
+                create_postings(keys[boundaries], owners[boundaries]),
+                create_postings(keys, owners),
+            )
+        self._positions: Optional[np.ndarray] = None
+        self._updates: Optional[Tuple["LineToVecNgramIndex", np.ndarray]] = None
+
+    @staticmethod
+    def of_arrays(
+        lengths: Sequence[int], arrays: Mapping[str, np.ndarray]
+    ) -> "LineToVecNgramIndex":
+        index = LineToVecNgramIndex(LineToVecMatrix([]), ())
+        index._postings = {
+            length: (
+                create_stored_postings(arrays, POSTINGS_KINDS[0], length),
+                create_stored_postings(arrays, POSTINGS_KINDS[1], length),
+            )
+            for length in lengths
+        }
+        return index
+
+    @property
+    def arrays(self) -> Mapping[str, np.ndarray]:
+        # Updates are not included. Indexes are stored before they are updated.
+        return {
+            f"{kind}{length}_{part}": array
+            for length, postings in self._postings.items()
+            for kind, kind_postings in zip(POSTINGS_KINDS, postings)
+            for part, array in zip(POSTINGS_PARTS, kind_postings)
+        }
+
+    @property
+    def lengths(self) -> Sequence[int]:
+        return list(self._postings)
+
+    def update(
+        self,
+        positions: np.ndarray,
+        matrix: LineToVecMatrix,
+        matrix_positions: np.ndarray,
+    ) -> "LineToVecNgramIndex":
+        # The indexed entries are moved to the positions, or dropped where the
+        # position is -1, and the entries of the matrix are added at the
+        # matrix positions. Only the matrix is indexed.
+        index = LineToVecNgramIndex(LineToVecMatrix([]), ())
+        index._postings = self._postings
+        index._positions = positions
+        index._updates = (LineToVecNgramIndex(matrix, self.lengths), matrix_positions)
+        return index
+
+    def find_candidates(
+        self, candidate: Sequence[np.ndarray], length: int
+    ) -> np.ndarray:
+        found = self._find_indexed(candidate, length)
+        if self._positions is not None:
+            found = self._positions[found]
+            found = found[found >= 0]
+        if self._updates is not None:
+            updates, positions = self._updates
+            found = np.concatenate(
+                [found, positions[updates.find_candidates(candidate, length)]]
+            )
+        return np.unique(found)
+
+    def _find_indexed(self, candidate: Sequence[np.ndarray], length: int) -> np.ndarray:
+        boundaries, ngrams = self._postings[length]
+        # An entry can only score at least the length if it starts or ends
+        # with a window of the candidate or contains a whole candidate split.
+        found = [
+            *find_postings(
+                boundaries,
+                set(
+                    np.concatenate(
+                        [
+                            np.empty(0, np.int64),
+                            *(find_windows(split, length) for split in candidate),
+                        ]
+                    ).tolist()
+                ),
+            ),
+            *find_postings(
+                ngrams,
+                {
+                    int(hash_ngrams(split[:length]))
+                    for split in candidate
+                    if len(split) >= length
+                },
+            ),
+        ]
+        return np.concatenate([np.empty(0, np.intp), *found])
+
+
+def score_subset(
+    matrix: LineToVecMatrix,
+    candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+    scored: ScoredCandidates,
+    indices: np.ndarray,
+) -> ScoredCandidates:
+    scored_indices, scores, weighted_scores = scored
+    new_indices = np.setdiff1d(indices, scored_indices, assume_unique=True)
+    new_scores, new_weighted_scores = (
+        matrix.score(candidate_line_to_vecs)
+        if len(new_indices) == len(matrix)
+        else matrix.select(new_indices).score(candidate_line_to_vecs)
+    )
+    merged_indices = np.concatenate([scored_indices, new_indices])
+    order = np.argsort(merged_indices, kind="stable")
+    return (
+        merged_indices[order],
+        np.concatenate([scores, new_scores])[order],
+        np.concatenate([weighted_scores, new_weighted_scores])[order],
+    )
+
+
+def score_pruned(
+    matrix: LineToVecMatrix,
+    index: LineToVecNgramIndex,
+    candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+    number_of_results: int,
+) -> ScoredCandidates:
+    candidate = [encode(split) for split in candidate_line_to_vecs]
+    longest = max((len(split) for split in candidate), default=0)
+    scored: ScoredCandidates = (
+        np.empty(0, np.intp),
+        np.empty(0, np.int64),
+        np.empty(0, np.int64),
+    )
+    for length in index.lengths:
+        if length > longest:
+            continue
+        indices = index.find_candidates(candidate, length)
+        if len(indices) > MAX_CANDIDATE_RATIO * len(matrix):
+            break
+        scored = score_subset(matrix, candidate_line_to_vecs, scored, indices)
+        _, scores, weighted_scores = scored
+        # The other entries score less than the length and weigh at most the
+        # bound. One more result is required in case the candidate is ranked.
+        if (
+            np.count_nonzero(scores >= length) > number_of_results
+            and np.count_nonzero(weighted_scores > weight_bound(candidate, length - 1))
+            > number_of_results
+        ):
+            return scored
+    return score_subset(matrix, candidate_line_to_vecs, scored, np.arange(len(matrix)))
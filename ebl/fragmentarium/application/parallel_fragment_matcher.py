@@ -0,0 +1,135 @@
+import math
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ebl.fragmentarium.application.fragment_matcher import FragmentMatcher
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.application.line_to_vec_index import (
+    LineToVecIndex,
+    LineToVecSnapshot,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours_repository import (
+    LineToVecNeighboursRepository,
+)
+from ebl.fragmentarium.application.line_to_vec_store import LineToVecStore
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import (
+    LineToVecMatrix,
+    rank,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncodings
+
+Scores = List[Tuple[int, int, int]]
+
+# Each worker process holds one shard. It is sent once per snapshot so that
+# requests only transfer the candidate and the partial rankings.
+_shard: Optional[Tuple[int, int, LineToVecMatrix]] = None
+
+
+def _load_shard(version: int, offset: int, matrix: LineToVecMatrix) -> None:
+    global _shard
+    _shard = (version, offset, matrix)
+
+
+def _map_shard(version: int, offset: int, path: str, stop: int) -> None:
+    _load_shard(version, offset, LineToVecStore(path).matrix.shard(offset, stop))
+
+
+def _score_shard(
+    version: int,
+    candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+    number_of_results: int,
+) -> Scores:
+    if _shard is None or _shard[0] != version:
+        raise RuntimeError(f"Line to vec shard {version} is not loaded.")
+    _, offset, matrix = _shard
+    scores, weighted_scores = matrix.score(candidate_line_to_vecs)
+    indices = set(rank(scores, number_of_results).tolist()) | set(
+        rank(weighted_scores, number_of_results).tolist()
+    )
+    return [
+        (offset + index, int(scores[index]), int(weighted_scores[index]))
+        for index in indices
+    ]
+
+
+def create_shards(
+    matrix: LineToVecMatrix, number_of_shards: int
+) -> Sequence[Tuple[int, LineToVecMatrix]]:
+    shard_size = max(math.ceil(len(matrix) / number_of_shards), 1)
+    return [
+        (start, matrix.shard(start, min(start + shard_size, len(matrix))))
+        for start in range(0, len(matrix), shard_size)
+    ]
+
+
+class ParallelFragmentMatcher(FragmentMatcher):
+    def __init__(
+        self,
+        fragment_repository: FragmentRepository,
+        line_to_vec_index: LineToVecIndex,
+        neighbours_repository: LineToVecNeighboursRepository,
+        number_of_workers: int,
+    ):
+        super().__init__(fragment_repository, line_to_vec_index, neighbours_repository)
+        self._number_of_workers = number_of_workers
+        self._lock = threading.Lock()
+        self._executors: Sequence[Executor] = []
+        self._loaded_executors: Sequence[Executor] = []
+        self._snapshot: Optional[LineToVecSnapshot] = None
+        self._version = 0
+
+    def _score(
+        self,
+        snapshot: LineToVecSnapshot,
+        candidate_line_to_vecs: Tuple[LineToVecEncodings, ...],
+        number_of_results: int,
+    ) -> Iterable[Tuple[int, int, int]]:
+        with self._lock:
+            executors = self._load(snapshot)
+            # One more result per shard in case the candidate itself is ranked.
+            futures = [
+                executor.submit(
+                    _score_shard,
+                    self._version,
+                    candidate_line_to_vecs,
+                    number_of_results + 1,
+                )
+                for executor in executors
+            ]
+        return sorted(scores for future in futures for scores in future.result())
+
+    def _load(self, snapshot: LineToVecSnapshot) -> Sequence[Executor]:
+        if not self._executors:
+            self._executors = [
+                ProcessPoolExecutor(1, multiprocessing.get_context("spawn"))
+                for _ in range(self._number_of_workers)
+            ]
+        if self._snapshot is not snapshot:
+            self._version += 1
+            shards = create_shards(snapshot.matrix, self._number_of_workers)
+            for executor, (offset, shard) in zip(self._executors, shards):
+                # Shards of a stored snapshot are mapped by the workers
+                # instead of being copied to them.
+                if snapshot.store_path:
+                    executor.submit(
+                        _map_shard,
+                        self._version,
+                        offset,
+                        snapshot.store_path,
+                        offset + len(shard),
+                    )
+                else:
+                    executor.submit(_load_shard, self._version, offset, shard)
+            self._snapshot = snapshot
+            self._loaded_executors = self._executors[: len(shards)]
+        return self._loaded_executors
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for executor in self._executors:
+                executor.shutdown()
+            self._executors = []
+            self._loaded_executors = []
+            self._snapshot = None
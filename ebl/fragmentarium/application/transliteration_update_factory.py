@@ -1,21 +1,26 @@
+from concurrent.futures import Executor
+from typing import Optional
+
 from ebl.fragmentarium.domain.transliteration_update import TransliterationUpdate
 from ebl.transliteration.application.sign_repository import SignRepository
-from ebl.transliteration.application.signs_visitor import SignsVisitor
+from ebl.transliteration.application.signs_visitor import create_signs
 from ebl.transliteration.domain.atf import Atf, WORD_SEPARATOR
 from ebl.transliteration.domain.lark_parser import parse_atf_lark
-from ebl.transliteration.domain.text import TextLine
 
 
 class TransliterationUpdateFactory:
-    def __init__(self, sing_repository: SignRepository):
+    def __init__(
+        self,
+        sing_repository: SignRepository,
+        parser_executor: Optional[Executor] = None,
+    ):
         self._sing_repository = sing_repository
+        self._parser_executor = parser_executor
 
     def create(self, atf: Atf, notes: str = "") -> TransliterationUpdate:
-        text = parse_atf_lark(atf)
-        signs = "\n".join(self._map_line(line) for line in text.text_lines)
+        text = parse_atf_lark(atf, self._parser_executor)
+        signs = "\n".join(
+            WORD_SEPARATOR.join(line_signs)
+            for line_signs in create_signs(self._sing_repository, text.text_lines)
+        )
         return TransliterationUpdate(text, notes, signs)
-
-    def _map_line(self, line: TextLine) -> str:
-        visitor = SignsVisitor(self._sing_repository)
-        line.accept(visitor)
-        return WORD_SEPARATOR.join(visitor.result)
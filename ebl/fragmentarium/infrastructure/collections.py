@@ -1,2 +1,4 @@
 FRAGMENTS_COLLECTION = "fragments"
 JOINS_COLLECTION = "joins"
+LINE_TO_VEC_NEIGHBOURS_COLLECTION = "line_to_vec_neighbours"
+LINE_TO_VEC_NEIGHBOURS_RUNS_COLLECTION = "line_to_vec_neighbours_runs"
@@ -1,4 +1,4 @@
-from typing import List, Sequence
+from typing import List, Sequence, Tuple
 
 from marshmallow import EXCLUDE
 import pymongo
@@ -26,6 +26,12 @@ from ebl.fragmentarium.infrastructure.queries import (
 )
 from ebl.mongo_collection import MongoCollection
 from ebl.bibliography.infrastructure.bibliography import join_reference_documents
+from ebl.transliteration.infrastructure.queries import (
+    SIGN_NGRAMS,
+    match_signs,
+    sign_ngrams,
+)
+from ebl.transliteration.infrastructure.signs_versions import SignsVersions
 
 
 def has_none_values(dictionary: dict) -> bool:
@@ -36,6 +42,7 @@ class MongoFragmentRepository(FragmentRepository):
     def __init__(self, database):
         self._fragments = MongoCollection(database, collections.FRAGMENTS_COLLECTION)
         self._joins = MongoCollection(database, collections.JOINS_COLLECTION)
+        self._signs_versions = SignsVersions(database, collections.FRAGMENTS_COLLECTION)
 
     def create_indexes(self) -> None:
         self._fragments.create_index(
@@ -57,6 +64,7 @@ class MongoFragmentRepository(FragmentRepository):
         )
         self._fragments.create_index([("text.lines.type", pymongo.ASCENDING)])
         self._fragments.create_index([("record.type", pymongo.ASCENDING)])
+        self._fragments.create_index([(SIGN_NGRAMS, pymongo.ASCENDING)])
         self._fragments.create_index(
             [
                 ("publication", pymongo.ASCENDING),
@@ -85,12 +93,16 @@ class MongoFragmentRepository(FragmentRepository):
             return 0
 
     def create(self, fragment):
-        return self._fragments.insert_one(
-            {
-                "_id": str(fragment.number),
-                **FragmentSchema(exclude=["joins"]).dump(fragment),
-            }
-        )
+        try:
+            return self._fragments.insert_one(
+                {
+                    "_id": str(fragment.number),
+                    **FragmentSchema(exclude=["joins"]).dump(fragment),
+                    **sign_ngrams([fragment.signs or ""]),
+                }
+            )
+        finally:
+            self._signs_versions.bump()
 
     def create_join(self, joins: Sequence[Sequence[Join]]) -> None:
         self._joins.insert_one(
@@ -119,6 +131,16 @@ class MongoFragmentRepository(FragmentRepository):
         except StopIteration as error:
             raise NotFoundError(f"Fragment {number} not found.") from error
 
+    def query_by_museum_numbers(self, numbers: Sequence[MuseumNumber]):
+        cursor = self._fragments.find_many(
+            {"_id": {"$in": [str(number) for number in numbers]}},
+            projection={"joins": False, SIGN_NGRAMS: False},
+        )
+        fragments = {
+            fragment.number: fragment for fragment in self._map_fragments(cursor)
+        }
+        return [fragments[number] for number in numbers if number in fragments]
+
     def query_by_id_and_page_in_references(self, id_: str, pages: str):
         match: dict = {"references": {"$elemMatch": {"id": id_}}}
         if pages:
@@ -158,8 +180,40 @@ class MongoFragmentRepository(FragmentRepository):
             fragment["museumNumber"] for fragment in cursor
         )
 
+    def query_transliterated_signs(self) -> List[Tuple[MuseumNumber, str]]:
+        cursor = self._fragments.find_many(
+            HAS_TRANSLITERATION, projection=["museumNumber", "signs"]
+        )
+        return [
+            (
+                MuseumNumberSchema().load(fragment["museumNumber"]),
+                fragment.get("signs") or "",
+            )
+            for fragment in cursor
+        ]
+
+    def query_signs_version(self) -> int:
+        return self._signs_versions.find()
+
     def query_transliterated_line_to_vec(self,) -> List[LineToVecEntry]:
         cursor = self._fragments.find_many(HAS_TRANSLITERATION, {"text": False})
+        return self._map_line_to_vec(cursor)
+
+    def query_transliterated_line_to_vec_by_numbers(
+        self, numbers: Sequence[MuseumNumber]
+    ) -> List[LineToVecEntry]:
+        if not numbers:
+            return []
+        cursor = self._fragments.find_many(
+            {
+                **HAS_TRANSLITERATION,
+                "$or": [museum_number_is(number) for number in numbers],
+            },
+            {"text": False},
+        )
+        return self._map_line_to_vec(cursor)
+
+    def _map_line_to_vec(self, cursor) -> List[LineToVecEntry]:
         return [
             LineToVecEntry(
                 MuseumNumberSchema().load(fragment["museumNumber"]),
@@ -187,19 +241,27 @@ class MongoFragmentRepository(FragmentRepository):
 
     def query_by_transliteration(self, query):
         cursor = self._fragments.find_many(
-            {"signs": {"$regex": query.regexp}}, limit=100, projection={"joins": False}
+            match_signs(query),
+            limit=100,
+            projection={"joins": False, SIGN_NGRAMS: False},
         )
         return self._map_fragments(cursor)
 
     def update_transliteration(self, fragment):
-        self._fragments.update_one(
-            fragment_is(fragment),
-            {
-                "$set": FragmentSchema(
-                    only=("text", "notes", "signs", "record", "line_to_vec")
-                ).dump(fragment)
-            },
-        )
+        try:
+            self._fragments.update_one(
+                fragment_is(fragment),
+                {
+                    "$set": {
+                        **FragmentSchema(
+                            only=("text", "notes", "signs", "record", "line_to_vec")
+                        ).dump(fragment),
+                        **sign_ngrams([fragment.signs or ""]),
+                    }
+                },
+            )
+        finally:
+            self._signs_versions.bump()
 
     def update_genres(self, fragment):
         self._fragments.update_one(
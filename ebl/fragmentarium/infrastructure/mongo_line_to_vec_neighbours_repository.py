@@ -0,0 +1,86 @@
+from typing import Iterable, Mapping, Optional, Sequence, Tuple
+
+from pymongo import ReplaceOne
+from pymongo.database import Database
+
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecNeighbours,
+    LineToVecNeighboursRun,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours_repository import (
+    LineToVecNeighboursRepository,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours_schema import (
+    LineToVecNeighboursRunSchema,
+    LineToVecNeighboursSchema,
+)
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.fragmentarium.infrastructure import collections
+from ebl.mongo_collection import MongoCollection
+
+RUN_ID = "current"
+
+
+class MongoLineToVecNeighboursRepository(LineToVecNeighboursRepository):
+    def __init__(self, database: Database):
+        self._neighbours = MongoCollection(
+            database, collections.LINE_TO_VEC_NEIGHBOURS_COLLECTION
+        )
+        self._runs = MongoCollection(
+            database, collections.LINE_TO_VEC_NEIGHBOURS_RUNS_COLLECTION
+        )
+
+    def query_by_museum_number(self, number: MuseumNumber) -> LineToVecNeighbours:
+        return LineToVecNeighboursSchema().load(
+            self._neighbours.find_one_by_id(str(number))
+        )
+
+    def query_by_museum_numbers(
+        self, numbers: Iterable[MuseumNumber]
+    ) -> Sequence[LineToVecNeighbours]:
+        cursor = self._neighbours.find_many(
+            {"_id": {"$in": [str(number) for number in numbers]}}
+        )
+        return LineToVecNeighboursSchema(many=True).load(cursor)
+
+    def query_versions(self) -> Mapping[MuseumNumber, Tuple[str, str]]:
+        cursor = self._neighbours.find_many({}, projection=["digest", "corpus"])
+        return {
+            MuseumNumber.of(document["_id"]): (document["digest"], document["corpus"])
+            for document in cursor
+        }
+
+    def update(self, neighbours: Sequence[LineToVecNeighbours]) -> None:
+        if neighbours:
+            self._neighbours.bulk_write(
+                [
+                    ReplaceOne({"_id": str(entry.museum_number)}, document, upsert=True)
+                    for entry, document in zip(
+                        neighbours,
+                        LineToVecNeighboursSchema(many=True).dump(neighbours),
+                    )
+                ],
+                ordered=False,
+            )
+
+    def delete(self, numbers: Iterable[MuseumNumber]) -> None:
+        self._neighbours.delete_many(
+            {"_id": {"$in": [str(number) for number in numbers]}}
+        )
+
+    def query_run(self) -> Optional[LineToVecNeighboursRun]:
+        try:
+            return LineToVecNeighboursRunSchema().load(
+                self._runs.find_one({"_id": RUN_ID}, projection={"_id": False})
+            )
+        except NotFoundError:
+            return None
+
+    def save_run(self, run: LineToVecNeighboursRun) -> None:
+        self._runs.replace_one(
+            {"_id": RUN_ID, **LineToVecNeighboursRunSchema().dump(run)}, upsert=True
+        )
+
+    def delete_run(self) -> None:
+        self._runs.delete_many({"_id": RUN_ID})
@@ -0,0 +1,92 @@
+import argparse
+import math
+from typing import Callable, Sequence
+
+import pydash
+from joblib import Parallel, delayed
+from tqdm import tqdm
+
+from ebl.app import create_context
+from ebl.context import Context
+from ebl.fragmentarium.application.line_to_vec import LineToVecNeighboursRun
+from ebl.fragmentarium.application.line_to_vec_index import (
+    LineToVecSnapshot,
+    create_digest,
+    create_fingerprint,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours import (
+    LineToVecNeighboursUpdater,
+)
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+CHUNK_SIZE = 500
+
+
+def create_snapshot(context: Context) -> LineToVecSnapshot:
+    return LineToVecSnapshot.of(
+        context.fragment_repository.query_transliterated_line_to_vec()
+    )
+
+
+def query_corpus(context: Context) -> str:
+    return create_fingerprint(
+        create_digest(entry)
+        for entry in context.fragment_repository.query_transliterated_line_to_vec()
+    )
+
+
+def create_updater(
+    context: Context, snapshot: LineToVecSnapshot, number_of_neighbours: int
+) -> LineToVecNeighboursUpdater:
+    return LineToVecNeighboursUpdater(
+        context.line_to_vec_neighbours_repository, snapshot, number_of_neighbours
+    )
+
+
+def update_neighbours(
+    run: LineToVecNeighboursRun,
+    snapshot: LineToVecSnapshot,
+    numbers: Sequence[MuseumNumber],
+    id_: int,
+    number_of_neighbours: int,
+    context_factory: Callable[[], Context],
+) -> int:
+    # The workers use the planned snapshot, so that fragments changed after
+    # planning are not mixed into the run.
+    updater = create_updater(context_factory(), snapshot, number_of_neighbours)
+    updated = 0
+    for chunk in tqdm(
+        pydash.chunk(numbers, CHUNK_SIZE), desc=f"Chunk #{id_}", position=id_
+    ):
+        updated += updater.update(run, chunk)
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Number of processes to compute neighbours"
+    )
+    parser.add_argument(
+        "-n", "--neighbours", type=int, help="Number of neighbours to store"
+    )
+    args = parser.parse_args()
+    workers = args.workers or 6
+    number_of_neighbours = args.neighbours or 15
+
+    context = create_context()
+    snapshot = create_snapshot(context)
+    updater = create_updater(context, snapshot, number_of_neighbours)
+    run, outdated = updater.plan()
+    chunks = pydash.chunk(outdated, max(math.ceil(len(outdated) / workers), 1))
+    updated = Parallel(n_jobs=workers)(
+        delayed(update_neighbours)(
+            run, snapshot, subset, index, number_of_neighbours, create_context
+        )
+        for index, subset in enumerate(chunks)
+    )
+
+    if updater.finish(run, query_corpus(context)):
+        print(f"Update line to vec neighbours completed! Updated: {sum(updated)}")
+    else:
+        print("The fragments changed during the update. Run the update again.")
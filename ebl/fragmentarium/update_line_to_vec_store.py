@@ -0,0 +1,22 @@
+import argparse
+import os
+
+from ebl.app import create_context
+from ebl.fragmentarium.application.line_to_vec_store import (
+    LineToVecStoreDirectory,
+    create_watermark,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-d", "--directory", help="Directory of the line to vec store", default=None
+    )
+    args = parser.parse_args()
+    directory = args.directory or os.environ["LINE_TO_VEC_STORE"]
+
+    watermark = create_watermark()
+    entries = create_context().fragment_repository.query_transliterated_line_to_vec()
+    store = LineToVecStoreDirectory(directory).synchronize(entries, watermark)
+
+    print(f"Wrote {len(store)} line to vecs to {store.path}.")
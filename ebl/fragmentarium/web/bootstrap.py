@@ -4,7 +4,6 @@ from ebl.context import Context
 from ebl.dictionary.application.dictionary import Dictionary
 from ebl.fragmentarium.application.annotations_service import AnnotationsService
 from ebl.fragmentarium.application.fragment_finder import FragmentFinder
-from ebl.fragmentarium.application.fragment_matcher import FragmentMatcher
 from ebl.fragmentarium.application.fragmentarium import Fragmentarium
 from ebl.fragmentarium.web.annotations import AnnotationResource
 from ebl.fragmentarium.web.folio_pager import FolioPagerResource
@@ -24,6 +23,7 @@ from ebl.fragmentarium.web.transliterations import TransliterationResource
 
 def create_fragmentarium_routes(api: falcon.API, context: Context):
     context.fragment_repository.create_indexes()
+    context.changelog.create_indexes()
     fragmentarium = Fragmentarium(context.fragment_repository)
     finder = FragmentFinder(
         context.get_bibliography(),
@@ -31,6 +31,7 @@ def create_fragmentarium_routes(api: falcon.API, context: Context):
         Dictionary(context.word_repository, context.changelog),
         context.photo_repository,
         context.folio_repository,
+        context.fragment_signs_index,
     )
     updater = context.get_fragment_updater()
     annotations_service = AnnotationsService(
@@ -41,9 +42,7 @@ def create_fragmentarium_routes(api: falcon.API, context: Context):
     fragments = FragmentsResource(finder)
     fragment_genre = FragmentGenreResource(updater)
 
-    fragment_matcher = FragmentMatcherResource(
-        FragmentMatcher(context.fragment_repository)
-    )
+    fragment_matcher = FragmentMatcherResource(context.get_fragment_matcher())
     fragment_search = FragmentSearch(
         fragmentarium, finder, context.get_transliteration_query_factory()
     )
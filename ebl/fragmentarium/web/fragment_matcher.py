@@ -1,22 +1,44 @@
 from falcon import Request, Response, falcon
 
 from ebl.errors import DataError, NotFoundError
-from ebl.fragmentarium.application.fragment_matcher import FragmentMatcher
+from ebl.fragmentarium.application.fragment_matcher import (
+    FragmentMatcher,
+    LineToVecRanker,
+)
 from ebl.fragmentarium.application.line_to_vec_ranking_schema import (
     LineToVecRankingSchema,
 )
 from ebl.users.web.require_scope import require_scope
 
 
+def parse_number_of_results(params: dict) -> int:
+    value = params.get(
+        "numberOfResults", str(LineToVecRanker.NUMBER_OF_RESULTS_TO_RETURN)
+    )
+    try:
+        number_of_results = int(value)
+    except ValueError:
+        raise DataError(f"numberOfResults '{value}' has to be a number")
+    if number_of_results < 1:
+        raise DataError(f"numberOfResults '{value}' has to be positive")
+    if number_of_results > LineToVecRanker.MAX_NUMBER_OF_RESULTS:
+        raise DataError(
+            f"numberOfResults '{value}' has to be at most "
+            f"{LineToVecRanker.MAX_NUMBER_OF_RESULTS}"
+        )
+    return number_of_results
+
+
 class FragmentMatcherResource:
     def __init__(self, fragment_matcher: FragmentMatcher):
         self.fragment_matcher = fragment_matcher
 
     @falcon.before(require_scope, "transliterate:fragments")
     def on_get(self, req: Request, resp: Response, number) -> None:
+        number_of_results = parse_number_of_results(req.params)
         try:
             resp.media = LineToVecRankingSchema().dump(
-                self.fragment_matcher.rank_line_to_vec(number)
+                self.fragment_matcher.rank_line_to_vec(number, number_of_results)
             )
         except (ValueError, NotFoundError) as error:
             raise DataError(error)
@@ -1,14 +1,41 @@
 from abc import ABC
-from typing import Sequence
+from typing import Iterable, Sequence
 
+import attr
+
+from ebl.corpus.domain.chapter import ChapterId
 from ebl.dictionary.application.dictionary import Dictionary
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.lemmatization.domain.lemma_counts import LemmaCounts, WordKey, get_word_keys
 from ebl.lemmatization.domain.lemmatization import Lemma
+from ebl.transliteration.domain.tokens import Token
 
 
 class LemmaRepository(ABC):
+    def create_indexes(self) -> None:
+        ...
+
     def query_lemmas(self, word: str, is_normalized: bool) -> Sequence[Lemma]:
         ...
 
+    def query_lemmas_of_words(
+        self, words: Sequence[WordKey]
+    ) -> Sequence[Sequence[Lemma]]:
+        ...
+
+    def update_fragment_lemmas(self, number: MuseumNumber, counts: LemmaCounts) -> None:
+        ...
+
+    def update_chapter_lemmas(self, id_: ChapterId, counts: LemmaCounts) -> None:
+        ...
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class WordSuggestions:
+    value: str
+    is_normalized: bool
+    suggestions: Sequence[Sequence[dict]]
+
 
 class SuggestionFinder:
     def __init__(self, dictionary: Dictionary, repository: LemmaRepository) -> None:
@@ -16,7 +43,33 @@ class SuggestionFinder:
         self._dictionary = dictionary
 
     def find_lemmas(self, word: str, is_normalized: bool) -> Sequence[Sequence[dict]]:
+        results = self._repository.query_lemmas(word, is_normalized)
+        words = iter(
+            self._dictionary.find_many(
+                [unique_lemma for result in results for unique_lemma in result]
+            )
+        )
+        return [[next(words) for _ in result] for result in results]
+
+    def find_lemmas_of_tokens(
+        self, tokens: Iterable[Token]
+    ) -> Sequence[WordSuggestions]:
+        words = get_word_keys(tokens)
+        results = self._repository.query_lemmas_of_words(words)
+        ids = list(
+            dict.fromkeys(
+                unique_lemma
+                for result in results
+                for lemma in result
+                for unique_lemma in lemma
+            )
+        )
+        entries = dict(zip(ids, self._dictionary.find_many(ids))) if ids else {}
         return [
-            [self._dictionary.find(unique_lemma) for unique_lemma in result]
-            for result in self._repository.query_lemmas(word, is_normalized)
+            WordSuggestions(
+                value,
+                is_normalized,
+                [[entries[unique_lemma] for unique_lemma in lemma] for lemma in result],
+            )
+            for (value, is_normalized), result in zip(words, results)
         ]
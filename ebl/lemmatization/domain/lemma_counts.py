@@ -0,0 +1,28 @@
+from collections import Counter
+from typing import Iterable, Mapping, Sequence, Tuple
+
+from ebl.lemmatization.domain.lemmatization import Lemma
+from ebl.transliteration.domain.tokens import Token
+from ebl.transliteration.domain.word_tokens import AbstractWord
+
+WordKey = Tuple[str, bool]
+LemmaKey = Tuple[str, bool, Lemma]
+LemmaCounts = Mapping[LemmaKey, int]
+
+
+def get_word_keys(tokens: Iterable[Token]) -> Sequence[WordKey]:
+    return list(
+        dict.fromkeys(
+            (token.clean_value, token.normalized)
+            for token in tokens
+            if isinstance(token, AbstractWord) and token.lemmatizable
+        )
+    )
+
+
+def count_lemmas(tokens: Iterable[Token]) -> LemmaCounts:
+    return Counter(
+        (token.clean_value, token.normalized, tuple(token.unique_lemma))
+        for token in tokens
+        if isinstance(token, AbstractWord) and token.unique_lemma
+    )
@@ -1,20 +1,65 @@
-from typing import List, Sequence
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Union
 
+import pymongo
+from pymongo import DeleteOne, UpdateOne
+
+from ebl.corpus.domain.chapter import ChapterId
 from ebl.dictionary.domain.word import WordId
+from ebl.errors import Defect
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
 from ebl.lemmatization.application.suggestion_finder import LemmaRepository
+from ebl.lemmatization.domain.lemma_counts import LemmaCounts, WordKey
 from ebl.lemmatization.domain.lemmatization import Lemma
 from ebl.mongo_collection import MongoCollection
 
 COLLECTION = "fragments"
+CHAPTERS_COLLECTION = "chapters"
+LEMMA_COUNTS_COLLECTION = "lemma_counts"
+LEMMA_SOURCES_COLLECTION = "lemma_sources"
+LEMMA_COUNTS_STATE_COLLECTION = "lemma_counts_state"
+# The state holds the generation of the collections with the current counts,
+# which is missing until the counts have been built for the first time, and
+# while the counts are rebuilt the next generation and the sources saved in
+# the meanwhile.
+STATE_ID = "lemma_counts"
+FRAGMENT_SOURCE_PREFIX = f"{COLLECTION}/"
+
 
+def _match_words(words: Sequence[WordKey], prefix: str = "") -> dict:
+    return {
+        "$or": [
+            {f"{prefix}cleanValue": clean_value, f"{prefix}normalized": is_normalized}
+            for clean_value, is_normalized in words
+        ]
+    }
 
-def aggregate_lemmas(word: str, is_normalized: bool) -> List[dict]:
+
+def _group_lemmas(field: str, count: Union[int, str]) -> List[dict]:
+    return [
+        {
+            "$group": {
+                "_id": {
+                    "cleanValue": f"${field}.cleanValue",
+                    "normalized": f"${field}.normalized",
+                    "uniqueLemma": f"${field}.uniqueLemma",
+                },
+                "count": {"$sum": count},
+            }
+        },
+        {"$sort": {"count": -1}},
+    ]
+
+
+def aggregate_lemmas(words: Sequence[WordKey]) -> List[dict]:
     return [
         {
             "$match": {
                 "text.lines.content": {
                     "$elemMatch": {
-                        "cleanValue": word,
+                        "cleanValue": {
+                            "$in": [clean_value for clean_value, _ in words]
+                        },
                         "uniqueLemma.0": {"$exists": True},
                     }
                 }
@@ -52,23 +97,362 @@ def aggregate_lemmas(word: str, is_normalized: bool) -> List[dict]:
         },
         {
             "$match": {
-                "tokens.cleanValue": word,
-                "tokens.normalized": is_normalized,
+                **_match_words(words, "tokens."),
                 "tokens.uniqueLemma.0": {"$exists": True},
             }
         },
-        {"$group": {"_id": "$tokens.uniqueLemma", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
+        *_group_lemmas("tokens", 1),
+    ]
+
+
+def create_count_id(clean_value: str, normalized: bool, unique_lemma) -> dict:
+    # The field order has to match the ids created by aggregate_counts.
+    return {
+        "cleanValue": clean_value,
+        "normalized": normalized,
+        "uniqueLemma": list(unique_lemma),
+    }
+
+
+def create_generation_name(collection: str, generation: int) -> str:
+    return f"{collection}_{generation}"
+
+
+def aggregate_counts(generation: int) -> List[dict]:
+    return [
+        {"$unwind": "$lemmas"},
+        {
+            "$group": {
+                "_id": {
+                    "cleanValue": "$lemmas.cleanValue",
+                    "normalized": "$lemmas.normalized",
+                    "uniqueLemma": "$lemmas.uniqueLemma",
+                },
+                "count": {"$sum": "$lemmas.count"},
+            }
+        },
+        {"$out": create_generation_name(LEMMA_COUNTS_COLLECTION, generation)},
+    ]
+
+
+def create_fragment_source(number: MuseumNumber) -> str:
+    return f"{FRAGMENT_SOURCE_PREFIX}{number}"
+
+
+def create_chapter_source(id_: ChapterId) -> str:
+    return "/".join([CHAPTERS_COLLECTION, *(str(part) for part in id_.to_tuple())])
+
+
+CHAPTER_SOURCE = {
+    "$concat": [
+        f"{CHAPTERS_COLLECTION}/",
+        {"$ifNull": ["$textId.genre", "L"]},
+        "/",
+        {"$toString": "$textId.category"},
+        "/",
+        {"$toString": "$textId.index"},
+        "/",
+        "$stage",
+        "/",
+        "$name",
+    ]
+}
+
+
+def aggregate_source_lemmas(
+    source: dict, lines: List[dict], generation: int
+) -> List[dict]:
+    return [
+        *lines,
+        {
+            "$match": {
+                "token.uniqueLemma.0": {"$exists": True},
+                "token.normalized": {"$exists": True},
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "source": source,
+                    "cleanValue": "$token.cleanValue",
+                    "normalized": "$token.normalized",
+                    "uniqueLemma": "$token.uniqueLemma",
+                },
+                "count": {"$sum": 1},
+            }
+        },
+        {
+            "$group": {
+                "_id": "$_id.source",
+                "lemmas": {
+                    "$push": {
+                        "cleanValue": "$_id.cleanValue",
+                        "normalized": "$_id.normalized",
+                        "uniqueLemma": "$_id.uniqueLemma",
+                        "count": "$count",
+                    }
+                },
+            }
+        },
+        {
+            "$merge": {
+                "into": create_generation_name(LEMMA_SOURCES_COLLECTION, generation),
+                "whenMatched": "replace",
+            }
+        },
     ]
 
 
+def aggregate_fragment_lemmas(
+    generation: int, numbers: Optional[Sequence[str]] = None
+) -> List[dict]:
+    return aggregate_source_lemmas(
+        {"$concat": [FRAGMENT_SOURCE_PREFIX, "$_id"]},
+        [
+            {
+                "$match": {
+                    "text.lines.content.uniqueLemma.0": {"$exists": True},
+                    **({} if numbers is None else {"_id": {"$in": list(numbers)}}),
+                }
+            },
+            {"$unwind": "$text.lines"},
+            {"$unwind": "$text.lines.content"},
+            {"$project": {"token": "$text.lines.content"}},
+        ],
+        generation,
+    )
+
+
+def aggregate_chapter_lemmas(
+    generation: int, sources: Optional[Sequence[str]] = None
+) -> List[dict]:
+    return aggregate_source_lemmas(
+        CHAPTER_SOURCE,
+        [
+            *(
+                []
+                if sources is None
+                else [{"$match": {"$expr": {"$in": [CHAPTER_SOURCE, list(sources)]}}}]
+            ),
+            {"$unwind": "$lines"},
+            {"$unwind": "$lines.variants"},
+            {
+                "$project": {
+                    "textId": 1,
+                    "stage": 1,
+                    "name": 1,
+                    "tokens": {
+                        "$concatArrays": [
+                            "$lines.variants.reconstruction",
+                            {
+                                "$reduce": {
+                                    "input": "$lines.variants.manuscripts",
+                                    "initialValue": [],
+                                    "in": {
+                                        "$concatArrays": [
+                                            "$$value",
+                                            {"$ifNull": ["$$this.line.content", []]},
+                                        ]
+                                    },
+                                }
+                            },
+                        ]
+                    },
+                }
+            },
+            {"$unwind": "$tokens"},
+            {"$addFields": {"token": "$tokens"}},
+        ],
+        generation,
+    )
+
+
+def create_lemma_count_indexes(collection: MongoCollection) -> None:
+    collection.create_index(
+        [
+            ("_id.cleanValue", pymongo.ASCENDING),
+            ("_id.normalized", pymongo.ASCENDING),
+            ("count", pymongo.DESCENDING),
+        ]
+    )
+
+
+def create_lemmas(counts: LemmaCounts) -> List[dict]:
+    return [{**create_count_id(*key), "count": count} for key, count in counts.items()]
+
+
+def count_source_lemmas(lemmas: List[dict]) -> LemmaCounts:
+    return Counter(
+        {
+            (
+                lemma["cleanValue"],
+                lemma["normalized"],
+                tuple(lemma["uniqueLemma"]),
+            ): lemma["count"]
+            for lemma in lemmas
+        }
+    )
+
+
 class MongoLemmaRepository(LemmaRepository):
+    # lemma_counts holds one document per word and lemma with the count over
+    # all fragments and chapters. lemma_sources holds the counts of each
+    # fragment and chapter, which are needed to update the totals when one of
+    # them is saved. Both are suffixed with the generation from the state.
     def __init__(self, database):
+        self._database = database
         self._collection = MongoCollection(database, COLLECTION)
+        self._chapters = MongoCollection(database, CHAPTERS_COLLECTION)
+        self._state = MongoCollection(database, LEMMA_COUNTS_STATE_COLLECTION)
+
+    def create_indexes(self) -> None:
+        generation = self._find_state().get("current")
+        if generation is not None:
+            create_lemma_count_indexes(self._lemma_counts(generation))
 
     def query_lemmas(self, word: str, is_normalized: bool) -> Sequence[Lemma]:
-        cursor = self._collection.aggregate(aggregate_lemmas(word, is_normalized))
-        return [
-            [WordId(unique_lemma) for unique_lemma in result["_id"]]
-            for result in cursor
+        return self.query_lemmas_of_words([(word, is_normalized)])[0]
+
+    def query_lemmas_of_words(
+        self, words: Sequence[WordKey]
+    ) -> Sequence[Sequence[Lemma]]:
+        if not words:
+            return []
+        generation = self._find_state().get("current")
+        cursor = (
+            self._collection.aggregate(aggregate_lemmas(words))
+            if generation is None
+            else self._lemma_counts(generation).find_many(
+                {**_match_words(words, "_id."), "count": {"$gt": 0}},
+                sort=[("count", pymongo.DESCENDING)],
+            )
+        )
+        lemmas: Dict[WordKey, List[Lemma]] = {}
+        for result in cursor:
+            key = (result["_id"]["cleanValue"], result["_id"]["normalized"])
+            lemmas.setdefault(key, []).append(
+                [WordId(unique_lemma) for unique_lemma in result["_id"]["uniqueLemma"]]
+            )
+        return [lemmas.get(word, []) for word in words]
+
+    def update_fragment_lemmas(self, number: MuseumNumber, counts: LemmaCounts) -> None:
+        self._update_lemmas(create_fragment_source(number), counts)
+
+    def update_chapter_lemmas(self, id_: ChapterId, counts: LemmaCounts) -> None:
+        self._update_lemmas(create_chapter_source(id_), counts)
+
+    def rebuild_lemma_counts(self) -> int:
+        # The counts are built in the collections of the next generation while
+        # the current ones are still read and updated. The sources saved in
+        # the meanwhile are recorded in the state and counted again, until
+        # none were saved since the last count. The state is then switched to
+        # the new generation with one update, so that requests change from the
+        # current sources and counts to the new ones together.
+        previous = self._find_state().get("current")
+        generation = (previous or 0) + 1
+        for collection in [LEMMA_SOURCES_COLLECTION, LEMMA_COUNTS_COLLECTION]:
+            self._database.drop_collection(
+                create_generation_name(collection, generation)
+            )
+        self._state.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": STATE_ID},
+                    {"$set": {"rebuilding": generation, "pending": []}},
+                    upsert=True,
+                )
+            ]
+        )
+        self._collection.aggregate(aggregate_fragment_lemmas(generation))
+        self._chapters.aggregate(aggregate_chapter_lemmas(generation))
+        sources = self._lemma_sources(generation)
+        while True:
+            sources.aggregate(aggregate_counts(generation))
+            create_lemma_count_indexes(self._lemma_counts(generation))
+            if self._state.find_one_and_update(
+                {"_id": STATE_ID, "rebuilding": generation, "pending": []},
+                {
+                    "$set": {"current": generation},
+                    "$unset": {"rebuilding": "", "pending": ""},
+                },
+            ):
+                break
+            self._recount_sources(generation, self._take_pending(generation))
+        if previous is not None:
+            for collection in [LEMMA_SOURCES_COLLECTION, LEMMA_COUNTS_COLLECTION]:
+                self._database.drop_collection(
+                    create_generation_name(collection, previous)
+                )
+        return sources.count_documents({})
+
+    def _lemma_counts(self, generation: int) -> MongoCollection:
+        return MongoCollection(
+            self._database, create_generation_name(LEMMA_COUNTS_COLLECTION, generation)
+        )
+
+    def _lemma_sources(self, generation: int) -> MongoCollection:
+        return MongoCollection(
+            self._database, create_generation_name(LEMMA_SOURCES_COLLECTION, generation)
+        )
+
+    def _find_state(self) -> dict:
+        return next(self._state.find_many({"_id": STATE_ID}), None) or {}
+
+    def _take_pending(self, generation: int) -> Sequence[str]:
+        state = self._state.find_one_and_update(
+            {"_id": STATE_ID, "rebuilding": generation}, {"$set": {"pending": []}}
+        )
+        if state is None:
+            raise Defect(f"The lemma counts rebuild {generation} was replaced.")
+        return state["pending"]
+
+    def _recount_sources(self, generation: int, pending: Sequence[str]) -> None:
+        # Sources without lemmas are not written by the aggregations.
+        self._lemma_sources(generation).delete_many({"_id": {"$in": list(pending)}})
+        numbers = [
+            source[len(FRAGMENT_SOURCE_PREFIX) :]
+            for source in pending
+            if source.startswith(FRAGMENT_SOURCE_PREFIX)
+        ]
+        chapters = [
+            source
+            for source in pending
+            if not source.startswith(FRAGMENT_SOURCE_PREFIX)
+        ]
+        if numbers:
+            self._collection.aggregate(aggregate_fragment_lemmas(generation, numbers))
+        if chapters:
+            self._chapters.aggregate(aggregate_chapter_lemmas(generation, chapters))
+
+    def _update_lemmas(self, source: str, counts: LemmaCounts) -> None:
+        # The source is recorded in the same update which reads the state, so
+        # that a rebuild cannot switch to the new counts without it.
+        state = (
+            self._state.find_one_and_update(
+                {"_id": STATE_ID, "rebuilding": {"$exists": True}},
+                {"$addToSet": {"pending": source}},
+            )
+            or self._find_state()
+        )
+        generation = state.get("current")
+        if generation is None:
+            return
+        old = self._lemma_sources(generation).find_one_and_replace(
+            {"_id": source}, {"lemmas": create_lemmas(counts)}, upsert=True
+        )
+        delta = Counter(counts)
+        delta.subtract(count_source_lemmas(old["lemmas"]) if old else {})
+        requests: list = [
+            UpdateOne(
+                {"_id": create_count_id(*key)}, {"$inc": {"count": count}}, upsert=True
+            )
+            for key, count in delta.items()
+            if count != 0
         ]
+        requests.extend(
+            DeleteOne({"_id": create_count_id(*key), "count": {"$lte": 0}})
+            for key, count in delta.items()
+            if count < 0
+        )
+        if requests:
+            self._lemma_counts(generation).bulk_write(requests)
@@ -0,0 +1,15 @@
+import os
+
+from pymongo import MongoClient
+
+from ebl.lemmatization.infrastrcuture.mongo_suggestions_finder import (
+    MongoLemmaRepository,
+)
+
+if __name__ == "__main__":
+    client = MongoClient(os.environ["MONGODB_URI"])
+    repository = MongoLemmaRepository(client.get_database(os.environ.get("MONGODB_DB")))
+    repository.create_indexes()
+    updated = repository.rebuild_lemma_counts()
+
+    print(f"Counted the lemmas of {updated} fragments and chapters.")
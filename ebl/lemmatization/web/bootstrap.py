@@ -4,11 +4,23 @@ from ebl.context import Context
 from ebl.dictionary.application.dictionary import Dictionary
 from ebl.lemmatization.application.suggestion_finder import SuggestionFinder
 from ebl.lemmatization.web.lemma_search import LemmaSearch
+from ebl.lemmatization.web.text_lemma_search import (
+    ChapterLemmaSearch,
+    FragmentLemmaSearch,
+)
 
 
 def create_lemmatization_routes(api: falcon.API, context: Context):
+    context.lemma_repository.create_indexes()
     dictionary = Dictionary(context.word_repository, context.changelog)
     finder = SuggestionFinder(dictionary, context.lemma_repository)
     lemma_search = LemmaSearch(finder)
+    fragment_lemma_search = FragmentLemmaSearch(finder, context.fragment_repository)
+    chapter_lemma_search = ChapterLemmaSearch(finder, context.text_repository)
 
     api.add_route("/lemmas", lemma_search)
+    api.add_route("/fragments/{number}/lemmas", fragment_lemma_search)
+    api.add_route(
+        "/texts/{genre}/{category}/{index}/chapters/{stage}/{name}/lemmas",
+        chapter_lemma_search,
+    )
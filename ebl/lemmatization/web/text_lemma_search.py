@@ -0,0 +1,47 @@
+import falcon
+from marshmallow import Schema, fields
+
+from ebl.corpus.application.corpus import TextRepository, get_tokens
+from ebl.corpus.web.text_utils import create_chapter_id
+from ebl.fragmentarium.application.fragment_repository import FragmentRepository
+from ebl.fragmentarium.web.dtos import parse_museum_number
+from ebl.lemmatization.application.suggestion_finder import SuggestionFinder
+from ebl.users.web.require_scope import require_scope
+
+
+class WordSuggestionsSchema(Schema):
+    value = fields.String(required=True)
+    is_normalized = fields.Boolean(required=True, data_key="isNormalized")
+    suggestions = fields.List(fields.List(fields.Dict()), required=True)
+
+
+class FragmentLemmaSearch:
+    def __init__(self, finder: SuggestionFinder, repository: FragmentRepository):
+        self._finder = finder
+        self._repository = repository
+
+    @falcon.before(require_scope, "read:fragments")
+    @falcon.before(require_scope, "read:words")
+    def on_get(self, _req, resp, number):
+        fragment = self._repository.query_by_museum_number(parse_museum_number(number))
+        resp.media = WordSuggestionsSchema(many=True).dump(
+            self._finder.find_lemmas_of_tokens(
+                token for line in fragment.text.text_lines for token in line.content
+            )
+        )
+
+
+class ChapterLemmaSearch:
+    def __init__(self, finder: SuggestionFinder, repository: TextRepository):
+        self._finder = finder
+        self._repository = repository
+
+    @falcon.before(require_scope, "read:texts")
+    @falcon.before(require_scope, "read:words")
+    def on_get(self, _req, resp, genre, category, index, stage, name):
+        chapter = self._repository.find_chapter(
+            create_chapter_id(genre, category, index, stage, name)
+        )
+        resp.media = WordSuggestionsSchema(many=True).dump(
+            self._finder.find_lemmas_of_tokens(get_tokens(chapter))
+        )
@@ -53,6 +53,12 @@ class MongoCollection:
         else:
             return result
 
+    def find_one_and_replace(self, query, document, **kwargs):
+        return self.__get_collection().find_one_and_replace(query, document, **kwargs)
+
+    def find_one_and_update(self, query, update, **kwargs):
+        return self.__get_collection().find_one_and_update(query, update, **kwargs)
+
     def update_one(self, query, update):
         result = self.__get_collection().update_one(query, update)
         if result.matched_count == 0:
@@ -60,6 +66,12 @@ class MongoCollection:
         else:
             return result
 
+    def delete_many(self, query):
+        return self.__get_collection().delete_many(query)
+
+    def bulk_write(self, requests, **kwargs):
+        return self.__get_collection().bulk_write(requests, **kwargs)
+
     def count_documents(self, query) -> int:
         return self.__get_collection().count_documents(query)
 
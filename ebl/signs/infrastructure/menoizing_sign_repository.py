@@ -1,4 +1,4 @@
-from typing import Optional, Sequence
+from typing import Collection, Optional, Sequence, Tuple
 
 import pydash
 
@@ -8,7 +8,9 @@ from ebl.transliteration.domain.sign import Sign, SignName
 
 class MemoizingSignRepository(SignRepository):
     def __init__(self, delegate: SignRepository):
+        self._create_indexes = delegate.create_indexes
         self._create = delegate.create
+        self._find_many = delegate.find_many
         self._find = pydash.memoize(delegate.find)
         self._search = pydash.memoize(delegate.search)
         self._search_by_id = pydash.memoize(delegate.search_by_id)
@@ -19,12 +21,22 @@ class MemoizingSignRepository(SignRepository):
         )
         self._search_by_lists_name = pydash.memoize(delegate.search_by_lists_name)
 
+    def create_indexes(self) -> None:
+        self._create_indexes()
+
     def create(self, sign: Sign) -> str:
         return self._create(sign)
 
     def find(self, name: SignName) -> Sign:
         return self._find(name)
 
+    def find_many(
+        self,
+        names: Collection[SignName],
+        readings: Collection[Tuple[str, Optional[int]]],
+    ) -> Sequence[Sign]:
+        return self._find_many(names, readings)
+
     def search_by_lists_name(self, name: str, number: str) -> Sequence[Sign]:
         return self._search_by_lists_name(name, number)
 
@@ -1,7 +1,9 @@
 import re
-from typing import Optional, cast, Sequence, Dict
+from typing import Collection, Optional, cast, Sequence, Dict, Tuple
 
+import pymongo
 from marshmallow import EXCLUDE, Schema, fields, post_dump, post_load
+from pymongo import UpdateOne
 from pymongo.database import Database
 
 from ebl.errors import NotFoundError
@@ -16,6 +18,15 @@ from ebl.transliteration.domain.sign import (
 )
 
 COLLECTION = "signs"
+VERSION_COLLECTION = "sign_versions"
+COMPONENTS = "components"
+COMPONENT_DELIMITER = re.compile(r"[\.\+×&%@x|\(\)]")
+
+
+def create_components(name: str) -> Sequence[str]:
+    # A sign is a component of the signs containing its name between
+    # delimiters and of itself.
+    return sorted({name, *filter(None, COMPONENT_DELIMITER.split(name))})
 
 
 class SignListRecordSchema(Schema):
@@ -79,14 +90,71 @@ class SignDtoSchema(SignSchema):
 class MongoSignRepository(SignRepository):
     def __init__(self, database: Database):
         self._collection = MongoCollection(database, COLLECTION)
+        self._versions = MongoCollection(database, VERSION_COLLECTION)
+
+    def create_indexes(self) -> None:
+        self._collection.create_index([(COMPONENTS, pymongo.ASCENDING)])
 
     def create(self, sign: Sign) -> str:
-        return self._collection.insert_one(SignSchema().dump(sign))
+        try:
+            return self._collection.insert_one(
+                {**SignSchema().dump(sign), COMPONENTS: create_components(sign.name)}
+            )
+        finally:
+            self.bump_version()
+
+    def find_version(self) -> int:
+        document = next(self._versions.find_many({"_id": COLLECTION}), None)
+        return document["version"] if document else 0
+
+    def bump_version(self) -> None:
+        self._versions.bulk_write(
+            [UpdateOne({"_id": COLLECTION}, {"$inc": {"version": 1}}, upsert=True)]
+        )
+
+    def update_components(self) -> int:
+        names = [
+            document["_id"]
+            for document in self._collection.find_many({}, projection=["_id"])
+        ]
+        if names:
+            self._collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": name}, {"$set": {COMPONENTS: create_components(name)}}
+                    )
+                    for name in names
+                ],
+                ordered=False,
+            )
+        return len(names)
 
     def find(self, name: SignName) -> Sign:
         data = self._collection.find_one_by_id(name)
         return cast(Sign, SignSchema(unknown=EXCLUDE).load(data))
 
+    def find_all(self) -> Sequence[Sign]:
+        cursor = self._collection.find_many({})
+        return SignSchema().load(cursor, unknown=EXCLUDE, many=True)
+
+    def find_many(
+        self,
+        names: Collection[SignName],
+        readings: Collection[Tuple[str, Optional[int]]],
+    ) -> Sequence[Sign]:
+        # Signs with any of the values are returned, callers match sub indexes.
+        if not names and not readings:
+            return []
+        cursor = self._collection.find_many(
+            {
+                "$or": [
+                    {"_id": {"$in": list(names)}},
+                    {"values.value": {"$in": list({value for value, _ in readings})}},
+                ]
+            }
+        )
+        return SignSchema().load(cursor, unknown=EXCLUDE, many=True)
+
     def search(self, reading: str, sub_index: Optional[int] = None) -> Optional[Sign]:
         sub_index_query = {"$exists": False} if sub_index is None else sub_index
         try:
@@ -152,42 +220,32 @@ class MongoSignRepository(SignRepository):
         return SignSchema().load(cursor, unknown=EXCLUDE, many=True)
 
     def search_composite_signs(self, reading: str, sub_index: int) -> Sequence[Sign]:
-        cursor = self._collection.aggregate(
-            [
-                {
-                    "$match": {
-                        "values": {
-                            "$elemMatch": {"value": reading, "subIndex": sub_index}
-                        }
-                    }
-                },
-                {
-                    "$lookup": {
-                        "from": "signs",
-                        "let": {"leftId": "$_id"},
-                        "pipeline": [
-                            {
-                                "$match": {
-                                    "$expr": {
-                                        "$regexMatch": {
-                                            "input": "$_id",
-                                            "regex": {
-                                                "$concat": [
-                                                    r".*(^|[\.\+×&%@x|\(\)])",
-                                                    "$$leftId",
-                                                    r"($|[\.\+×&%@x|\(\)])",
-                                                ]
-                                            },
-                                        }
-                                    }
-                                }
-                            }
-                        ],
-                        "as": "joined",
-                    }
-                },
-                {"$unwind": "$joined"},
-                {"$replaceRoot": {"newRoot": "$joined"}},
-            ]
+        names = [
+            document["_id"]
+            for document in self._collection.find_many(
+                {"values": {"$elemMatch": {"value": reading, "subIndex": sub_index}}},
+                projection=["_id"],
+            )
+        ]
+        if not names:
+            return []
+        # Signs saved before the components were added are matched with the
+        # regular expression.
+        cursor = self._collection.find_many(
+            {
+                "$or": [
+                    {COMPONENTS: {"$in": names}},
+                    {
+                        COMPONENTS: None,
+                        "_id": {
+                            "$regex": (
+                                f"(^|{COMPONENT_DELIMITER.pattern})"
+                                f"({'|'.join(map(re.escape, names))})"
+                                f"($|{COMPONENT_DELIMITER.pattern})"
+                            )
+                        },
+                    },
+                ]
+            }
         )
         return SignSchema().load(cursor, unknown=EXCLUDE, many=True)
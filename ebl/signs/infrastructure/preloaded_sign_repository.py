@@ -0,0 +1,163 @@
+import math
+import os
+import threading
+import time
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import attr
+
+from ebl.errors import NotFoundError
+from ebl.transliteration.application.sign_repository import SignRepository
+from ebl.transliteration.domain.sign import Sign, SignName
+
+VERSION_TTL = float(os.environ.get("EBL_SIGN_TABLE_TTL", 10))
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SignTable:
+    by_name: Mapping[SignName, Sign]
+    positions: Mapping[SignName, int]
+    by_value: Mapping[Tuple[str, Optional[int]], Sequence[Sign]]
+    by_list: Mapping[Tuple[str, str], Sequence[Sign]]
+    homophones: Mapping[str, Sequence[Sign]]
+    version: int
+
+    @staticmethod
+    def of(signs: Iterable[Sign], version: int) -> "SignTable":
+        by_name: Dict[SignName, Sign] = {}
+        by_value: Dict[Tuple[str, Optional[int]], List[Sign]] = {}
+        by_list: Dict[Tuple[str, str], List[Sign]] = {}
+        by_reading: Dict[str, Dict[SignName, float]] = {}
+        for sign in signs:
+            by_name[sign.name] = sign
+            for key in {(value.value, value.sub_index) for value in sign.values}:
+                by_value.setdefault(key, []).append(sign)
+            for key in {(record.name, record.number) for record in sign.lists}:
+                by_list.setdefault(key, []).append(sign)
+            for value in sign.values:
+                sub_indexes = by_reading.setdefault(value.value, {})
+                sub_indexes[sign.name] = min(
+                    sub_indexes.get(sign.name, math.inf),
+                    math.inf if value.sub_index is None else value.sub_index,
+                )
+        positions = {name: position for position, name in enumerate(by_name)}
+        homophones = {
+            reading: [
+                by_name[name]
+                for name in sorted(sub_indexes, key=sub_indexes.__getitem__)
+            ]
+            for reading, sub_indexes in by_reading.items()
+        }
+        return SignTable(by_name, positions, by_value, by_list, homophones, version)
+
+
+class PreloadedSignRepository(SignRepository):
+    # Lookups used to create signs and homophone searches are answered from
+    # a table of all signs, other searches are delegated. The table is
+    # reloaded when the stored version of the signs changes. The version is
+    # checked at most once per ttl seconds, and on the next lookup after a
+    # sign was created through this repository.
+    def __init__(
+        self,
+        delegate: SignRepository,
+        load: Callable[[], Iterable[Sign]],
+        load_version: Callable[[], int] = lambda: 0,
+        ttl: float = VERSION_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._delegate = delegate
+        self._load = load
+        self._load_version = load_version
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._table: Optional[SignTable] = None
+        self._checked_at = -math.inf
+
+    @property
+    def is_resident(self) -> bool:
+        return True
+
+    @property
+    def version(self) -> int:
+        return self._get_table().version
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._checked_at = -math.inf
+
+    def create_indexes(self) -> None:
+        self._delegate.create_indexes()
+
+    def create(self, sign: Sign) -> str:
+        try:
+            return self._delegate.create(sign)
+        finally:
+            self.refresh()
+
+    def find(self, name: SignName) -> Sign:
+        try:
+            return self._get_table().by_name[name]
+        except KeyError as error:
+            raise NotFoundError(f"Sign {dict(_id=name)} not found.") from error
+
+    def find_many(
+        self,
+        names: Collection[SignName],
+        readings: Collection[Tuple[str, Optional[int]]],
+    ) -> Sequence[Sign]:
+        table = self._get_table()
+        found = {
+            *(name for name in names if name in table.by_name),
+            *(
+                sign.name
+                for reading in readings
+                for sign in table.by_value.get(reading, [])
+            ),
+        }
+        return [
+            table.by_name[name]
+            for name in sorted(found, key=table.positions.__getitem__)
+        ]
+
+    def search(self, reading: str, sub_index: Optional[int] = None) -> Optional[Sign]:
+        signs = self._get_table().by_value.get((reading, sub_index), [])
+        return signs[0] if signs else None
+
+    def search_all(self, reading: str, sub_index: int) -> Sequence[Sign]:
+        return list(self._get_table().by_value.get((reading, sub_index), []))
+
+    def search_by_lists_name(self, name: str, number: str) -> Sequence[Sign]:
+        return list(self._get_table().by_list.get((name, number), []))
+
+    def search_by_id(self, query: str) -> Sequence[Sign]:
+        return self._delegate.search_by_id(query)
+
+    def search_composite_signs(self, reading: str, sub_index: int) -> Sequence[Sign]:
+        return self._delegate.search_composite_signs(reading, sub_index)
+
+    def search_include_homophones(self, reading: str) -> Sequence[Sign]:
+        return list(self._get_table().homophones.get(reading, []))
+
+    def _get_table(self) -> SignTable:
+        table = self._table
+        if table is None or self._clock() >= self._checked_at + self._ttl:
+            with self._lock:
+                now = self._clock()
+                if self._table is None or now >= self._checked_at + self._ttl:
+                    version = self._load_version()
+                    self._checked_at = now
+                    if self._table is None or self._table.version != version:
+                        self._table = SignTable.of(self._load(), version)
+                table = self._table
+        return table
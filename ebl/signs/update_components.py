@@ -0,0 +1,13 @@
+import os
+
+from pymongo import MongoClient
+
+from ebl.signs.infrastructure.mongo_sign_repository import MongoSignRepository
+
+if __name__ == "__main__":
+    client = MongoClient(os.environ["MONGODB_URI"])
+    repository = MongoSignRepository(client.get_database(os.environ.get("MONGODB_DB")))
+    repository.create_indexes()
+    updated = repository.update_components()
+
+    print(f"Updated the components of {updated} signs.")
@@ -8,5 +8,6 @@ from ebl.signs.web.signs import SignsResource
 def create_signs_routes(api: falcon.API, context: Context):
     signs_search = SignsSearch(context.sign_repository)
     signs = SignsResource(context.sign_repository)
+    context.sign_repository.create_indexes()
     api.add_route("/signs", signs_search)
     api.add_route("/signs/{sign_name}", signs)
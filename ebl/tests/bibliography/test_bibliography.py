@@ -106,6 +106,23 @@ def test_create_duplicate(
         bibliography.create(bibliography_entry, user)
 
 
+def test_find_many(bibliography, bibliography_repository, when):
+    first, second = BibliographyEntryFactory.build_batch(2)
+    ids = [second["id"], first["id"], second["id"]]
+    when(bibliography_repository).query_by_ids(ids).thenReturn([first, second])
+
+    assert bibliography.find_many(ids) == [second, first, second]
+
+
+def test_find_many_not_found(bibliography, bibliography_repository, when):
+    entry = BibliographyEntryFactory.build()
+    ids = [entry["id"], "not found"]
+    when(bibliography_repository).query_by_ids(ids).thenReturn([entry])
+
+    with pytest.raises(NotFoundError, match="Unknown bibliography entries: not found."):
+        bibliography.find_many(ids)
+
+
 def test_entry_not_found(bibliography, bibliography_repository, when):
     bibliography_entry = BibliographyEntryFactory.build()
     (
@@ -161,7 +178,11 @@ def test_validate_references(
 ):
     reference = ReferenceFactory.build(with_document=True)
 
-    (when(bibliography).find(reference.id).thenReturn(reference))
+    (
+        when(bibliography_repository)
+        .query_by_ids([reference.id])
+        .thenReturn([reference.document])
+    )
     bibliography.validate_references([reference])
 
 
@@ -172,9 +193,11 @@ def test_validate_references_invalid(
     first_invalid = ReferenceFactory.build(with_document=True)
     second_invalid = ReferenceFactory.build(with_document=True)
     bibliography.create(valid_reference.document, user)
-    (when(bibliography).find(valid_reference.id).thenReturn(valid_reference))
-    (when(bibliography).find(first_invalid.id).thenRaise(NotFoundError))
-    (when(bibliography).find(second_invalid.id).thenRaise(NotFoundError))
+    (
+        when(bibliography_repository)
+        .query_by_ids([first_invalid.id, valid_reference.id, second_invalid.id])
+        .thenReturn([valid_reference.document])
+    )
 
     expected_error = (
         "Unknown bibliography entries: "
@@ -35,6 +35,20 @@ def test_find(database, bibliography_repository, create_mongo_bibliography_entry
     )
 
 
+def test_find_many(database, bibliography_repository, create_mongo_bibliography_entry):
+    entries = BibliographyEntryFactory.build_batch(2)
+    for entry in entries:
+        database[COLLECTION].insert_one(create_mongo_bibliography_entry(entry))
+
+    result = bibliography_repository.query_by_ids(
+        [entry["id"] for entry in entries] + ["not found"]
+    )
+
+    assert sorted(result, key=lambda entry: entry["id"]) == sorted(
+        entries, key=lambda entry: entry["id"]
+    )
+
+
 def test_entry_not_found(bibliography_repository):
     with pytest.raises(NotFoundError):
         bibliography_repository.query_by_id("not found")
@@ -0,0 +1,90 @@
+import pytest
+
+from ebl.bibliography.application.cached_bibliography_repository import (
+    CachedBibliographyRepository,
+)
+from ebl.cache import CacheInfo
+from ebl.errors import NotFoundError
+from ebl.tests.factories.bibliography import BibliographyEntryFactory
+
+
+@pytest.fixture
+def cached_bibliography_repository(bibliography_repository):
+    return CachedBibliographyRepository(bibliography_repository, 2)
+
+
+def test_query_by_id(cached_bibliography_repository):
+    entry = BibliographyEntryFactory.build()
+    cached_bibliography_repository.create(entry)
+
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == entry
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == entry
+    assert cached_bibliography_repository.info() == CacheInfo(1, 1, 2, 1)
+
+
+def test_query_by_ids(cached_bibliography_repository):
+    first, second = BibliographyEntryFactory.build_batch(2)
+    cached_bibliography_repository.create(first)
+    cached_bibliography_repository.create(second)
+    cached_bibliography_repository.query_by_id(first["id"])
+
+    result = cached_bibliography_repository.query_by_ids(
+        [first["id"], "not found", second["id"]]
+    )
+
+    assert result == [first, second]
+    assert cached_bibliography_repository.info() == CacheInfo(1, 3, 2, 2)
+
+
+def test_not_found_is_not_cached(cached_bibliography_repository):
+    with pytest.raises(NotFoundError):
+        cached_bibliography_repository.query_by_id("not found")
+
+    assert cached_bibliography_repository.info().currsize == 0
+
+
+def test_update_invalidates(cached_bibliography_repository):
+    entry = BibliographyEntryFactory.build()
+    updated_entry = {**entry, "title": "New Title"}
+    cached_bibliography_repository.create(entry)
+    cached_bibliography_repository.query_by_id(entry["id"])
+
+    cached_bibliography_repository.update(updated_entry)
+
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == updated_entry
+
+
+def test_least_recently_used_is_evicted(cached_bibliography_repository):
+    entries = BibliographyEntryFactory.build_batch(3)
+    for entry in entries:
+        cached_bibliography_repository.create(entry)
+        cached_bibliography_repository.query_by_id(entry["id"])
+
+    cached_bibliography_repository.query_by_id(entries[0]["id"])
+
+    assert cached_bibliography_repository.info() == CacheInfo(0, 4, 2, 2)
+
+
+def test_expired_entries_are_reloaded(bibliography_repository):
+    now = [0.0]
+    cached_bibliography_repository = CachedBibliographyRepository(
+        bibliography_repository, 2, 10, lambda: now[0]
+    )
+    entry = BibliographyEntryFactory.build()
+    updated_entry = {**entry, "title": "New Title"}
+    bibliography_repository.create(entry)
+    cached_bibliography_repository.query_by_id(entry["id"])
+    bibliography_repository.update(updated_entry)
+
+    now[0] = 9.0
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == entry
+    now[0] = 10.0
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == updated_entry
+
+
+def test_cached_entries_are_copied(cached_bibliography_repository):
+    entry = BibliographyEntryFactory.build()
+    cached_bibliography_repository.create(entry)
+    cached_bibliography_repository.query_by_id(entry["id"])["title"] = "Changed"
+
+    assert cached_bibliography_repository.query_by_id(entry["id"]) == entry
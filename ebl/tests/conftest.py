@@ -1,7 +1,7 @@
 import datetime
 import io
 import json
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, Mapping, Union
 import uuid
 
 import attr
@@ -10,7 +10,6 @@ import pytest
 from dictdiffer import diff
 from falcon import testing
 from falcon_auth import NoneAuthBackend
-from marshmallow import EXCLUDE
 from pymongo_inmemory import MongoClient
 
 import ebl.app
@@ -29,6 +28,7 @@ from ebl.fragmentarium.application.fragment_finder import FragmentFinder
 from ebl.fragmentarium.application.fragment_matcher import FragmentMatcher
 from ebl.fragmentarium.application.fragment_updater import FragmentUpdater
 from ebl.fragmentarium.application.fragmentarium import Fragmentarium
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecIndex
 from ebl.fragmentarium.application.transliteration_update_factory import (
     TransliterationUpdateFactory,
 )
@@ -36,15 +36,15 @@ from ebl.fragmentarium.infrastructure.fragment_repository import MongoFragmentRe
 from ebl.fragmentarium.infrastructure.mongo_annotations_repository import (
     MongoAnnotationsRepository,
 )
+from ebl.fragmentarium.infrastructure.mongo_line_to_vec_neighbours_repository import (
+    MongoLineToVecNeighboursRepository,
+)
 from ebl.lemmatization.infrastrcuture.mongo_suggestions_finder import (
     MongoLemmaRepository,
 )
 from ebl.tests.factories.bibliography import BibliographyEntryFactory
 from ebl.transliteration.domain.sign import Sign, SignListRecord, Value
-from ebl.signs.infrastructure.mongo_sign_repository import (
-    MongoSignRepository,
-    SignSchema,
-)
+from ebl.signs.infrastructure.mongo_sign_repository import MongoSignRepository
 from ebl.users.domain.user import User
 from ebl.users.infrastructure.auth0 import Auth0User
 
@@ -66,16 +66,9 @@ def changelog(database):
     return Changelog(database)
 
 
-class TestWordRepository(MongoWordRepository):
-    # Mongomock does not support $substrCP so we need to
-    # stub the methods using it.
-    def query_by_lemma_prefix(self, _):
-        return [self._collection.find_one({})]
-
-
 @pytest.fixture
 def word_repository(database):
-    return TestWordRepository(database)
+    return MongoWordRepository(database)
 
 
 @pytest.fixture
@@ -92,15 +85,6 @@ class TestBibliographyRepository(MongoBibliographyRepository):
         return [create_object_entry(self._collection.find_one({}))]
 
 
-class TestSignRepository(MongoSignRepository):
-    # Mongomock does not support $let in lookup so we need to
-    # stub the methods using it.
-    # https://github.com/mongomock/mongomock/issues/536
-
-    def search_composite_signs(self, reading: str, sub_index: int) -> Sequence[Sign]:
-        return [SignSchema(unknown=EXCLUDE).load(self._collection.find_one({}))]
-
-
 @pytest.fixture
 def bibliography_repository(database):
     return TestBibliographyRepository(database)
@@ -113,7 +97,7 @@ def bibliography(bibliography_repository, changelog):
 
 @pytest.fixture
 def sign_repository(database):
-    return TestSignRepository(database)
+    return MongoSignRepository(database)
 
 
 @pytest.fixture
@@ -153,14 +137,34 @@ def fragment_finder(
 
 
 @pytest.fixture
-def fragment_matcher(fragment_repository):
-    return FragmentMatcher(fragment_repository)
+def line_to_vec_index(fragment_repository):
+    return LineToVecIndex(fragment_repository)
 
 
 @pytest.fixture
-def fragment_updater(fragment_repository, changelog, bibliography, photo_repository):
+def line_to_vec_neighbours_repository(database):
+    return MongoLineToVecNeighboursRepository(database)
+
+
+@pytest.fixture
+def fragment_matcher(
+    fragment_repository, line_to_vec_index, line_to_vec_neighbours_repository
+):
+    return FragmentMatcher(
+        fragment_repository, line_to_vec_index, line_to_vec_neighbours_repository
+    )
+
+
+@pytest.fixture
+def fragment_updater(
+    fragment_repository, changelog, bibliography, photo_repository, line_to_vec_index
+):
     return FragmentUpdater(
-        fragment_repository, changelog, bibliography, photo_repository
+        fragment_repository,
+        changelog,
+        bibliography,
+        photo_repository,
+        line_to_vec_index,
     )
 
 
@@ -292,6 +296,8 @@ def context(
     bibliography_repository,
     annotations_repository,
     lemma_repository,
+    line_to_vec_index,
+    line_to_vec_neighbours_repository,
     database,
     user,
 ):
@@ -308,6 +314,8 @@ def context(
         text_repository=text_repository,
         annotations_repository=annotations_repository,
         lemma_repository=lemma_repository,
+        line_to_vec_index=line_to_vec_index,
+        line_to_vec_neighbours_repository=line_to_vec_neighbours_repository,
     )
 
 
@@ -5,16 +5,20 @@ from ebl.corpus.application.lemmatization import (
     ChapterLemmatization,
     LineVariantLemmatization,
 )
+from ebl.corpus.application.corpus import Corpus, get_tokens
 from ebl.corpus.application.schemas import ChapterSchema
 from ebl.corpus.domain.alignment import Alignment, ManuscriptLineAlignment
+from ebl.corpus.domain.chapter_info import ChapterInfo
 from ebl.corpus.domain.line import Line, LineVariant, ManuscriptLine
 from ebl.corpus.domain.parser import parse_chapter
 from ebl.dictionary.domain.word import WordId
 from ebl.errors import DataError, Defect, NotFoundError
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.lemmatization.domain.lemma_counts import count_lemmas
 from ebl.lemmatization.domain.lemmatization import LemmatizationToken
 from ebl.tests.corpus.support import ANY_USER
 from ebl.tests.factories.corpus import ChapterFactory, TextFactory
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.transliteration.domain.alignment import AlignmentError, AlignmentToken
 from ebl.transliteration.domain.atf import ATF_PARSER_VERSION
 from ebl.transliteration.domain.enclosure_tokens import BrokenAway
@@ -24,6 +28,7 @@ from ebl.transliteration.domain.sign_tokens import Reading
 from ebl.transliteration.domain.text import Text as Transliteration
 from ebl.transliteration.domain.text_line import TextLine
 from ebl.transliteration.domain.tokens import Joiner, LanguageShift, ValueToken
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 from ebl.transliteration.domain.word_tokens import Word
 from ebl.corpus.domain.lines_update import LinesUpdate
 
@@ -46,13 +51,20 @@ CHAPTER_WITHOUT_DOCUMENTS = attr.evolve(
 
 
 def expect_bibliography(bibliography, when) -> None:
-    for manuscript in CHAPTER.manuscripts:
-        for reference in manuscript.references:
-            (when(bibliography).find(reference.id).thenReturn(reference.document))
+    documents = {
+        reference.id: reference.document
+        for manuscript in CHAPTER.manuscripts
+        for reference in manuscript.references
+    }
+    (
+        when(bibliography)
+        .find_many(...)
+        .thenAnswer(lambda ids: [documents[id_] for id_ in ids])
+    )
 
 
 def expect_invalid_references(bibliography, when) -> None:
-    when(bibliography).find(...).thenRaise(NotFoundError())
+    when(bibliography).find_many(...).thenRaise(NotFoundError())
 
 
 def expect_signs(signs, sign_repository) -> None:
@@ -166,6 +178,89 @@ def test_update_chapter(
     )
 
 
+def test_search_transliteration_with_signs_index(
+    text_repository, bibliography, changelog, sign_repository, when
+) -> None:
+    query = TransliterationQuery([["KU"], ["ABZ075"]])
+    corpus = Corpus(
+        text_repository,
+        bibliography,
+        changelog,
+        sign_repository,
+        SignsIndex(lambda: [(CHAPTER.id_, CHAPTER.signs)]),
+    )
+    when(text_repository).find_chapters([CHAPTER.id_]).thenReturn([CHAPTER])
+
+    assert corpus.search_transliteration(query) == [ChapterInfo.of(CHAPTER, query)]
+
+
+def test_update_chapter_updates_signs_index(
+    text_repository, bibliography, changelog, signs, sign_repository, user, when
+) -> None:
+    signs_index = SignsIndex(lambda: [(CHAPTER.id_, ("MA",))])
+    corpus = Corpus(
+        text_repository, bibliography, changelog, sign_repository, signs_index
+    )
+    query = TransliterationQuery([["KU"]])
+    signs_index.search(query)
+    updated_chapter = attr.evolve(CHAPTER, version="New Version")
+    expect_chapter_update(
+        bibliography,
+        changelog,
+        CHAPTER_WITHOUT_DOCUMENTS,
+        updated_chapter,
+        signs,
+        sign_repository,
+        text_repository,
+        user,
+        when,
+    )
+
+    corpus.update_chapter(
+        CHAPTER_WITHOUT_DOCUMENTS.id_, CHAPTER_WITHOUT_DOCUMENTS, updated_chapter, user
+    )
+
+    assert signs_index.search(query) == [CHAPTER.id_]
+
+
+def test_update_chapter_updates_lemma_counts(
+    text_repository,
+    bibliography,
+    changelog,
+    signs,
+    sign_repository,
+    lemma_repository,
+    user,
+    when,
+) -> None:
+    corpus = Corpus(
+        text_repository,
+        bibliography,
+        changelog,
+        sign_repository,
+        lemma_repository=lemma_repository,
+    )
+    updated_chapter = attr.evolve(CHAPTER, version="New Version")
+    expect_chapter_update(
+        bibliography,
+        changelog,
+        CHAPTER_WITHOUT_DOCUMENTS,
+        updated_chapter,
+        signs,
+        sign_repository,
+        text_repository,
+        user,
+        when,
+    )
+    when(lemma_repository).update_chapter_lemmas(
+        CHAPTER.id_, count_lemmas(get_tokens(updated_chapter))
+    ).thenReturn()
+
+    corpus.update_chapter(
+        CHAPTER_WITHOUT_DOCUMENTS.id_, CHAPTER_WITHOUT_DOCUMENTS, updated_chapter, user
+    )
+
+
 def test_updating_alignment(
     corpus, text_repository, bibliography, changelog, signs, sign_repository, user, when
 ) -> None:
@@ -4,6 +4,7 @@ import pytest
 from ebl.corpus.application.schemas import ChapterSchema, TextSchema
 from ebl.errors import DuplicateError, NotFoundError
 from ebl.tests.factories.corpus import ChapterFactory, ManuscriptFactory, TextFactory
+from ebl.transliteration.domain.sign_ngrams import create_sign_ngrams
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 from ebl.transliteration.domain.genre import Genre
 from ebl.corpus.domain.text_id import TextId
@@ -50,7 +51,10 @@ def test_creating_chapter(database, text_repository):
         },
         projection={"_id": False},
     )
-    assert inserted_chapter == ChapterSchema().dump(CHAPTER)
+    assert inserted_chapter == {
+        **ChapterSchema().dump(CHAPTER),
+        "signNgrams": create_sign_ngrams(CHAPTER.signs),
+    }
 
 
 def test_it_is_not_possible_to_create_duplicate_texts(text_repository):
@@ -78,6 +82,22 @@ def test_finding_text(database, text_repository, bibliography_repository):
     assert text_repository.find(TEXT.id) == TEXT
 
 
+def test_finding_chapters(database, text_repository):
+    another_chapter = attr.evolve(CHAPTER, name="another chapter")
+    when_chapter_in_collection(database)
+    when_chapter_in_collection(database, another_chapter)
+
+    assert text_repository.find_chapters(
+        [another_chapter.id_, attr.evolve(CHAPTER, name="missing").id_, CHAPTER.id_]
+    ) == [another_chapter, CHAPTER]
+
+
+def test_query_signs(database, text_repository):
+    when_chapter_in_collection(database)
+
+    assert text_repository.query_signs() == [(CHAPTER.id_, list(CHAPTER.signs))]
+
+
 def test_find_raises_exception_if_text_not_found(text_repository):
     with pytest.raises(NotFoundError):
         text_repository.find(TextId(Genre.LITERATURE, 1, 1))
@@ -113,6 +133,15 @@ def test_updating_chapter(database, text_repository):
     assert text_repository.find_chapter(CHAPTER.id_) == updated_chapter
 
 
+def test_updating_chapter_bumps_signs_version(text_repository):
+    text_repository.create_chapter(CHAPTER)
+    version = text_repository.query_signs_version()
+
+    text_repository.update(CHAPTER.id_, CHAPTER)
+
+    assert text_repository.query_signs_version() == version + 1
+
+
 def test_updating_non_existing_chapter_raises_exception(text_repository):
     with pytest.raises(NotFoundError):
         text_repository.update(CHAPTER.id_, CHAPTER)
@@ -128,3 +157,17 @@ def test_query_by_transliteration(signs, is_match, text_repository):
     result = text_repository.query_by_transliteration(TransliterationQuery(signs))
     expected = [CHAPTER] if is_match else []
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    "signs,is_match",
+    [([["KU"]], True), ([["ABZ075"], ["KU"]], True), ([["UD"]], False)],
+)
+def test_query_by_transliteration_without_ngrams(
+    signs, is_match, database, text_repository
+):
+    when_chapter_in_collection(database)
+
+    result = text_repository.query_by_transliteration(TransliterationQuery(signs))
+    expected = [CHAPTER] if is_match else []
+    assert result == expected
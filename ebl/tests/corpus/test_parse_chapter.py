@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence
 
 import pytest
@@ -10,6 +11,8 @@ from ebl.corpus.domain.manuscript import (
     Provenance,
     Siglum,
 )
+import ebl.corpus.domain.parser as parser
+import ebl.transliteration.domain.lark_parser as lark_parser
 from ebl.corpus.domain.parser import parse_chapter, parse_paratext
 from ebl.errors import DataError
 from ebl.tests.factories.corpus import ManuscriptFactory
@@ -21,6 +24,7 @@ from ebl.transliteration.domain.lark_parser import (
 )
 from ebl.transliteration.domain.line import EmptyLine
 from ebl.transliteration.domain.line_number import LineNumber
+from ebl.transliteration.domain.parse_cache import PARSE_CACHE
 
 UNKNOWN_MANUSCRIPT: Manuscript = ManuscriptFactory.build()
 MANUSCRIPTS: Sequence[Manuscript] = (
@@ -261,3 +265,30 @@ def test_parse_chapter_line(lines, expected) -> None:
 def test_parse_chapter(lines, expected) -> None:
     atf = "\n\n".join(lines)
     assert parse_chapter(atf, MANUSCRIPTS) == expected
+
+
+def test_parse_chapter_is_cached() -> None:
+    PARSE_CACHE.clear()
+    atf = f"1. kur\n{MANUSCRIPTS[0].siglum} 1. kur\n\n2. ra"
+    expected = parse_chapter(atf, MANUSCRIPTS)
+
+    assert parse_chapter(atf, MANUSCRIPTS) == expected
+    assert PARSE_CACHE.info().hits == 2
+
+
+def test_parse_chapter_error_position() -> None:
+    with pytest.raises(DataError, match="line 6"):
+        parse_chapter("1. kur\n\n2. ra\n\n3. ra\n§", MANUSCRIPTS)
+
+
+def test_parse_chapter_in_parallel(monkeypatch) -> None:
+    monkeypatch.setattr(parser, "PARALLEL_THRESHOLD", 2)
+    monkeypatch.setattr(lark_parser, "PARALLEL_BATCH_SIZE", 2)
+    atf = "\n\n".join(
+        [f"1. kur\n{MANUSCRIPTS[0].siglum} 1. kur", "2. ra", "3. ku", "4. mu"]
+    )
+
+    with ThreadPoolExecutor(2) as executor:
+        assert parse_chapter(atf, MANUSCRIPTS, executor=executor) == parse_chapter(
+            atf, MANUSCRIPTS
+        )
@@ -1,6 +1,11 @@
 import pydash
 import pytest
 
+from ebl.dictionary.infrastructure.dictionary import (
+    SEARCH_PAGE_SIZE,
+    create_lemma_keys,
+    create_search_keys,
+)
 from ebl.errors import NotFoundError
 
 COLLECTION = "words"
@@ -9,7 +14,11 @@ COLLECTION = "words"
 def test_create(database, word_repository, word):
     word_id = word_repository.create(word)
 
-    assert database[COLLECTION].find_one({"_id": word_id}) == word
+    assert database[COLLECTION].find_one({"_id": word_id}) == {
+        **word,
+        "lemmaKeys": ["form1 ", "form2 part2 ", "part1 part2 "],
+        "meaningTokens": ["a", "meaning"],
+    }
 
 
 def test_find(database, word_repository, word):
@@ -69,3 +78,129 @@ def test_update(word_repository, word):
     word_repository.update(updated_word)
 
     assert word_repository.query_by_id(word_id) == updated_word
+
+
+def test_create_lemma_keys():
+    word = {"lemma": ["Šarru", "ʾālu"], "forms": [{"lemma": ["ŠARRU"]}]}
+
+    assert create_lemma_keys(word) == ["sarru ", "sarru ʾalu "]
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("pa", ["part1 part2 I"]),
+        ("part1 part2", ["part1 part2 I"]),
+        ("form2 p", ["part1 part2 I"]),
+        ("sar", ["šar", "šarru"]),
+        ("ŠAR", ["šar", "šarru"]),
+        ("šarru ", ["šarru"]),
+        ("x", []),
+    ],
+)
+def test_query_by_lemma_prefix(word_repository, word, query, expected):
+    word_repository.create(word)
+    for lemma in ["šarru", "šar"]:
+        word_repository.create({**word, "_id": lemma, "lemma": [lemma], "forms": []})
+
+    assert [
+        result["_id"] for result in word_repository.query_by_lemma_prefix(query)
+    ] == expected
+
+
+@pytest.mark.parametrize("query", ["form1", "FORM1", "fórm1"])
+def test_query_by_lemma_prefix_without_keys(database, word_repository, word, query):
+    database[COLLECTION].insert_one(word)
+
+    assert word_repository.query_by_lemma_prefix(query) == [word]
+
+
+def test_query_by_lemma_prefix_with_and_without_keys(database, word_repository, word):
+    database[COLLECTION].insert_one({**word, "_id": "šarru", "lemma": ["šarru"]})
+    word_repository.create({**word, "_id": "šar", "lemma": ["šar"], "forms": []})
+
+    assert [
+        result["_id"] for result in word_repository.query_by_lemma_prefix("sar")
+    ] == ["šar", "šarru"]
+
+
+def test_update_search_keys(database, word_repository, word):
+    database[COLLECTION].insert_one(word)
+
+    assert word_repository.update_search_keys() == 1
+    assert database[COLLECTION].find_one(
+        {"_id": word["_id"]}, projection=["lemmaKeys", "meaningTokens"]
+    ) == {"_id": word["_id"], **create_search_keys(word)}
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("MEAN", ["part1 part2 I"]),
+        ("a mean", ["part1 part2 I"]),
+        ("meaning a", ["part1 part2 I"]),
+        ("mea ning", []),
+        ("king", ["king"]),
+        ("kin", ["king"]),
+        ("ing", []),
+        ("ruler king", ["king"]),
+    ],
+)
+def test_search_finds_by_meaning_tokens(word_repository, word, query, expected):
+    word_repository.create(word)
+    word_repository.create({**word, "_id": "king", "meaning": "the king, ruler"})
+
+    assert [
+        result["_id"]
+        for result in word_repository.query_by_lemma_form_or_meaning(query)
+    ] == expected
+
+
+def test_search_ranks_lemmas_first(word_repository, word):
+    by_meaning = {**word, "_id": "a", "lemma": ["a"], "forms": [], "meaning": "form1"}
+    by_form = {**word, "_id": "b"}
+    by_lemma = {**word, "_id": "c", "lemma": ["form1"], "forms": []}
+    for word_ in [by_meaning, by_form, by_lemma]:
+        word_repository.create(word_)
+
+    assert word_repository.query_by_lemma_form_or_meaning("form1") == [
+        by_lemma,
+        by_form,
+        by_meaning,
+    ]
+
+
+def test_count_by_lemma_form_or_meaning(word_repository, word):
+    for id_ in ["a", "b"]:
+        word_repository.create({**word, "_id": id_})
+
+    assert word_repository.count_by_lemma_form_or_meaning("meaning") == 2
+    assert word_repository.count_by_lemma_form_or_meaning("not found") == 0
+
+
+def test_search_pages(word_repository, word):
+    ids = [f"{index:03}" for index in range(SEARCH_PAGE_SIZE + 1)]
+    for id_ in ids:
+        word_repository.create({**word, "_id": id_})
+
+    first = word_repository.query_by_lemma_form_or_meaning("meaning")
+    second = word_repository.query_by_lemma_form_or_meaning("meaning", 1)
+
+    assert [result["_id"] for result in first + second] == ids
+
+
+def test_query_by_ids(word_repository, word):
+    another_word = {**word, "_id": "part1 part2 II", "homonym": "II"}
+    for word_ in [word, another_word]:
+        word_repository.create(word_)
+
+    assert word_repository.query_by_ids(
+        [another_word["_id"], word["_id"], another_word["_id"]]
+    ) == [another_word, word, another_word]
+
+
+def test_query_by_ids_not_found(word_repository, word):
+    word_repository.create(word)
+
+    with pytest.raises(NotFoundError):
+        word_repository.query_by_ids([word["_id"], "not found"])
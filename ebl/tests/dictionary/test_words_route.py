@@ -4,6 +4,8 @@ from urllib import parse
 import falcon
 import pytest
 
+from ebl.dictionary.application.word_repository import SEARCH_PAGE_SIZE
+
 
 @pytest.fixture
 def saved_word(dictionary, word):
@@ -35,6 +37,36 @@ def test_search_word(client, saved_word):
     assert result.json == [saved_word]
     assert result.status == falcon.HTTP_OK
     assert result.headers["Access-Control-Allow-Origin"] == "*"
+    assert result.headers["X-Total-Count"] == "1"
+    assert "Link" not in result.headers
+
+
+def test_search_word_page(client, saved_word):
+    result = client.simulate_get("/words", params={"query": "meaning", "page": "1"})
+
+    assert result.status == falcon.HTTP_OK
+    assert result.json == []
+
+
+def test_search_word_next_page(client, dictionary, word):
+    for index in range(SEARCH_PAGE_SIZE + 1):
+        dictionary.create({**word, "_id": f"{index:03}"})
+
+    first = client.simulate_get("/words", params={"query": "meaning"})
+    second = client.simulate_get("/words", params={"query": "meaning", "page": "1"})
+
+    assert len(first.json) == SEARCH_PAGE_SIZE
+    assert first.headers["X-Total-Count"] == str(SEARCH_PAGE_SIZE + 1)
+    assert first.headers["Link"] == "</words?query=meaning&page=1>; rel=next"
+    assert len(second.json) == 1
+    assert "Link" not in second.headers
+
+
+@pytest.mark.parametrize("page", ["a", "-1"])
+def test_search_word_invalid_page(page, client):
+    result = client.simulate_get("/words", params={"query": "meaning", "page": page})
+
+    assert result.status == falcon.HTTP_UNPROCESSABLE_ENTITY
 
 
 def test_search_word_lemma(client, saved_word):
@@ -2,11 +2,13 @@ import pytest
 from mockito import spy2, unstub, verifyZeroInteractions
 
 from ebl.errors import NotFoundError
+from ebl.fragmentarium.application.fragment_finder import FragmentFinder
 from ebl.fragmentarium.domain.folios import Folio
 from ebl.fragmentarium.domain.fragment_info import FragmentInfo
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
 from ebl.tests.factories.bibliography import BibliographyEntryFactory, ReferenceFactory
 from ebl.tests.factories.fragment import FragmentFactory, TransliteratedFragmentFactory
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 
 
@@ -111,9 +113,11 @@ def test_inject_document_in_fragment_infos(fragment_finder, when, bibliography):
         .search_references("id", "pages")
         .thenReturn([fragment_1, fragment_2])
     )
-    (when(bibliography).find("RN.0").thenReturn(bibliography_entry))
-    (when(bibliography).find("RN.1").thenReturn(bibliography_entry))
-    (when(bibliography).find("RN.2").thenReturn(bibliography_entry))
+    (
+        when(bibliography)
+        .find_many(["RN.0", "RN.1", "RN.2"])
+        .thenReturn([bibliography_entry, bibliography_entry, bibliography_entry])
+    )
 
     assert fragment_finder.search_references_in_fragment_infos("id", "pages") == [
         fragment_expected_1,
@@ -158,6 +162,37 @@ def test_search_transliteration(fragment_finder, fragment_repository, when):
     assert fragment_finder.search_transliteration(query) == expected
 
 
+def test_search_transliteration_with_signs_index(
+    bibliography,
+    fragment_repository,
+    dictionary,
+    photo_repository,
+    file_repository,
+    when,
+):
+    transliterated_fragment = TransliteratedFragmentFactory.build()
+    fragment_finder = FragmentFinder(
+        bibliography,
+        fragment_repository,
+        dictionary,
+        photo_repository,
+        file_repository,
+        SignsIndex(
+            lambda: [(transliterated_fragment.number, [transliterated_fragment.signs])]
+        ),
+    )
+    query = TransliterationQuery([["MA", "UD"]])
+    (
+        when(fragment_repository)
+        .query_by_museum_numbers([transliterated_fragment.number])
+        .thenReturn([transliterated_fragment])
+    )
+
+    assert fragment_finder.search_transliteration(query) == [
+        FragmentInfo.of(transliterated_fragment, (("6'. [...] x# mu ta-ma;-tu₂",),))
+    ]
+
+
 @pytest.mark.parametrize(
     "query, expected", [([[""]], []), ([[""], [""]], []), ([["", ""]], [])]
 )
@@ -1,8 +1,15 @@
+import pytest
+
 from ebl.fragmentarium.application.fragment_matcher import (
     sort_scores_to_list,
+    LineToVecRanker,
     LineToVecRanking,
 )
-from ebl.fragmentarium.application.line_to_vec import LineToVecScore, LineToVecEntry
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecEntry,
+    LineToVecNeighbours,
+    LineToVecScore,
+)
 from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
 from ebl.tests.factories.fragment import FragmentFactory
@@ -30,6 +37,43 @@ def test_sort_scores_to_list():
     ]
 
 
+def test_ranker_keeps_top_scores():
+    ranker = LineToVecRanker(2)
+    for number, score in [("X.1", 4), ("X.2", 12), ("X.3", 2), ("X.4", 7)]:
+        ranker.insert_score(
+            LineToVecScore(MuseumNumber.of(number), "N/A", score),
+            LineToVecScore(MuseumNumber.of(number), "N/A", -score),
+        )
+
+    assert ranker.ranking == LineToVecRanking(
+        [
+            LineToVecScore(MuseumNumber.of("X.2"), "N/A", 12),
+            LineToVecScore(MuseumNumber.of("X.4"), "N/A", 7),
+        ],
+        [
+            LineToVecScore(MuseumNumber.of("X.3"), "N/A", -2),
+            LineToVecScore(MuseumNumber.of("X.1"), "N/A", -4),
+        ],
+    )
+
+
+def test_ranker_breaks_ties_by_insertion_order():
+    ranker = LineToVecRanker(2)
+    scores = [
+        LineToVecScore(MuseumNumber.of(f"X.{index}"), "N/A", 1) for index in range(4)
+    ]
+    for score in scores:
+        ranker.insert_score(score, score)
+
+    assert ranker.score == scores[:2]
+    assert ranker.score_weighted == scores[:2]
+
+
+def test_ranker_number_of_results_must_be_positive():
+    with pytest.raises(ValueError):
+        LineToVecRanker(0)
+
+
 def test_line_to_vec(fragment_matcher, when):
     parameters = "BM.11"
     fragment_1_line_to_vec = (LineToVecEncoding.from_list([1, 2, 1, 1]),)
@@ -90,3 +134,107 @@ def test_empty_line_to_vec(fragment_matcher, when):
         )
     )
     assert fragment_matcher.rank_line_to_vec(parameters) == LineToVecRanking([], [])
+
+
+@pytest.mark.parametrize(
+    "corpus, digest, number_of_results, expected_score",
+    [
+        ("current", "current", 1, 7),
+        ("current", "current", 2, 3),
+        ("outdated", "current", 1, 3),
+        ("current", "outdated", 1, 3),
+    ],
+)
+def test_line_to_vec_from_neighbours(
+    corpus,
+    digest,
+    number_of_results,
+    expected_score,
+    fragment_matcher,
+    line_to_vec_index,
+    line_to_vec_neighbours_repository,
+    when,
+):
+    line_to_vec = (LineToVecEncoding.from_list([2, 1, 1]),)
+    fragment = FragmentFactory.build(
+        number=MuseumNumber.of("BM.11"), line_to_vec=line_to_vec
+    )
+    entries = [
+        LineToVecEntry(fragment.number, "N/A", line_to_vec),
+        LineToVecEntry(MuseumNumber.of("X.1"), "N/A", line_to_vec),
+    ]
+    (
+        when(fragment_matcher._fragment_repository)
+        .query_by_museum_number(fragment.number)
+        .thenReturn(fragment)
+    )
+    (
+        when(fragment_matcher._fragment_repository)
+        .query_transliterated_line_to_vec()
+        .thenReturn(entries)
+    )
+    snapshot = line_to_vec_index.snapshot
+    stored_score = LineToVecScore(MuseumNumber.of("X.1"), "N/A", 7)
+    line_to_vec_neighbours_repository.update(
+        [
+            LineToVecNeighbours(
+                fragment.number,
+                snapshot.digests[0] if digest == "current" else "",
+                snapshot.fingerprint if corpus == "current" else "",
+                1,
+                [stored_score],
+                [stored_score],
+            )
+        ]
+    )
+
+    ranking = fragment_matcher.rank_line_to_vec("BM.11", number_of_results)
+
+    assert [score.score for score in ranking.score] == [expected_score]
+
+
+def test_line_to_vec_from_neighbours_scores_changed_fragments(
+    fragment_matcher, line_to_vec_index, line_to_vec_neighbours_repository, when
+):
+    line_to_vec = (LineToVecEncoding.from_list([2, 1, 1]),)
+    fragment = FragmentFactory.build(
+        number=MuseumNumber.of("BM.11"), line_to_vec=line_to_vec
+    )
+    neighbour = LineToVecEntry(
+        MuseumNumber.of("X.1"), "N/A", (LineToVecEncoding.from_list([1, 1]),)
+    )
+    entries = [
+        LineToVecEntry(fragment.number, "N/A", line_to_vec),
+        neighbour,
+        LineToVecEntry(MuseumNumber.of("X.2"), "N/A", line_to_vec),
+    ]
+    (
+        when(fragment_matcher._fragment_repository)
+        .query_by_museum_number(fragment.number)
+        .thenReturn(fragment)
+    )
+    (
+        when(fragment_matcher._fragment_repository)
+        .query_transliterated_line_to_vec()
+        .thenReturn(entries)
+    )
+    when(fragment_matcher)._score(...).thenRaise(AssertionError)
+    snapshot = line_to_vec_index.snapshot
+    stored_score = LineToVecScore(neighbour.museum_number, "N/A", 2)
+    line_to_vec_neighbours_repository.update(
+        [
+            LineToVecNeighbours(
+                fragment.number, snapshot.digests[0], "", 2, [stored_score], []
+            ),
+            LineToVecNeighbours(
+                neighbour.museum_number, snapshot.digests[1], "", 2, [], []
+            ),
+        ]
+    )
+
+    ranking = fragment_matcher.rank_line_to_vec("BM.11", 2)
+
+    assert [(str(score.museum_number), score.score) for score in ranking.score] == [
+        ("X.2", 3),
+        ("X.1", 2),
+    ]
@@ -1,4 +1,5 @@
 import falcon
+import pytest
 
 from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
 from ebl.fragmentarium.domain.museum_number import MuseumNumber
@@ -38,3 +39,43 @@ def test_fragment_matcher_route_error(client, fragmentarium, user):
     fragmentarium.create(fragment_2)
     get_result = client.simulate_get(f"/fragments/{faulty_fragment_id}/match")
     assert get_result.status == falcon.HTTP_UNPROCESSABLE_ENTITY
+
+
+def test_fragment_matcher_route_number_of_results(client, fragmentarium, user):
+    fragment_1 = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.15"))
+    fragment_2 = TransliteratedFragmentFactory.build(
+        number=MuseumNumber.of("X.326"),
+        line_to_vec=(LineToVecEncoding.from_list([1, 1, 2]),),
+    )
+    fragment_3 = TransliteratedFragmentFactory.build(
+        number=MuseumNumber.of("X.327"),
+        line_to_vec=(LineToVecEncoding.from_list([1, 1]),),
+    )
+    for fragment in [fragment_1, fragment_2, fragment_3]:
+        fragmentarium.create(fragment)
+
+    get_result = client.simulate_get(
+        "/fragments/X.15/match", params={"numberOfResults": 1}
+    )
+
+    assert get_result.status == falcon.HTTP_OK
+    assert get_result.json == {
+        "score": [{"museumNumber": "X.326", "script": fragment_2.script, "score": 3}],
+        "scoreWeighted": [
+            {"museumNumber": "X.326", "script": fragment_2.script, "score": 5}
+        ],
+    }
+
+
+@pytest.mark.parametrize("number_of_results", ["0", "-1", "101", "many"])
+def test_fragment_matcher_route_invalid_number_of_results(
+    number_of_results, client, fragmentarium, user
+):
+    fragment = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.15"))
+    fragmentarium.create(fragment)
+
+    get_result = client.simulate_get(
+        "/fragments/X.15/match", params={"numberOfResults": number_of_results}
+    )
+
+    assert get_result.status == falcon.HTTP_UNPROCESSABLE_ENTITY
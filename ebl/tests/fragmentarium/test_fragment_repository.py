@@ -21,6 +21,7 @@ from ebl.transliteration.domain.lark_parser import parse_atf_lark
 from ebl.transliteration.domain.line import ControlLine, EmptyLine
 from ebl.transliteration.domain.line_number import LineNumber
 from ebl.transliteration.domain.normalized_akkadian import AkkadianWord
+from ebl.transliteration.domain.sign_ngrams import create_sign_ngrams
 from ebl.transliteration.domain.sign_tokens import Logogram, Reading
 from ebl.transliteration.domain.text import Text
 from ebl.transliteration.domain.text_line import TextLine
@@ -74,7 +75,10 @@ def test_create(database, fragment_repository):
     assert fragment_id == str(fragment.number)
     assert database[COLLECTION].find_one(
         {"_id": fragment_id}, projection={"_id": False}
-    ) == FragmentSchema(exclude=["joins"]).dump(fragment)
+    ) == {
+        **FragmentSchema(exclude=["joins"]).dump(fragment),
+        "signNgrams": create_sign_ngrams([fragment.signs]),
+    }
 
 
 def test_create_join(database, fragment_repository):
@@ -104,6 +108,19 @@ def test_query_by_museum_number(database, fragment_repository):
     assert fragment_repository.query_by_museum_number(fragment.number) == fragment
 
 
+def test_query_by_museum_numbers(fragment_repository):
+    fragments = [
+        TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.1")),
+        FragmentFactory.build(number=MuseumNumber.of("X.2")),
+    ]
+    for fragment in fragments:
+        fragment_repository.create(fragment)
+
+    assert fragment_repository.query_by_museum_numbers(
+        [MuseumNumber.of("X.2"), MuseumNumber.of("X.3"), MuseumNumber.of("X.1")]
+    ) == [fragments[1], fragments[0]]
+
+
 def test_query_by_museum_number_joins(database, fragment_repository):
     museum_number = MuseumNumber("X", "1")
     first_join = Join(museum_number, is_in_fragmentarium=True)
@@ -204,6 +221,19 @@ def test_update_transliteration_with_record(fragment_repository, user):
     assert result == updated_fragment
 
 
+def test_update_transliteration_bumps_signs_version(fragment_repository, user):
+    fragment = FragmentFactory.build()
+    fragment_repository.create(fragment)
+    version = fragment_repository.query_signs_version()
+    updated_fragment = fragment.update_transliteration(
+        TransliterationUpdate(parse_atf_lark("$ (the transliteration)"), "notes"), user
+    )
+
+    fragment_repository.update_transliteration(updated_fragment)
+
+    assert fragment_repository.query_signs_version() == version + 1
+
+
 def test_update_update_transliteration_not_found(fragment_repository):
     transliterated_fragment = TransliteratedFragmentFactory.build()
     with pytest.raises(NotFoundError):
@@ -392,6 +422,18 @@ def test_search_signs(signs, is_match, fragment_repository):
     assert result == expected
 
 
+@pytest.mark.parametrize("signs,is_match", SEARCH_SIGNS_DATA)
+def test_search_signs_without_ngrams(signs, is_match, database, fragment_repository):
+    transliterated_fragment = TransliteratedFragmentFactory.build()
+    database[COLLECTION].insert_many(
+        [SCHEMA.dump(transliterated_fragment), SCHEMA.dump(FragmentFactory.build())]
+    )
+
+    result = fragment_repository.query_by_transliteration(TransliterationQuery(signs))
+    expected = [transliterated_fragment] if is_match else []
+    assert result == expected
+
+
 def test_find_transliterated(database, fragment_repository):
     transliterated_fragment = TransliteratedFragmentFactory.build()
     database[COLLECTION].insert_many(
@@ -403,6 +445,17 @@ def test_find_transliterated(database, fragment_repository):
     ]
 
 
+def test_find_transliterated_signs(database, fragment_repository):
+    transliterated_fragment = TransliteratedFragmentFactory.build()
+    database[COLLECTION].insert_many(
+        [SCHEMA.dump(transliterated_fragment), SCHEMA.dump(FragmentFactory.build())]
+    )
+
+    assert fragment_repository.query_transliterated_signs() == [
+        (transliterated_fragment.number, transliterated_fragment.signs)
+    ]
+
+
 def test_find_transliterated_line_to_vec(database, fragment_repository):
     transliterated_fragment = TransliteratedFragmentFactory.build()
     database[COLLECTION].insert_many(
@@ -417,6 +470,29 @@ def test_find_transliterated_line_to_vec(database, fragment_repository):
     ]
 
 
+def test_find_transliterated_line_to_vec_by_numbers(database, fragment_repository):
+    transliterated_fragment = TransliteratedFragmentFactory.build()
+    fragment = FragmentFactory.build()
+    database[COLLECTION].insert_many(
+        [
+            SCHEMA.dump(transliterated_fragment),
+            SCHEMA.dump(TransliteratedFragmentFactory.build()),
+            SCHEMA.dump(fragment),
+        ]
+    )
+
+    assert fragment_repository.query_transliterated_line_to_vec_by_numbers(
+        [transliterated_fragment.number, fragment.number]
+    ) == [
+        LineToVecEntry(
+            transliterated_fragment.number,
+            transliterated_fragment.script,
+            transliterated_fragment.line_to_vec,
+        )
+    ]
+    assert fragment_repository.query_transliterated_line_to_vec_by_numbers([]) == []
+
+
 def test_update_references(fragment_repository):
     reference = ReferenceFactory.build()
     fragment = FragmentFactory.build()
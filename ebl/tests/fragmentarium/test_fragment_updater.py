@@ -3,13 +3,17 @@ from freezegun import freeze_time
 
 from ebl.errors import DataError, NotFoundError
 from ebl.fragmentarium.application.fragment_schema import FragmentSchema
+from ebl.fragmentarium.application.fragment_updater import FragmentUpdater
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
 from ebl.fragmentarium.domain.fragment import Genre
 from ebl.fragmentarium.domain.transliteration_update import TransliterationUpdate
 from ebl.lemmatization.domain.lemmatization import Lemmatization, LemmatizationToken
 from ebl.tests.factories.bibliography import ReferenceFactory
 from ebl.tests.factories.fragment import FragmentFactory, TransliteratedFragmentFactory
+from ebl.transliteration.application.signs_index import SignsIndex
 from ebl.transliteration.domain.atf import Atf
 from ebl.transliteration.domain.lark_parser import parse_atf_lark
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
 
 SCHEMA = FragmentSchema()
 
@@ -47,6 +51,63 @@ def test_update_transliteration(
     assert updated_fragment == (expected_fragment, False)
 
 
+def test_update_transliteration_updates_line_to_vec_index(
+    fragment_updater, user, fragment_repository, line_to_vec_index, when
+):
+    transliterated_fragment = TransliteratedFragmentFactory.build(line_to_vec=None)
+    number = transliterated_fragment.number
+    transliteration = TransliterationUpdate(parse_atf_lark(Atf("1. x x")), "", "X X")
+    (
+        when(fragment_repository)
+        .query_by_museum_number(number)
+        .thenReturn(transliterated_fragment)
+    )
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([])
+    line_to_vec_index.entries
+
+    updated_fragment, _ = fragment_updater.update_transliteration(
+        number, transliteration, user
+    )
+
+    assert list(line_to_vec_index.entries) == [
+        LineToVecEntry(number, updated_fragment.script, updated_fragment.line_to_vec)
+    ]
+
+
+def test_update_transliteration_updates_signs_index(
+    user,
+    fragment_repository,
+    changelog,
+    bibliography,
+    photo_repository,
+    line_to_vec_index,
+    when,
+):
+    transliterated_fragment = TransliteratedFragmentFactory.build(line_to_vec=None)
+    number = transliterated_fragment.number
+    transliteration = TransliterationUpdate(parse_atf_lark(Atf("1. x x")), "", "X X")
+    signs_index = SignsIndex(lambda: [(number, ["MA"])])
+    query = TransliterationQuery([["X", "X"]])
+    fragment_updater = FragmentUpdater(
+        fragment_repository,
+        changelog,
+        bibliography,
+        photo_repository,
+        line_to_vec_index,
+        signs_index,
+    )
+    (
+        when(fragment_repository)
+        .query_by_museum_number(number)
+        .thenReturn(transliterated_fragment)
+    )
+    signs_index.search(query)
+
+    fragment_updater.update_transliteration(number, transliteration, user)
+
+    assert signs_index.search(query) == [number]
+
+
 def test_update_update_transliteration_not_found(
     fragment_updater, user, fragment_repository, when
 ):
@@ -109,6 +170,40 @@ def test_update_lemmatization(
     assert updated_fragment == (expected_fragment, False)
 
 
+def test_update_lemmatization_updates_lemma_counts(
+    user,
+    fragment_repository,
+    changelog,
+    bibliography,
+    photo_repository,
+    line_to_vec_index,
+    lemma_repository,
+    when,
+):
+    transliterated_fragment = TransliteratedFragmentFactory.build()
+    number = transliterated_fragment.number
+    tokens = [list(line) for line in transliterated_fragment.text.lemmatization.tokens]
+    tokens[1][3] = LemmatizationToken(tokens[1][3].value, ("aklu I",))
+    fragment_updater = FragmentUpdater(
+        fragment_repository,
+        changelog,
+        bibliography,
+        photo_repository,
+        line_to_vec_index,
+        lemma_repository=lemma_repository,
+    )
+    (
+        when(fragment_repository)
+        .query_by_museum_number(number)
+        .thenReturn(transliterated_fragment)
+    )
+    when(lemma_repository).update_fragment_lemmas(
+        number, {("u₄-šu", False, ("aklu I",)): 1}
+    ).thenReturn()
+
+    fragment_updater.update_lemmatization(number, Lemmatization(tokens), user)
+
+
 def test_update_update_lemmatization_not_found(
     fragment_updater, user, fragment_repository, when
 ):
@@ -130,7 +225,7 @@ def test_update_references(
     reference = ReferenceFactory.build()
     references = (reference,)
     expected_fragment = fragment.set_references(references)
-    when(bibliography).find(reference.id).thenReturn(reference)
+    when(bibliography).find_many([reference.id]).thenReturn([reference])
     (
         when(fragment_repository)
         .query_by_museum_number(number)
@@ -155,7 +250,7 @@ def test_update_references_invalid(
     fragment = FragmentFactory.build()
     number = fragment.number
     reference = ReferenceFactory.build()
-    when(bibliography).find(reference.id).thenRaise(NotFoundError)
+    when(bibliography).find_many([reference.id]).thenRaise(NotFoundError)
     (when(fragment_repository).query_by_museum_number(number).thenReturn(fragment))
     references = (reference,)
 
@@ -0,0 +1,119 @@
+import threading
+
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecSnapshot
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.tests.factories.fragment import FragmentFactory, TransliteratedFragmentFactory
+
+LINE_TO_VEC = (LineToVecEncoding.from_list([1, 2, 1]),)
+ENTRY = LineToVecEntry(MuseumNumber.of("X.1"), "N/A", LINE_TO_VEC)
+
+
+def test_entries_are_loaded_once(line_to_vec_index, fragment_repository, when):
+    (
+        when(fragment_repository)
+        .query_transliterated_line_to_vec()
+        .thenReturn([ENTRY])
+        .thenReturn([])
+    )
+
+    assert list(line_to_vec_index.entries) == [ENTRY]
+    assert list(line_to_vec_index.entries) == [ENTRY]
+
+
+def test_update_adds_transliterated_fragment(
+    line_to_vec_index, fragment_repository, when
+):
+    fragment = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.2"))
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([ENTRY])
+    line_to_vec_index.entries
+
+    line_to_vec_index.update(fragment)
+
+    assert list(line_to_vec_index.entries) == [
+        ENTRY,
+        LineToVecEntry(fragment.number, fragment.script, fragment.line_to_vec),
+    ]
+
+
+def test_update_replaces_fragment(line_to_vec_index, fragment_repository, when):
+    fragment = TransliteratedFragmentFactory.build(number=ENTRY.museum_number)
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([ENTRY])
+    line_to_vec_index.entries
+
+    line_to_vec_index.update(fragment)
+
+    assert list(line_to_vec_index.entries) == [
+        LineToVecEntry(fragment.number, fragment.script, fragment.line_to_vec)
+    ]
+
+
+def test_update_removes_fragment_without_transliteration(
+    line_to_vec_index, fragment_repository, when
+):
+    fragment = FragmentFactory.build(number=ENTRY.museum_number)
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([ENTRY])
+    line_to_vec_index.entries
+
+    line_to_vec_index.update(fragment)
+
+    assert list(line_to_vec_index.entries) == []
+
+
+def test_update_before_load_is_ignored(line_to_vec_index):
+    line_to_vec_index.update(TransliteratedFragmentFactory.build())
+
+    assert line_to_vec_index.is_loaded is False
+
+
+def test_clear(line_to_vec_index, fragment_repository, when):
+    (
+        when(fragment_repository)
+        .query_transliterated_line_to_vec()
+        .thenReturn([ENTRY])
+        .thenReturn([])
+    )
+    line_to_vec_index.entries
+
+    line_to_vec_index.clear()
+
+    assert list(line_to_vec_index.entries) == []
+
+
+def test_update_rebuilds_snapshot(line_to_vec_index, fragment_repository, when):
+    fragment = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.2"))
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([ENTRY])
+    snapshot = line_to_vec_index.snapshot
+
+    line_to_vec_index.update(fragment)
+    line_to_vec_index.join()
+
+    assert snapshot.entries == (ENTRY,)
+    assert line_to_vec_index.snapshot.entries == (
+        ENTRY,
+        LineToVecEntry(fragment.number, fragment.script, fragment.line_to_vec),
+    )
+
+
+def test_previous_snapshot_is_served_during_rebuild(
+    line_to_vec_index, fragment_repository, when, monkeypatch
+):
+    fragment = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.2"))
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn([ENTRY])
+    snapshot = line_to_vec_index.snapshot
+    rebuilt = threading.Event()
+    create_snapshot = LineToVecSnapshot.of
+
+    def wait_and_create_snapshot(entries):
+        rebuilt.wait()
+        return create_snapshot(entries)
+
+    monkeypatch.setattr(LineToVecSnapshot, "of", staticmethod(wait_and_create_snapshot))
+
+    line_to_vec_index.update(fragment)
+
+    assert line_to_vec_index.snapshot is snapshot
+    rebuilt.set()
+    line_to_vec_index.join()
+    assert line_to_vec_index.snapshot is not snapshot
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import LineToVecMatrix
+from ebl.fragmentarium.application.matches.line_to_vec_score import (
+    score,
+    score_weighted,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+
+
+def create_line_to_vec(seq):
+    return tuple(map(LineToVecEncoding.from_list, seq))
+
+
+def create_random_line_to_vec(random_: random.Random):
+    encodings = [0, 1, 1, 1, 1, 1, 2, 3, 4, 5]
+    return tuple(
+        tuple(
+            LineToVecEncoding(random_.choice(encodings))
+            for _ in range(random_.randint(0, 12))
+        )
+        for _ in range(random_.randint(0, 3))
+    )
+
+
+def assert_equivalent(candidate, corpus):
+    scores, weighted_scores = LineToVecMatrix(corpus).score(candidate)
+
+    assert scores.tolist() == [score(candidate, entry) for entry in corpus]
+    assert weighted_scores.tolist() == [
+        score_weighted(candidate, entry) for entry in corpus
+    ]
+
+
+@pytest.mark.parametrize(
+    "seq1, seq2",
+    [
+        [((1, 2, 1),), ((1, 2, 1),)],
+        [((1, 2, 1),), (tuple(),)],
+        [((1, 2, 1),), tuple()],
+        [(tuple(),), ((1, 2, 1),)],
+        [((1, 2, 1),), ((2, 1, 2),)],
+        [((1, 2, 1),), ((2, 2, 1),)],
+        [((1, 2, 1),), ((1, 2, 2),)],
+        [((1, 2, 1),), ((2, 2, 2),)],
+        [((1, 2, 1),), ((2, 2, 2), (1, 2, 1))],
+        [((1, 2, 1),), ((1, 2, 1), (2, 2, 2))],
+        [((2, 2, 2), (1, 2, 1)), ((1, 2, 1),)],
+        [((1, 2, 1), (2, 2, 2)), ((1, 2, 1),)],
+        [((1, 1, 2, 1, 1),), ((1, 2, 1),)],
+        [((1, 2, 1),), ((1, 1, 2, 1, 1),)],
+        [((0, 1, 2, 1, 1),), ((1, 2, 5),)],
+        [((0, 1, 2, 1), (1, 2, 1, 5)), ((2, 3, 2), (1, 1, 2, 1))],
+        [((4, 1, 1, 3),), ((1, 1, 3, 1, 1, 1, 1, 4, 1, 1),)],
+    ],
+)
+def test_score_equivalence(seq1, seq2):
+    assert_equivalent(create_line_to_vec(seq1), [create_line_to_vec(seq2)])
+
+
+def test_score_equivalence_with_corpus():
+    random_ = random.Random(1)
+    corpus = [create_random_line_to_vec(random_) for _ in range(200)]
+
+    for _ in range(50):
+        assert_equivalent(create_random_line_to_vec(random_), corpus)
+
+
+def test_empty_corpus():
+    scores, weighted_scores = LineToVecMatrix([]).score(
+        create_line_to_vec(((1, 2, 1),))
+    )
+
+    assert scores.tolist() == []
+    assert weighted_scores.tolist() == []
+
+
+def test_len():
+    assert len(LineToVecMatrix([create_line_to_vec(((1,),)), tuple()])) == 2
@@ -0,0 +1,165 @@
+import random
+
+import attr
+import pytest
+
+from ebl.fragmentarium.application.fragment_matcher import create_ranking
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.line_to_vec_index import LineToVecSnapshot
+from ebl.fragmentarium.application.line_to_vec_neighbours import (
+    LineToVecNeighboursUpdater,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+NUMBER_OF_NEIGHBOURS = 3
+
+
+def create_entries(seed: int, size: int):
+    random_ = random.Random(seed)
+    return [
+        LineToVecEntry(
+            MuseumNumber("X", str(index)),
+            "N/A",
+            tuple(
+                tuple(
+                    LineToVecEncoding(random_.choice([1, 1, 1, 2, 3, 4, 5]))
+                    for _ in range(random_.randint(1, 6))
+                )
+                for _ in range(random_.randint(0, 2))
+            ),
+        )
+        for index in range(size)
+    ]
+
+
+def update_all(repository, entries):
+    snapshot = LineToVecSnapshot.of(entries)
+    updater = LineToVecNeighboursUpdater(repository, snapshot, NUMBER_OF_NEIGHBOURS)
+    run, outdated = updater.plan()
+    updater.update(run, outdated)
+    return updater.finish(run, snapshot.fingerprint)
+
+
+def assert_neighbours(repository, entries):
+    snapshot = LineToVecSnapshot.of(entries)
+    for position, entry in enumerate(entries):
+        neighbours = repository.query_by_museum_number(entry.museum_number)
+        scores, weighted_scores = snapshot.matrix.score(entry.line_to_vec)
+        expected = create_ranking(
+            entries,
+            zip(range(len(entries)), scores.tolist(), weighted_scores.tolist()),
+            entry.museum_number,
+            NUMBER_OF_NEIGHBOURS,
+        )
+        assert neighbours.corpus == snapshot.fingerprint
+        assert neighbours.digest == snapshot.digests[position]
+        assert [score.score for score in neighbours.score] == (
+            [score.score for score in expected.score] if entry.line_to_vec else []
+        )
+        assert [score.score for score in neighbours.score_weighted] == (
+            [score.score for score in expected.score_weighted]
+            if entry.line_to_vec
+            else []
+        )
+
+
+def test_update_all(line_to_vec_neighbours_repository):
+    entries = create_entries(0, 20)
+
+    assert update_all(line_to_vec_neighbours_repository, entries) is True
+    assert_neighbours(line_to_vec_neighbours_repository, entries)
+    assert line_to_vec_neighbours_repository.query_run() is None
+
+
+def test_update_changed(line_to_vec_neighbours_repository):
+    entries = create_entries(1, 20)
+    update_all(line_to_vec_neighbours_repository, entries)
+    changed_entries = [
+        *[
+            attr.evolve(
+                entry, line_to_vec=(LineToVecEncoding.from_list([1, index, 1]),)
+            )
+            for index, entry in enumerate(entries[:3], 2)
+        ],
+        *entries[3:18],
+    ]
+
+    snapshot = LineToVecSnapshot.of(changed_entries)
+    updater = LineToVecNeighboursUpdater(
+        line_to_vec_neighbours_repository, snapshot, NUMBER_OF_NEIGHBOURS
+    )
+    run, outdated = updater.plan()
+
+    assert run.changed == {entry.museum_number for entry in entries[:3]}
+    assert run.removed == {entry.museum_number for entry in entries[18:]}
+    assert outdated == [entry.museum_number for entry in changed_entries]
+
+    updater.update(run, outdated)
+
+    assert updater.finish(run, snapshot.fingerprint) is True
+    assert_neighbours(line_to_vec_neighbours_repository, changed_entries)
+    assert line_to_vec_neighbours_repository.query_versions().keys() == {
+        entry.museum_number for entry in changed_entries
+    }
+
+
+def test_resume_run(line_to_vec_neighbours_repository):
+    entries = create_entries(3, 10)
+    update_all(line_to_vec_neighbours_repository, entries)
+    changed_entries = [
+        attr.evolve(entries[0], line_to_vec=(LineToVecEncoding.from_list([1, 2, 1]),)),
+        *entries[1:],
+    ]
+    snapshot = LineToVecSnapshot.of(changed_entries)
+    updater = LineToVecNeighboursUpdater(
+        line_to_vec_neighbours_repository, snapshot, NUMBER_OF_NEIGHBOURS
+    )
+    run, outdated = updater.plan()
+    updater.update(run, outdated[:1])
+
+    resumed_run, resumed_outdated = updater.plan()
+
+    assert resumed_run == run
+    assert resumed_outdated == outdated[1:]
+    assert updater.finish(resumed_run, snapshot.fingerprint) is False
+
+    updater.update(resumed_run, resumed_outdated)
+
+    assert updater.finish(resumed_run, snapshot.fingerprint) is True
+    assert_neighbours(line_to_vec_neighbours_repository, changed_entries)
+
+
+def test_update_rejects_other_corpus(line_to_vec_neighbours_repository):
+    updater = LineToVecNeighboursUpdater(
+        line_to_vec_neighbours_repository,
+        LineToVecSnapshot.of(create_entries(5, 5)),
+        NUMBER_OF_NEIGHBOURS,
+    )
+    run, outdated = updater.plan()
+
+    with pytest.raises(ValueError):
+        LineToVecNeighboursUpdater(
+            line_to_vec_neighbours_repository,
+            LineToVecSnapshot.of(create_entries(6, 5)),
+            NUMBER_OF_NEIGHBOURS,
+        ).update(run, outdated)
+
+
+def test_finish_keeps_run_if_fragments_changed(line_to_vec_neighbours_repository):
+    entries = create_entries(7, 10)
+    snapshot = LineToVecSnapshot.of(entries)
+    updater = LineToVecNeighboursUpdater(
+        line_to_vec_neighbours_repository, snapshot, NUMBER_OF_NEIGHBOURS
+    )
+    run, outdated = updater.plan()
+    updater.update(run, outdated)
+    changed_entries = [
+        attr.evolve(entries[0], line_to_vec=(LineToVecEncoding.from_list([1, 2, 1]),)),
+        *entries[1:],
+    ]
+
+    assert (
+        updater.finish(run, LineToVecSnapshot.of(changed_entries).fingerprint) is False
+    )
+    assert line_to_vec_neighbours_repository.query_run() == run
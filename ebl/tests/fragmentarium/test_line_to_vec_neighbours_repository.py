@@ -0,0 +1,82 @@
+import pytest
+
+from ebl.errors import NotFoundError
+from ebl.fragmentarium.application.line_to_vec import (
+    LineToVecNeighbours,
+    LineToVecNeighboursRun,
+    LineToVecScore,
+)
+from ebl.fragmentarium.application.line_to_vec_neighbours_schema import (
+    LineToVecNeighboursSchema,
+)
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+
+COLLECTION = "line_to_vec_neighbours"
+NEIGHBOURS = LineToVecNeighbours(
+    MuseumNumber("X", "1"),
+    "digest",
+    "corpus",
+    15,
+    [LineToVecScore(MuseumNumber("X", "2"), "NB", 3)],
+    [LineToVecScore(MuseumNumber("X", "3"), "NA", 5)],
+)
+
+
+def test_update(database, line_to_vec_neighbours_repository):
+    line_to_vec_neighbours_repository.update([NEIGHBOURS])
+
+    assert database[COLLECTION].find_one(
+        {"_id": "X.1"}
+    ) == LineToVecNeighboursSchema().dump(NEIGHBOURS)
+
+
+def test_query_by_museum_number(database, line_to_vec_neighbours_repository):
+    database[COLLECTION].insert_one(LineToVecNeighboursSchema().dump(NEIGHBOURS))
+
+    assert (
+        line_to_vec_neighbours_repository.query_by_museum_number(
+            NEIGHBOURS.museum_number
+        )
+        == NEIGHBOURS
+    )
+
+
+def test_query_by_museum_number_not_found(line_to_vec_neighbours_repository):
+    with pytest.raises(NotFoundError):
+        line_to_vec_neighbours_repository.query_by_museum_number(
+            NEIGHBOURS.museum_number
+        )
+
+
+def test_query_versions(line_to_vec_neighbours_repository):
+    line_to_vec_neighbours_repository.update([NEIGHBOURS])
+
+    assert line_to_vec_neighbours_repository.query_versions() == {
+        NEIGHBOURS.museum_number: (NEIGHBOURS.digest, NEIGHBOURS.corpus)
+    }
+
+
+def test_delete(line_to_vec_neighbours_repository):
+    line_to_vec_neighbours_repository.update([NEIGHBOURS])
+    line_to_vec_neighbours_repository.delete([NEIGHBOURS.museum_number])
+
+    assert (
+        line_to_vec_neighbours_repository.query_by_museum_numbers(
+            [NEIGHBOURS.museum_number]
+        )
+        == []
+    )
+
+
+def test_run(line_to_vec_neighbours_repository):
+    run = LineToVecNeighboursRun(
+        "corpus", frozenset([MuseumNumber("X", "1")]), frozenset()
+    )
+
+    line_to_vec_neighbours_repository.save_run(run)
+
+    assert line_to_vec_neighbours_repository.query_run() == run
+
+    line_to_vec_neighbours_repository.delete_run()
+
+    assert line_to_vec_neighbours_repository.query_run() is None
@@ -0,0 +1,159 @@
+import random
+
+import numpy as np
+import pytest
+
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import (
+    LineToVecMatrix,
+    encode,
+    rank,
+)
+from ebl.fragmentarium.application.matches.line_to_vec_ngram_index import (
+    LineToVecNgramIndex,
+    score_pruned,
+    weight_bound,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+
+
+def create_line_to_vec(seq):
+    return tuple(map(LineToVecEncoding.from_list, seq))
+
+
+def create_random_line_to_vec(random_: random.Random):
+    return tuple(
+        (
+            LineToVecEncoding.START,
+            *(
+                LineToVecEncoding(random_.choice([1, 1, 1, 1, 1, 1, 2, 3, 4]))
+                for _ in range(random_.randint(0, 10))
+            ),
+            LineToVecEncoding.END,
+        )[random_.randint(0, 1) :]
+        for _ in range(random_.randint(0, 2))
+    )
+
+
+def test_find_candidates():
+    matrix = LineToVecMatrix(
+        [
+            create_line_to_vec(((1, 2, 1, 1),)),
+            create_line_to_vec(((3, 3, 1, 2),)),
+            create_line_to_vec(((3, 1, 2, 3),)),
+            create_line_to_vec(((4, 4, 4, 4, 1, 2, 1, 4),)),
+            create_line_to_vec(((4, 4),)),
+        ]
+    )
+    index = LineToVecNgramIndex(matrix, [2])
+
+    candidates = index.find_candidates([encode(LineToVecEncoding.from_list([1, 2]))], 2)
+
+    assert candidates.tolist() == [0, 1, 2, 3]
+
+
+def test_weight_bound():
+    candidate = [encode(LineToVecEncoding.from_list([0, 1, 1, 4, 1]))]
+
+    assert weight_bound(candidate, 2) == 11
+    assert weight_bound(candidate, 10) == 16
+
+
+@pytest.mark.parametrize("number_of_results", [1, 3, 15])
+def test_score_pruned_ranks_as_full_score(number_of_results):
+    random_ = random.Random(number_of_results)
+    corpus = [create_random_line_to_vec(random_) for _ in range(300)]
+    matrix = LineToVecMatrix(corpus)
+    index = LineToVecNgramIndex(matrix, [6, 4, 2])
+
+    for _ in range(30):
+        candidate = create_random_line_to_vec(random_)
+        scores, weighted_scores = matrix.score(candidate)
+        indices, pruned_scores, pruned_weighted_scores = score_pruned(
+            matrix, index, candidate, number_of_results
+        )
+
+        assert indices.tolist() == sorted(indices.tolist())
+        assert pruned_scores.tolist() == scores[indices].tolist()
+        assert pruned_weighted_scores.tolist() == weighted_scores[indices].tolist()
+        assert indices[rank(pruned_scores, number_of_results + 1)].tolist() == (
+            rank(scores, number_of_results + 1).tolist()
+        )
+        assert indices[
+            rank(pruned_weighted_scores, number_of_results + 1)
+        ].tolist() == (rank(weighted_scores, number_of_results + 1).tolist())
+
+
+def test_score_pruned_scores_all_when_pruning_is_not_possible():
+    corpus = [create_line_to_vec(((1, 1),)), create_line_to_vec(((2, 2),))]
+    matrix = LineToVecMatrix(corpus)
+
+    indices, scores, _ = score_pruned(
+        matrix, LineToVecNgramIndex(matrix), create_line_to_vec(((1, 1, 2, 2),)), 1
+    )
+
+    assert indices.tolist() == [0, 1]
+    assert scores.tolist() == [2, 2]
+
+
+def test_select():
+    corpus = [create_line_to_vec(((1, 2, 1),)), tuple(), create_line_to_vec(((2,),))]
+    candidate = create_line_to_vec(((2, 1),))
+    matrix = LineToVecMatrix(corpus)
+
+    scores, weighted_scores = matrix.select(np.array([0, 2])).score(candidate)
+    expected_scores, expected_weighted_scores = matrix.score(candidate)
+
+    assert scores.tolist() == expected_scores[[0, 2]].tolist()
+    assert weighted_scores.tolist() == expected_weighted_scores[[0, 2]].tolist()
+
+
+def test_select_arranges_entries():
+    corpus = [create_line_to_vec(((1, 2, 1),)), tuple(), create_line_to_vec(((2,),))]
+    candidate = create_line_to_vec(((2, 1),))
+    matrix = LineToVecMatrix(corpus)
+
+    scores, _ = matrix.select(np.array([2, 0])).score(candidate)
+    expected_scores, _ = matrix.score(candidate)
+
+    assert scores.tolist() == expected_scores[[2, 0]].tolist()
+
+
+def test_of_arrays():
+    random_ = random.Random(3)
+    matrix = LineToVecMatrix([create_random_line_to_vec(random_) for _ in range(100)])
+    index = LineToVecNgramIndex(matrix, [6, 4])
+    candidate = [encode(LineToVecEncoding.from_list([1, 1, 1, 1, 1, 1]))]
+
+    stored = LineToVecNgramIndex.of_arrays(index.lengths, index.arrays)
+
+    assert stored.lengths == index.lengths
+    for length in index.lengths:
+        assert (
+            stored.find_candidates(candidate, length).tolist()
+            == index.find_candidates(candidate, length).tolist()
+        )
+
+
+def test_update():
+    random_ = random.Random(4)
+    corpus = [create_random_line_to_vec(random_) for _ in range(100)]
+    updated = [create_random_line_to_vec(random_) for _ in range(10)]
+    positions = np.array(
+        [-1 if index % 10 == 0 else index - index // 10 - 1 for index in range(100)]
+    )
+    expected = [
+        *(line_to_vec for index, line_to_vec in enumerate(corpus) if index % 10),
+        *updated,
+    ]
+    candidate = [encode(LineToVecEncoding.from_list([1, 1, 1, 1]))]
+
+    index = LineToVecNgramIndex(LineToVecMatrix(corpus), [4]).update(
+        positions, LineToVecMatrix(updated), np.arange(90, 100)
+    )
+
+    assert (
+        index.find_candidates(candidate, 4).tolist()
+        == LineToVecNgramIndex(LineToVecMatrix(expected), [4])
+        .find_candidates(candidate, 4)
+        .tolist()
+    )
@@ -0,0 +1,213 @@
+import pytest
+
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.line_to_vec_index import (
+    LineToVecIndex,
+    LineToVecSnapshot,
+)
+from ebl.fragmentarium.application.line_to_vec_store import (
+    LineToVecStoreDirectory,
+    MappedLineToVecIndex,
+    create_updated_snapshot,
+)
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import encode
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.tests.factories.fragment import FragmentFactory, TransliteratedFragmentFactory
+
+WATERMARK = "2021-01-01T00:00:00"
+
+ENTRIES = [
+    LineToVecEntry(
+        MuseumNumber.of("X.1"),
+        "NB",
+        (LineToVecEncoding.from_list([0, 1, 2]), LineToVecEncoding.from_list([1, 5])),
+    ),
+    LineToVecEntry(MuseumNumber.of("X.2"), "", tuple()),
+    LineToVecEntry(
+        MuseumNumber.of("X.3"), "Ṣ", (LineToVecEncoding.from_list([1, 1, 4, 1, 1]),)
+    ),
+]
+
+
+UPDATED = LineToVecEntry(
+    MuseumNumber.of("X.1"), "NB", (LineToVecEncoding.from_list([1, 2]),)
+)
+ADDED = LineToVecEntry(
+    MuseumNumber.of("X.4"), "", (LineToVecEncoding.from_list([1, 2, 1]),)
+)
+
+
+def assert_snapshot(snapshot, entries):
+    expected = LineToVecSnapshot.of(entries)
+    candidate = (LineToVecEncoding.from_list([1, 2, 1]),)
+    scores, weighted_scores = snapshot.matrix.score(candidate)
+    expected_scores, expected_weighted_scores = expected.matrix.score(candidate)
+
+    assert list(snapshot.entries) == entries
+    assert list(snapshot.digests) == list(expected.digests)
+    assert snapshot.fingerprint == expected.fingerprint
+    assert scores.tolist() == expected_scores.tolist()
+    assert weighted_scores.tolist() == expected_weighted_scores.tolist()
+    assert snapshot.ngram_index.lengths == expected.ngram_index.lengths
+    for length in expected.ngram_index.lengths:
+        encoded = [encode(split) for split in candidate]
+        assert (
+            snapshot.ngram_index.find_candidates(encoded, length).tolist()
+            == expected.ngram_index.find_candidates(encoded, length).tolist()
+        )
+
+
+def test_export(tmp_path):
+    store = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK)
+
+    assert_snapshot(store.create_snapshot(), ENTRIES)
+    assert store.create_snapshot().store_path == store.path
+    assert store.watermark == WATERMARK
+
+
+def test_open(tmp_path):
+    directory = LineToVecStoreDirectory(str(tmp_path))
+    directory.export(ENTRIES, WATERMARK)
+
+    assert_snapshot(directory.open().create_snapshot(), ENTRIES)
+
+
+def test_open_missing(tmp_path):
+    assert LineToVecStoreDirectory(str(tmp_path)).open() is None
+
+
+def test_entries(tmp_path):
+    entries = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK).entries
+
+    assert entries[-1] == ENTRIES[-1]
+    assert entries[1:] == ENTRIES[1:]
+    with pytest.raises(IndexError):
+        entries[len(ENTRIES)]
+
+
+def test_synchronize_missing(tmp_path):
+    store = LineToVecStoreDirectory(str(tmp_path)).synchronize(ENTRIES, WATERMARK)
+
+    assert_snapshot(store.create_snapshot(), ENTRIES)
+
+
+def test_synchronize_unchanged(tmp_path):
+    directory = LineToVecStoreDirectory(str(tmp_path))
+    store = directory.export(ENTRIES, WATERMARK)
+    watermark = "2021-02-01T00:00:00"
+
+    synchronized = directory.synchronize(ENTRIES, watermark)
+
+    assert synchronized.path == store.path
+    assert synchronized.watermark == watermark
+
+
+def test_synchronize_keeps_database_order(tmp_path):
+    directory = LineToVecStoreDirectory(str(tmp_path))
+    directory.export(ENTRIES, WATERMARK)
+    entries = [ENTRIES[2], UPDATED, ADDED, ENTRIES[1]]
+
+    store = directory.synchronize(entries, WATERMARK)
+
+    assert_snapshot(store.create_snapshot(), entries)
+    assert directory.open().path == store.path
+
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    directory = LineToVecStoreDirectory(str(tmp_path))
+    directory.export(ENTRIES, WATERMARK)
+    directory.synchronize(ENTRIES[1:], WATERMARK)
+
+    assert not [path for path in tmp_path.iterdir() if path.suffix == ".tmp"]
+
+
+def test_create_updated_snapshot(tmp_path):
+    store = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK)
+
+    snapshot = create_updated_snapshot(
+        store,
+        {
+            UPDATED.museum_number: UPDATED,
+            ENTRIES[2].museum_number: None,
+            ADDED.museum_number: ADDED,
+        },
+    )
+
+    assert_snapshot(snapshot, [UPDATED, ENTRIES[1], ADDED])
+    assert snapshot.store_path is None
+
+
+def test_index_opens_current_store(tmp_path, fragment_repository, changelog, when):
+    store = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK)
+    when(changelog).query_resource_ids("fragments", WATERMARK).thenReturn([])
+
+    index = MappedLineToVecIndex(fragment_repository, changelog, str(tmp_path))
+
+    assert_snapshot(index.snapshot, ENTRIES)
+    assert index.snapshot.store_path == store.path
+
+
+def test_index_applies_logged_changes(tmp_path, fragment_repository, changelog, when):
+    store = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK)
+    numbers = [UPDATED.museum_number, ENTRIES[2].museum_number]
+    (
+        when(changelog)
+        .query_resource_ids("fragments", WATERMARK)
+        .thenReturn([str(number) for number in numbers])
+    )
+    (
+        when(fragment_repository)
+        .query_transliterated_line_to_vec_by_numbers(numbers)
+        .thenReturn([UPDATED])
+    )
+
+    index = MappedLineToVecIndex(fragment_repository, changelog, str(tmp_path))
+
+    assert_snapshot(index.snapshot, [UPDATED, ENTRIES[1]])
+    assert LineToVecStoreDirectory(str(tmp_path)).open().path == store.path
+
+
+def test_index_without_store(tmp_path, fragment_repository, changelog, when):
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn(ENTRIES)
+
+    index = MappedLineToVecIndex(fragment_repository, changelog, str(tmp_path))
+
+    assert_snapshot(index.snapshot, ENTRIES)
+    assert LineToVecStoreDirectory(str(tmp_path)).open() is None
+
+
+def update_index(index):
+    updated = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.1"))
+    removed = FragmentFactory.build(number=MuseumNumber.of("X.3"))
+    added = TransliteratedFragmentFactory.build(number=MuseumNumber.of("X.4"))
+
+    for fragment in [updated, removed, added]:
+        index.update(fragment)
+    index.join()
+
+    return [
+        LineToVecEntry(updated.number, updated.script, updated.line_to_vec),
+        ENTRIES[1],
+        LineToVecEntry(added.number, added.script, added.line_to_vec),
+    ]
+
+
+def test_index_update(tmp_path, fragment_repository, changelog, when):
+    store = LineToVecStoreDirectory(str(tmp_path)).export(ENTRIES, WATERMARK)
+    when(changelog).query_resource_ids("fragments", WATERMARK).thenReturn([])
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn(ENTRIES)
+    index = MappedLineToVecIndex(fragment_repository, changelog, str(tmp_path))
+    index.snapshot
+    line_to_vec_index = LineToVecIndex(fragment_repository)
+    line_to_vec_index.snapshot
+
+    expected = update_index(index)
+    update_index(line_to_vec_index)
+
+    assert_snapshot(index.snapshot, expected)
+    assert [entry.museum_number for entry in line_to_vec_index.snapshot.entries] == [
+        entry.museum_number for entry in expected
+    ]
+    assert index.snapshot.store_path is None
+    assert LineToVecStoreDirectory(str(tmp_path)).open().path == store.path
@@ -0,0 +1,84 @@
+import pytest
+
+from ebl.fragmentarium.application.line_to_vec import LineToVecEntry
+from ebl.fragmentarium.application.matches.line_to_vec_matrix import LineToVecMatrix
+from ebl.fragmentarium.application.parallel_fragment_matcher import (
+    ParallelFragmentMatcher,
+    create_shards,
+)
+from ebl.fragmentarium.domain.line_to_vec_encoding import LineToVecEncoding
+from ebl.fragmentarium.domain.museum_number import MuseumNumber
+from ebl.tests.factories.fragment import FragmentFactory
+
+LINE_TO_VECS = [
+    ((1, 2, 1, 1),),
+    ((2, 1, 1),),
+    ((1, 1, 2),),
+    tuple(),
+    ((0, 1, 1), (1, 2, 1, 5)),
+    ((1, 2),),
+    ((2, 1, 1),),
+]
+
+
+def create_line_to_vec(seq):
+    return tuple(map(LineToVecEncoding.from_list, seq))
+
+
+@pytest.fixture
+def parallel_fragment_matcher(
+    fragment_repository, line_to_vec_index, line_to_vec_neighbours_repository
+):
+    matcher = ParallelFragmentMatcher(
+        fragment_repository, line_to_vec_index, line_to_vec_neighbours_repository, 3
+    )
+    yield matcher
+    matcher.shutdown()
+
+
+def test_create_shards():
+    matrix = LineToVecMatrix(list(map(create_line_to_vec, LINE_TO_VECS)))
+
+    shards = create_shards(matrix, 3)
+
+    assert [(offset, len(shard)) for offset, shard in shards] == [
+        (0, 3),
+        (3, 3),
+        (6, 1),
+    ]
+    for offset, shard in shards:
+        scores, weighted_scores = shard.score(create_line_to_vec(((1, 2, 1),)))
+        all_scores, all_weighted_scores = matrix.score(create_line_to_vec(((1, 2, 1),)))
+        assert scores.tolist() == all_scores[offset : offset + len(shard)].tolist()
+        assert (
+            weighted_scores.tolist()
+            == all_weighted_scores[offset : offset + len(shard)].tolist()
+        )
+
+
+def test_create_shards_empty():
+    assert create_shards(LineToVecMatrix([]), 3) == []
+
+
+@pytest.mark.parametrize("number_of_results", [1, 2, 15])
+def test_rank_line_to_vec(
+    number_of_results, parallel_fragment_matcher, fragment_matcher, when
+):
+    fragment_repository = fragment_matcher._fragment_repository
+    entries = [
+        LineToVecEntry(MuseumNumber.of(f"X.{index}"), "N/A", create_line_to_vec(seq))
+        for index, seq in enumerate(LINE_TO_VECS)
+    ]
+    candidate = FragmentFactory.build(
+        number=entries[0].museum_number, line_to_vec=entries[0].line_to_vec
+    )
+    (
+        when(fragment_repository)
+        .query_by_museum_number(candidate.number)
+        .thenReturn(candidate)
+    )
+    when(fragment_repository).query_transliterated_line_to_vec().thenReturn(entries)
+
+    assert parallel_fragment_matcher.rank_line_to_vec(
+        "X.0", number_of_results
+    ) == fragment_matcher.rank_line_to_vec("X.0", number_of_results)
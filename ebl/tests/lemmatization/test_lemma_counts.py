@@ -0,0 +1,36 @@
+from ebl.dictionary.domain.word import WordId
+from ebl.lemmatization.domain.lemma_counts import count_lemmas, get_word_keys
+from ebl.transliteration.domain.normalized_akkadian import AkkadianWord
+from ebl.transliteration.domain.sign_tokens import Reading
+from ebl.transliteration.domain.tokens import ValueToken
+from ebl.transliteration.domain.word_tokens import Word
+
+
+def test_count_lemmas():
+    tokens = [
+        Word.of([Reading.of_name("ana")], unique_lemma=(WordId("ana I"),)),
+        Word.of([Reading.of_name("ana")], unique_lemma=(WordId("ana I"),)),
+        Word.of([Reading.of_name("ana")], unique_lemma=(WordId("ana II"),)),
+        Word.of([Reading.of_name("ana")]),
+        AkkadianWord.of([ValueToken.of("ana")], unique_lemma=(WordId("ana I"),)),
+        ValueToken.of("ana"),
+    ]
+
+    assert count_lemmas(tokens) == {
+        ("ana", False, ("ana I",)): 2,
+        ("ana", False, ("ana II",)): 1,
+        ("ana", True, ("ana I",)): 1,
+    }
+
+
+def test_get_word_keys():
+    tokens = [
+        Word.of([Reading.of_name("ana")], unique_lemma=(WordId("ana I"),)),
+        Word.of([Reading.of_name("ana")]),
+        AkkadianWord.of([ValueToken.of("ana")]),
+        Word.of([Reading.of_name("x")]),
+        ValueToken.of("ana"),
+        Word.of([Reading.of_name("u")]),
+    ]
+
+    assert get_word_keys(tokens) == [("ana", False), ("ana", True), ("u", False)]
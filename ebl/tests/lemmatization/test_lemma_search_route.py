@@ -1,6 +1,10 @@
 import falcon
 import pytest
 
+from ebl.corpus.application.corpus import get_tokens
+from ebl.lemmatization.domain.lemma_counts import count_lemmas, get_word_keys
+from ebl.tests.corpus.support import create_chapter_url
+from ebl.tests.factories.corpus import ChapterFactory
 from ebl.tests.factories.fragment import LemmatizedFragmentFactory
 
 
@@ -43,3 +47,45 @@ def test_search_invalid_params(client, params):
     result = client.simulate_get("/lemmas", params=params)
 
     assert result.status == falcon.HTTP_UNPROCESSABLE_ENTITY
+
+
+def test_search_fragment_lemmas(client, fragmentarium, dictionary, word):
+    fragment = LemmatizedFragmentFactory.build()
+    fragmentarium.create(fragment)
+    tokens = [token for line in fragment.text.text_lines for token in line.content]
+    for _, _, lemma in count_lemmas(tokens):
+        dictionary.create({**word, "_id": lemma[0]})
+    result = client.simulate_get(f"/fragments/{fragment.number}/lemmas")
+
+    assert result.status == falcon.HTTP_OK
+    assert len(result.json) == len(get_word_keys(tokens))
+    assert {
+        "value": "GI₆",
+        "isNormalized": False,
+        "suggestions": [[{**word, "_id": "ginâ I"}]],
+    } in result.json
+    assert {"value": "10", "isNormalized": False, "suggestions": []} in result.json
+
+
+def test_search_fragment_lemmas_not_found(client):
+    result = client.simulate_get("/fragments/X.1/lemmas")
+
+    assert result.status == falcon.HTTP_NOT_FOUND
+
+
+def test_search_chapter_lemmas(client, text_repository):
+    chapter = ChapterFactory.build()
+    text_repository.create_chapter(chapter)
+    result = client.simulate_get(create_chapter_url(chapter, "/lemmas"))
+
+    assert result.status == falcon.HTTP_OK
+    assert result.json == [
+        {"value": value, "isNormalized": is_normalized, "suggestions": []}
+        for value, is_normalized in get_word_keys(get_tokens(chapter))
+    ]
+
+
+def test_search_chapter_lemmas_not_found(client):
+    result = client.simulate_get("/texts/L/1/1/chapters/Old Babylonian/any/lemmas")
+
+    assert result.status == falcon.HTTP_NOT_FOUND
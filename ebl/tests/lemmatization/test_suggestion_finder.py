@@ -2,7 +2,18 @@ import attr
 import pytest
 
 from ebl.dictionary.domain.word import WordId
-from ebl.lemmatization.application.suggestion_finder import SuggestionFinder
+from ebl.lemmatization.application.suggestion_finder import (
+    SuggestionFinder,
+    WordSuggestions,
+)
+from ebl.lemmatization.domain.lemma_counts import count_lemmas
+from ebl.lemmatization.infrastrcuture import mongo_suggestions_finder
+from ebl.lemmatization.infrastrcuture.mongo_suggestions_finder import (
+    LEMMA_COUNTS_STATE_COLLECTION,
+    STATE_ID,
+    create_generation_name,
+)
+from ebl.tests.factories.corpus import ChapterFactory
 from ebl.tests.factories.fragment import (
     FragmentFactory,
     LemmatizedFragmentFactory,
@@ -23,6 +34,18 @@ from ebl.transliteration.domain.tokens import ErasureState, Joiner, ValueToken
 from ebl.transliteration.domain.word_tokens import Word
 
 COLLECTION = "fragments"
+LEMMA_COUNTS_COLLECTION = "lemma_counts"
+
+
+def count_lemma_counts(database) -> int:
+    state = database[LEMMA_COUNTS_STATE_COLLECTION].find_one({"_id": STATE_ID})
+    return (
+        database[
+            create_generation_name(LEMMA_COUNTS_COLLECTION, state["current"])
+        ].count_documents({})
+        if state and "current" in state
+        else 0
+    )
 
 
 ANOTHER_LEMMATIZED_FRAGMENT = attr.evolve(
@@ -56,6 +79,42 @@ ANOTHER_LEMMATIZED_FRAGMENT = attr.evolve(
 )
 
 
+CHAPTER = ChapterFactory.build()
+LEMMATIZED_CHAPTER = attr.evolve(
+    CHAPTER,
+    lines=(
+        attr.evolve(
+            CHAPTER.lines[0],
+            variants=(
+                attr.evolve(
+                    CHAPTER.lines[0].variants[0],
+                    reconstruction=(
+                        AkkadianWord.of(
+                            [ValueToken.of("ana")],
+                            unique_lemma=(WordId("normalized I"),),
+                        ),
+                    ),
+                    manuscripts=(
+                        attr.evolve(
+                            CHAPTER.lines[0].variants[0].manuscripts[0],
+                            line=TextLine.of_iterable(
+                                LineNumber(1),
+                                [
+                                    Word.of(
+                                        [Reading.of_name("ana")],
+                                        unique_lemma=(WordId("ana II"),),
+                                    )
+                                ],
+                            ),
+                        ),
+                    ),
+                ),
+            ),
+        ),
+    ),
+)
+
+
 def test_query_lemmas(fragment_repository, lemma_repository):
     lemmatized_fragment = LemmatizedFragmentFactory.build()
     fragment_repository.create(lemmatized_fragment)
@@ -166,11 +225,151 @@ def test_query_lemmas_not_found(is_normalized, fragment_repository, lemma_reposi
     assert lemma_repository.query_lemmas("aklu", is_normalized) == []
 
 
+@pytest.mark.parametrize(
+    "word,is_normalized,expected",
+    [
+        ("GI₆", False, [["ginâ I"]]),
+        ("ana", True, [["normalized I"]]),
+        ("ana", False, [["ana II"], ["ana I"]]),
+        ("aklu", False, []),
+    ],
+)
+def test_query_lemmas_after_rebuild(
+    word,
+    is_normalized,
+    expected,
+    fragment_repository,
+    text_repository,
+    lemma_repository,
+):
+    fragment_repository.create(LemmatizedFragmentFactory.build())
+    fragment_repository.create(ANOTHER_LEMMATIZED_FRAGMENT)
+    text_repository.create_chapter(LEMMATIZED_CHAPTER)
+    expected_from_fragments = lemma_repository.query_lemmas(word, is_normalized)
+
+    assert lemma_repository.rebuild_lemma_counts() == 3
+    assert lemma_repository.query_lemmas(word, is_normalized) == expected
+    assert expected == expected_from_fragments
+
+
+@pytest.mark.parametrize("rebuild", [False, True])
+def test_query_lemmas_of_words(
+    rebuild, fragment_repository, text_repository, lemma_repository
+):
+    fragment_repository.create(LemmatizedFragmentFactory.build())
+    fragment_repository.create(ANOTHER_LEMMATIZED_FRAGMENT)
+    text_repository.create_chapter(LEMMATIZED_CHAPTER)
+    if rebuild:
+        lemma_repository.rebuild_lemma_counts()
+
+    assert lemma_repository.query_lemmas_of_words(
+        [("ana", False), ("GI₆", False), ("ana", True), ("aklu", False)]
+    ) == [[["ana II"], ["ana I"]], [["ginâ I"]], [["normalized I"]], []]
+
+
+def test_update_lemmas(database, lemma_repository):
+    lemma_repository.rebuild_lemma_counts()
+    lemma_repository.update_fragment_lemmas(
+        ANOTHER_LEMMATIZED_FRAGMENT.number,
+        count_lemmas(
+            token
+            for line in ANOTHER_LEMMATIZED_FRAGMENT.text.text_lines
+            for token in line.content
+        ),
+    )
+    lemma_repository.update_chapter_lemmas(
+        LEMMATIZED_CHAPTER.id_, {("ana", False, (WordId("ana I"),)): 3}
+    )
+
+    assert lemma_repository.query_lemmas("ana", False) == [["ana I"], ["ana II"]]
+
+    lemma_repository.update_chapter_lemmas(LEMMATIZED_CHAPTER.id_, {})
+
+    assert lemma_repository.query_lemmas("ana", False) == [["ana II"]]
+    assert count_lemma_counts(database) == 4
+
+
+def test_update_lemmas_before_rebuild_is_ignored(
+    database, fragment_repository, lemma_repository
+):
+    fragment_repository.create(LemmatizedFragmentFactory.build())
+    lemma_repository.update_chapter_lemmas(
+        LEMMATIZED_CHAPTER.id_, {("ana", False, (WordId("ana III"),)): 3}
+    )
+
+    assert lemma_repository.query_lemmas("ana", False) == [["ana I"]]
+    assert count_lemma_counts(database) == 0
+
+
+def test_rebuild_replaces_counts(database, fragment_repository, lemma_repository):
+    lemma_repository.rebuild_lemma_counts()
+    lemma_repository.update_chapter_lemmas(
+        LEMMATIZED_CHAPTER.id_, {("ana", False, (WordId("ana III"),)): 3}
+    )
+    fragment_repository.create(ANOTHER_LEMMATIZED_FRAGMENT)
+
+    assert lemma_repository.rebuild_lemma_counts() == 1
+    assert lemma_repository.query_lemmas("ana", False) == [["ana II"]]
+    assert count_lemma_counts(database) == 4
+
+
+def test_update_lemmas_during_rebuild(
+    database, fragment_repository, lemma_repository, monkeypatch
+):
+    fragment_repository.create(LemmatizedFragmentFactory.build())
+    lemma_repository.rebuild_lemma_counts()
+    aggregate_counts = mongo_suggestions_finder.aggregate_counts
+
+    def save_fragment(generation):
+        monkeypatch.setattr(
+            mongo_suggestions_finder, "aggregate_counts", aggregate_counts
+        )
+        fragment_repository.create(ANOTHER_LEMMATIZED_FRAGMENT)
+        lemma_repository.update_fragment_lemmas(
+            ANOTHER_LEMMATIZED_FRAGMENT.number,
+            count_lemmas(
+                token
+                for line in ANOTHER_LEMMATIZED_FRAGMENT.text.text_lines
+                for token in line.content
+            ),
+        )
+        return aggregate_counts(generation)
+
+    monkeypatch.setattr(mongo_suggestions_finder, "aggregate_counts", save_fragment)
+
+    assert lemma_repository.rebuild_lemma_counts() == 2
+    assert lemma_repository.query_lemmas("ana", False) == [["ana II"], ["ana I"]]
+    assert (
+        create_generation_name(LEMMA_COUNTS_COLLECTION, 1)
+        not in database.list_collection_names()
+    )
+
+
 def test_find_suggestions(dictionary, word, lemma_repository, when):
     suggestion_finder = SuggestionFinder(dictionary, lemma_repository)
     query = "GI₆"
     lemma = WordId(word["_id"])
     when(lemma_repository).query_lemmas(query, False).thenReturn([[lemma]])
-    when(dictionary).find(lemma).thenReturn(word)
+    when(dictionary).find_many([lemma]).thenReturn([word])
 
     assert suggestion_finder.find_lemmas(query, False) == [[word]]
+
+
+def test_find_lemmas_of_tokens(dictionary, word, lemma_repository, when):
+    suggestion_finder = SuggestionFinder(dictionary, lemma_repository)
+    tokens = [
+        Word.of([Reading.of_name("ana")]),
+        Word.of([Reading.of_name("ana")]),
+        AkkadianWord.of([ValueToken.of("ana")]),
+    ]
+    ana = {**word, "_id": "ana I"}
+    normalized = {**word, "_id": "normalized I"}
+    when(lemma_repository).query_lemmas_of_words(
+        [("ana", False), ("ana", True)]
+    ).thenReturn([[[WordId("ana I")]], [[WordId("normalized I")], [WordId("ana I")]]])
+    when(dictionary).find_many(["ana I", "normalized I"]).thenReturn([ana, normalized])
+
+    assert suggestion_finder.find_lemmas_of_tokens(tokens) == [
+        WordSuggestions("ana", False, [[ana]]),
+        WordSuggestions("ana", True, [[normalized], [ana]]),
+    ]
@@ -0,0 +1,149 @@
+import pytest
+
+from ebl.errors import NotFoundError
+from ebl.signs.infrastructure.preloaded_sign_repository import PreloadedSignRepository
+from ebl.transliteration.domain.sign import Sign, SignName, Value
+
+
+@pytest.fixture
+def preloaded_sign_repository(sign_repository, signs):
+    for sign in signs:
+        sign_repository.create(sign)
+    return PreloadedSignRepository(
+        sign_repository, sign_repository.find_all, sign_repository.find_version
+    )
+
+
+def test_find(preloaded_sign_repository, sign_repository, signs):
+    for sign in signs:
+        assert preloaded_sign_repository.find(sign.name) == sign_repository.find(
+            sign.name
+        )
+
+
+def test_find_not_found(preloaded_sign_repository):
+    with pytest.raises(NotFoundError):
+        preloaded_sign_repository.find(SignName("XYZ"))
+
+
+@pytest.mark.parametrize(
+    "reading,sub_index",
+    [("ku", 1), ("u", 4), ("bil", None), ("ana", 1), ("ana", 3), ("xyz", 1)],
+)
+def test_search(reading, sub_index, preloaded_sign_repository, sign_repository):
+    assert preloaded_sign_repository.search(
+        reading, sub_index
+    ) == sign_repository.search(reading, sub_index)
+    assert preloaded_sign_repository.search_all(
+        reading, sub_index
+    ) == sign_repository.search_all(reading, sub_index)
+
+
+@pytest.mark.parametrize("name,number", [("ABZ", "075"), ("ABZ", "999")])
+def test_search_by_lists_name(name, number, preloaded_sign_repository, sign_repository):
+    assert preloaded_sign_repository.search_by_lists_name(
+        name, number
+    ) == sign_repository.search_by_lists_name(name, number)
+
+
+def test_create_refreshes(preloaded_sign_repository):
+    sign = Sign(SignName("NEW"), values=(Value("new", 1),))
+    assert preloaded_sign_repository.search("new", 1) is None
+    version = preloaded_sign_repository.version
+
+    preloaded_sign_repository.create(sign)
+
+    assert preloaded_sign_repository.version == version + 1
+    assert preloaded_sign_repository.search("new", 1) == sign
+    assert preloaded_sign_repository.find(sign.name) == sign
+
+
+def test_edits_by_other_processes_are_visible_after_ttl(sign_repository):
+    now = [0.0]
+    preloaded_sign_repository = PreloadedSignRepository(
+        sign_repository,
+        sign_repository.find_all,
+        sign_repository.find_version,
+        10,
+        lambda: now[0],
+    )
+    sign = Sign(SignName("NEW"), values=(Value("new", 1),))
+    assert preloaded_sign_repository.search("new", 1) is None
+
+    sign_repository.create(sign)
+
+    now[0] = 9.0
+    assert preloaded_sign_repository.search("new", 1) is None
+    now[0] = 10.0
+    assert preloaded_sign_repository.search("new", 1) == sign
+
+
+def test_version_is_not_checked_before_ttl(sign_repository, signs):
+    checks = []
+
+    def load_version():
+        checks.append(len(checks))
+        return 0
+
+    preloaded_sign_repository = PreloadedSignRepository(
+        sign_repository, lambda: signs, load_version, 10, lambda: 0.0
+    )
+    preloaded_sign_repository.find(SignName("KU"))
+    preloaded_sign_repository.search("ku", 1)
+
+    assert checks == [0]
+
+
+def test_signs_are_loaded_once(sign_repository, signs):
+    loads = []
+
+    def load():
+        loads.append(len(signs))
+        return signs
+
+    preloaded_sign_repository = PreloadedSignRepository(sign_repository, load)
+    preloaded_sign_repository.find(SignName("KU"))
+    preloaded_sign_repository.search("ku", 1)
+    preloaded_sign_repository.search("xyz", 1)
+
+    assert loads == [len(signs)]
+
+
+def test_find_many(preloaded_sign_repository, sign_repository):
+    names = {SignName("KU"), SignName("XYZ")}
+    readings = {("ku", 1), ("bil", None), ("xyz", 1)}
+
+    assert preloaded_sign_repository.find_many(
+        names, readings
+    ) == sign_repository.find_many(names, readings)
+
+
+def test_search_include_homophones(sign_repository):
+    ku = Sign(SignName("KU"), values=(Value("ku", 1), Value("dur", 2)))
+    kum = Sign(SignName("KUM"), values=(Value("ku", 8), Value("kum")))
+    qu = Sign(SignName("QU"), values=(Value("ku"), Value("qu", 1)))
+    gu = Sign(SignName("GU"), values=(Value("ku", 4), Value("gu", 1)))
+    preloaded_sign_repository = PreloadedSignRepository(
+        sign_repository, lambda: [ku, kum, qu, gu]
+    )
+
+    assert preloaded_sign_repository.search_include_homophones("ku") == [
+        ku,
+        gu,
+        kum,
+        qu,
+    ]
+    assert preloaded_sign_repository.search_include_homophones("xyz") == []
+
+
+def test_find_many_keeps_table_order(sign_repository):
+    ku = Sign(SignName("KU"), values=(Value("ku", 1),))
+    ba = Sign(SignName("BA"), values=(Value("ba", 1),))
+    a = Sign(SignName("A"), values=(Value("a", 1),))
+    preloaded_sign_repository = PreloadedSignRepository(
+        sign_repository, lambda: [ku, ba, a]
+    )
+
+    assert preloaded_sign_repository.find_many(
+        [SignName("A"), SignName("XYZ")], [("ku", 1), ("ba", 2)]
+    ) == [ku, a]
@@ -2,7 +2,8 @@ import pytest
 from marshmallow import EXCLUDE
 
 from ebl.errors import NotFoundError
-from ebl.signs.infrastructure.mongo_sign_repository import SignSchema
+from ebl.signs.infrastructure.mongo_sign_repository import SignSchema, create_components
+from ebl.transliteration.domain.sign import Sign, SignName, Value
 
 COLLECTION = "signs"
 
@@ -134,9 +135,10 @@ def sign_si_2(mongo_sign_si_2):
 def test_create(database, sign_repository, sign_igi):
     sign_name = sign_repository.create(sign_igi)
 
-    assert database[COLLECTION].find_one({"_id": sign_name}) == SignSchema().dump(
-        sign_igi
-    )
+    assert database[COLLECTION].find_one({"_id": sign_name}) == {
+        **SignSchema().dump(sign_igi),
+        "components": ["IGI"],
+    }
 
 
 def test_find(database, sign_repository, mongo_sign_igi, sign_igi):
@@ -166,6 +168,22 @@ def test_search(
     assert sign_repository.search("hu-2", None) == sign_si_2
 
 
+def test_find_many(
+    database,
+    sign_repository,
+    sign_igi,
+    mongo_sign_igi,
+    sign_si,
+    mongo_sign_si,
+    sign_si_2,
+    mongo_sign_si_2,
+):
+    database[COLLECTION].insert_many([mongo_sign_igi, mongo_sign_si, mongo_sign_si_2])
+
+    assert sign_repository.find_many({"IGI"}, {("hu-2", None)}) == [sign_igi, sign_si_2]
+    assert sign_repository.find_many(set(), set()) == []
+
+
 def test_search_all(
     database, sign_repository, sign_igi, mongo_sign_igi, mongo_sign_si, mongo_sign_si_2
 ):
@@ -212,3 +230,49 @@ def test_search_by_lists_name(
 
 def test_search_not_found(sign_repository):
     assert sign_repository.search("unknown", 1) is None
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("KU", ["KU"]),
+        ("|U.U|", ["U", "|U.U|"]),
+        ("|(4×ZA)×KUR|", ["4", "KUR", "ZA", "|(4×ZA)×KUR|"]),
+        ("|ŠU₂.3×AN|", ["3", "AN", "|ŠU₂.3×AN|", "ŠU₂"]),
+    ],
+)
+def test_create_components(name, expected):
+    assert create_components(name) == expected
+
+
+def test_search_composite_signs(database, sign_repository):
+    ku = Sign(SignName("KU"), values=(Value("ku", 1),))
+    compound = Sign(SignName("|KU.KU|"))
+    other = Sign(SignName("|KUR.U|"))
+    for sign in [ku, compound, other]:
+        sign_repository.create(sign)
+    old = SignSchema().dump(Sign(SignName("|KU×U|")))
+    database[COLLECTION].insert_one(old)
+    sign_repository.create_indexes()
+
+    assert sign_repository.search_composite_signs("ku", 1) == [
+        ku,
+        compound,
+        Sign(SignName("|KU×U|")),
+    ]
+    assert sign_repository.search_composite_signs("ku", 2) == []
+
+
+def test_update_components(database, sign_repository, mongo_sign_igi):
+    database[COLLECTION].insert_one(mongo_sign_igi)
+
+    assert sign_repository.update_components() == 1
+    assert database[COLLECTION].find_one({"_id": "IGI"})["components"] == ["IGI"]
+
+
+def test_create_bumps_version(sign_repository, sign_igi):
+    assert sign_repository.find_version() == 0
+
+    sign_repository.create(sign_igi)
+
+    assert sign_repository.find_version() == 1
@@ -68,13 +68,24 @@ def test_signs_not_found(client):
             {"value": "ku", "subIndex": "1", "isComposite": "true"},
             [
                 {
-                    "lists": [{"name": "ABZ", "number": "377n1"}],
+                    "lists": [{"name": "KWU", "number": "869"}],
                     "logograms": [],
                     "mesZl": "",
-                    "name": "P₂",
+                    "name": "KU",
                     "unicode": [],
-                    "values": [{"subIndex": 1, "value": ":"}],
-                }
+                    "values": [{"subIndex": 1, "value": "ku"}],
+                },
+                {
+                    "lists": [],
+                    "logograms": [],
+                    "mesZl": "",
+                    "name": "BA",
+                    "unicode": [],
+                    "values": [
+                        {"subIndex": 1, "value": "ba"},
+                        {"subIndex": 1, "value": "ku"},
+                    ],
+                },
             ],
         ),
     ],
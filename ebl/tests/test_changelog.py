@@ -13,3 +13,16 @@ def test_create(database, changelog, user, make_changelog_entry):
     entry_id = changelog.create(RESOURCE_TYPE, user.profile, OLD, NEW)
     expected = make_changelog_entry(RESOURCE_TYPE, RESOURCE_ID, OLD, NEW)
     assert database[COLLECTION].find_one({"_id": entry_id}, {"_id": 0}) == expected
+
+
+def test_query_resource_ids(changelog, user):
+    with freeze_time("2018-09-07 15:41:24"):
+        changelog.create(RESOURCE_TYPE, user.profile, {"_id": "old"}, {"_id": "old"})
+    with freeze_time("2018-09-08 15:41:24"):
+        changelog.create(RESOURCE_TYPE, user.profile, OLD, NEW)
+        changelog.create(RESOURCE_TYPE, user.profile, OLD, NEW)
+        changelog.create("other", user.profile, {"_id": "other"}, {"_id": "other"})
+
+    assert changelog.query_resource_ids(RESOURCE_TYPE, "2018-09-08T00:00:00") == [
+        RESOURCE_ID
+    ]
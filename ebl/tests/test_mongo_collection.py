@@ -1,4 +1,5 @@
 import pytest
+from pymongo import ReplaceOne
 
 from ebl.errors import DuplicateError, NotFoundError
 from ebl.mongo_collection import MongoCollection
@@ -106,3 +107,29 @@ def test_count(collection):
     collection.insert_one({"data": "another payload"})
 
     assert collection.count_documents({"data": "payload"}) == 2
+
+
+def test_delete_many(collection):
+    collection.insert_one({"data": "payload"})
+    collection.insert_one({"data": "payload"})
+    collection.insert_one({"data": "another payload"})
+
+    collection.delete_many({"data": "payload"})
+
+    assert collection.count_documents({}) == 1
+
+
+def test_bulk_write(collection):
+    insert_id = collection.insert_one({"data": "payload"})
+
+    collection.bulk_write(
+        [
+            ReplaceOne({"_id": insert_id}, {"data": "updated payload"}),
+            ReplaceOne({"_id": "new id"}, {"data": "new payload"}, upsert=True),
+        ]
+    )
+
+    assert list(collection.find_many({})) == [
+        {"_id": insert_id, "data": "updated payload"},
+        {"_id": "new id", "data": "new payload"},
+    ]
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import pytest
@@ -5,6 +6,7 @@ from hamcrest.library import starts_with
 
 from ebl.errors import DataError
 from ebl.tests.assertions import assert_exception_has_errors
+import ebl.transliteration.domain.lark_parser as lark_parser
 from ebl.transliteration.domain import atf
 from ebl.transliteration.domain.at_line import SurfaceAtLine
 from ebl.transliteration.domain.dollar_line import ScopeContainer, StateDollarLine
@@ -82,3 +84,37 @@ def test_invalid_atf(atf, line_numbers) -> None:
 def test_duplicate_labels(atf, line_numbers) -> None:
     with pytest.raises(DataError, match="Duplicate labels."):
         parse_atf_lark(atf)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(lark_parser, "PARALLEL_THRESHOLD", 3)
+    monkeypatch.setattr(lark_parser, "PARALLEL_BATCH_SIZE", 2)
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_parse_atf_in_parallel(executor) -> None:
+    atf_ = "@obverse\n1. kur\n$ single ruling\n2. ra\n#note: a note\n\n"
+
+    assert parse_atf_lark(atf_, executor) == parse_atf_lark(atf_)
+
+
+def test_invalid_atf_in_parallel(executor) -> None:
+    atf_ = "1. x\nthis is not valid\n2. x\n3. x\nthis is not valid"
+    with pytest.raises(TransliterationError) as parallel_info:
+        parse_atf_lark(atf_, executor)
+    with pytest.raises(TransliterationError) as sequential_info:
+        parse_atf_lark(atf_)
+
+    assert parallel_info.value.errors == sequential_info.value.errors
+    assert_exception_has_errors(parallel_info, [2, 5], starts_with("Invalid line"))
+
+
+def test_small_atf_is_parsed_sequentially(executor, monkeypatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("The lines were parsed in parallel.")
+
+    monkeypatch.setattr(executor, "map", fail)
+
+    assert parse_atf_lark("1. kur\n2. ra", executor).lines
@@ -0,0 +1,69 @@
+import ast
+import pathlib
+import tokenize
+from typing import Iterator, List
+
+import pytest
+
+from ebl.transliteration.domain.lark_parser import (
+    PARSE_ERRORS,
+    LineTransformer,
+    parse_dollar_line_lalr,
+)
+from ebl.transliteration.domain.lark_parser_cache import get_atf_parser
+
+TESTS = pathlib.Path(__file__).parent.parent
+
+
+def read_strings(path: pathlib.Path) -> Iterator[str]:
+    with path.open("rb") as file:
+        for token in tokenize.tokenize(file.readline):
+            if token.type == tokenize.STRING:
+                try:
+                    value = ast.literal_eval(token.string)
+                except ValueError:
+                    continue
+                if isinstance(value, str):
+                    yield value
+
+
+def collect_dollar_lines() -> List[str]:
+    # Dollar lines of the ATF in all tests and factories, and the parts of
+    # dollar lines in the dollar line tests with the prefixes they are tested
+    # with.
+    lines = set()
+    for path in TESTS.rglob("*.py"):
+        is_dollar_line_test = "dollar_line" in path.name
+        for value in read_strings(path):
+            lines.update(line for line in value.split("\n") if line.startswith("$"))
+            if is_dollar_line_test and "\n" not in value and "$" not in value:
+                lines.update([f"$ {value}", f"${value}", f"$ ({value})"])
+    return sorted(lines)
+
+
+def transform(parse):
+    try:
+        return LineTransformer().transform(parse())
+    except PARSE_ERRORS as error:
+        return type(error)
+
+
+@pytest.mark.parametrize("line", collect_dollar_lines())
+def test_lalr_parser_matches_earley(line):
+    tree = parse_dollar_line_lalr(line)
+    if tree is not None:
+        assert transform(lambda: tree) == transform(
+            lambda: get_atf_parser().parse(line, start="start")
+        )
+
+
+@pytest.mark.parametrize(
+    "line", ["$ 2-4 lines missing", "$ double ruling !", "$ (image 1a = great)"]
+)
+def test_dollar_lines_are_parsed(line):
+    assert parse_dollar_line_lalr(line) is not None
+
+
+@pytest.mark.parametrize("line", ["1. kur", "@obverse", "#note: x", "$ face"])
+def test_other_lines_are_not_parsed(line):
+    assert parse_dollar_line_lalr(line) is None
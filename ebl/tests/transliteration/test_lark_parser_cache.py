@@ -0,0 +1,93 @@
+import os
+import pickle
+import subprocess
+import sys
+
+from lark.lark import Lark
+
+import ebl.transliteration.domain.lark_parser_cache as lark_parser_cache
+from ebl.transliteration.domain.lark_parser_cache import (
+    ATF_GRAMMAR,
+    get_atf_parser,
+    hash_grammar,
+    load_compiled_grammar,
+)
+
+
+def test_hash_grammar():
+    assert hash_grammar(ATF_GRAMMAR, ("start",)) == hash_grammar(
+        ATF_GRAMMAR, ("start",)
+    )
+    assert hash_grammar(ATF_GRAMMAR, ("start",)) != hash_grammar(
+        ATF_GRAMMAR, ("labels",)
+    )
+    assert hash_grammar(ATF_GRAMMAR, ("start",)) != hash_grammar(
+        ATF_GRAMMAR, ("start",), maybe_placeholders=True
+    )
+
+
+def test_load_compiled_grammar(tmp_path, monkeypatch):
+    monkeypatch.setattr(lark_parser_cache, "CACHE_DIRECTORY", str(tmp_path))
+    terminals, rules, ignore = load_compiled_grammar(ATF_GRAMMAR, ("labels",))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The grammar was compiled again.")
+
+    monkeypatch.setattr(lark_parser_cache, "compile_grammar", fail)
+    cached_terminals, cached_rules, cached_ignore = load_compiled_grammar(
+        ATF_GRAMMAR, ("labels",)
+    )
+
+    assert os.listdir(tmp_path) == [f"{hash_grammar(ATF_GRAMMAR, ('labels',))}.pickle"]
+    assert list(map(repr, cached_terminals)) == list(map(repr, terminals))
+    assert cached_rules == rules
+    assert cached_ignore == ignore
+
+
+def test_load_compiled_grammar_ignores_invalid_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(lark_parser_cache, "CACHE_DIRECTORY", str(tmp_path))
+    cache_path = tmp_path / f"{hash_grammar(ATF_GRAMMAR, ('labels',))}.pickle"
+    cache_path.write_bytes(b"invalid")
+
+    terminals, rules, _ = load_compiled_grammar(ATF_GRAMMAR, ("labels",))
+
+    assert terminals
+    assert rules
+    assert cache_path.read_bytes() != b"invalid"
+
+
+def test_load_compiled_grammar_ignores_writable_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(lark_parser_cache, "CACHE_DIRECTORY", str(tmp_path))
+    cache_path = tmp_path / f"{hash_grammar(ATF_GRAMMAR, ('labels',))}.pickle"
+    cache_path.write_bytes(pickle.dumps(("planted", (), ())))
+    cache_path.chmod(0o666)
+
+    terminals, _, _ = load_compiled_grammar(ATF_GRAMMAR, ("labels",))
+
+    assert terminals != "planted"
+
+
+def test_load_compiled_grammar_creates_private_directory(tmp_path, monkeypatch):
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(lark_parser_cache, "CACHE_DIRECTORY", str(directory))
+
+    load_compiled_grammar(ATF_GRAMMAR, ("labels",))
+
+    assert directory.stat().st_mode & 0o777 == 0o700
+
+
+def test_parser_is_not_built_on_import():
+    script = (
+        "import ebl.transliteration.domain.lark_parser\n"
+        "from ebl.transliteration.domain.lark_parser_cache import open_parser\n"
+        "assert open_parser.cache_info().currsize == 0"
+    )
+
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+def test_atf_parser_parses_as_lark():
+    atf = "1. [x] a-na {d}60 ... %sux |KUR.KUR|"
+    parser = Lark.open(ATF_GRAMMAR, maybe_placeholders=True)
+
+    assert get_atf_parser().parse(atf, start="start") == parser.parse(atf)
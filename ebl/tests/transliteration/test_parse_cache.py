@@ -0,0 +1,70 @@
+import pytest
+
+from ebl.cache import CacheInfo
+from ebl.transliteration.domain import atf
+from ebl.transliteration.domain.lark_parser import parse_atf_lark, parse_line
+from ebl.transliteration.domain.parse_cache import PARSE_CACHE, ParseCache
+
+
+def test_get():
+    cache = ParseCache(10)
+
+    assert cache.get("start", "1. kur", lambda: "parsed") == "parsed"
+    assert cache.get("start", "1. kur", lambda: "parsed again") == "parsed"
+    assert cache.get("chapter_line", "1. kur", lambda: "other") == "other"
+    assert cache.info() == CacheInfo(1, 2, 10, 2)
+
+
+def test_least_recently_used_is_evicted():
+    cache = ParseCache(2)
+    cache.get("start", "a", lambda: 1)
+    cache.get("start", "b", lambda: 2)
+    cache.get("start", "a", lambda: 3)
+    cache.get("start", "c", lambda: 4)
+
+    assert cache.get("start", "a", lambda: 5) == 1
+    assert cache.get("start", "b", lambda: 6) == 6
+
+
+def test_errors_are_not_cached():
+    cache = ParseCache(10)
+
+    def fail():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get("start", "a", fail)
+
+    assert cache.get("start", "a", lambda: 1) == 1
+    assert cache.info().currsize == 1
+
+
+def test_parser_version_invalidates(monkeypatch):
+    cache = ParseCache(10)
+    cache.get("start", "a", lambda: 1)
+    monkeypatch.setattr(atf, "ATF_PARSER_VERSION", "new version")
+
+    assert cache.get("start", "a", lambda: 2) == 2
+    assert cache.info().currsize == 1
+
+
+def test_hit_rate():
+    assert CacheInfo(3, 1, 10, 1).hit_rate == 0.75
+    assert CacheInfo(0, 0, 10, 0).hit_rate == 0.0
+
+
+def test_parse_line_is_cached():
+    PARSE_CACHE.clear()
+    line = parse_line("1. kur")
+
+    assert parse_line("1. kur") is line
+    assert PARSE_CACHE.info().hits == 1
+
+
+def test_parse_atf_lark_is_cached():
+    PARSE_CACHE.clear()
+    parse_atf_lark("1. kur\n$ single ruling")
+    text = parse_atf_lark("1. kur\n$ single ruling\n2. ra")
+
+    assert text == parse_atf_lark("1. kur\n$ single ruling\n2. ra")
+    assert PARSE_CACHE.info().misses == 3
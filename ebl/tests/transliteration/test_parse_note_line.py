@@ -2,7 +2,8 @@ import pytest
 
 from ebl.bibliography.domain.reference import BibliographyId
 from ebl.transliteration.domain.language import Language
-from ebl.transliteration.domain.lark_parser import LINE_PARSER, parse_atf_lark
+from ebl.transliteration.domain.lark_parser import parse_atf_lark
+from ebl.transliteration.domain.lark_parser_cache import get_atf_parser
 from ebl.transliteration.domain.markup import (
     BibliographyPart,
     EmphasisPart,
@@ -15,7 +16,7 @@ from ebl.transliteration.domain.text_line_transformer import TextLineTransformer
 
 
 def parse_text(atf: str):
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__text")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__text")
     return TextLineTransformer().transform(tree)
 
 
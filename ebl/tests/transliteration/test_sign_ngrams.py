@@ -0,0 +1,55 @@
+import re
+
+import pytest
+
+from ebl.transliteration.domain.sign_ngrams import (
+    create_query_ngrams,
+    create_sign_ngrams,
+)
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+
+SIGNS = "KU NU IGI\nGI₆ DIŠ GI₆ UD MA\nKI DU U BA MA TA\nX MU TA MA UD\nŠU/BU |U.BA|"
+
+
+def test_create_sign_ngrams():
+    assert create_sign_ngrams(["KU NU/BU\nX", "|A.B| KU"]) == [
+        "A.B",
+        "A.B KU",
+        "BU",
+        "KU",
+        "KU BU",
+        "KU NU",
+        "NU",
+        "X",
+    ]
+
+
+def test_create_query_ngrams():
+    assert create_query_ngrams([["KU", "*", "NU", "BU"], ["|A.B|"]]) == [
+        "NU BU",
+        "A.B",
+        "BU",
+        "KU",
+        "NU",
+    ]
+
+
+@pytest.mark.parametrize(
+    "signs",
+    [
+        [["DU", "U"]],
+        [["KU"]],
+        [["GI₆", "DIŠ"], ["U", "BA", "MA"]],
+        [["ŠU"]],
+        [["BU"]],
+        [["BU", "U.BA"]],
+        [["MA", "*", "ŠU"]],
+        [["IGI", "UD"]],
+        [["|U.BA|"]],
+    ],
+)
+def test_query_ngrams_are_in_matching_signs(signs):
+    query = TransliterationQuery(signs)
+
+    if re.search(query.regexp, SIGNS):
+        assert set(query.ngrams) <= set(create_sign_ngrams([SIGNS]))
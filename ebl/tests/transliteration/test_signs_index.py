@@ -0,0 +1,124 @@
+from ebl.transliteration.application.signs_index import SignsIndex
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+
+DOCUMENTS = [
+    ("X.1", ["KU NU IGI\nGI₆ DIŠ GI₆ UD MA"]),
+    ("X.2", ["KI DU U BA MA TA", "ŠU/BU KU"]),
+    ("X.3", ["KU/MA"]),
+]
+
+
+def test_search():
+    index = SignsIndex(lambda: DOCUMENTS)
+
+    assert index.search(TransliterationQuery([["KU"]])) == ["X.1", "X.2", "X.3"]
+    assert index.search(TransliterationQuery([["MA"]])) == ["X.1", "X.2", "X.3"]
+    assert index.search(TransliterationQuery([["IGI"], ["GI₆", "*"]])) == ["X.1"]
+    assert index.search(TransliterationQuery([["BU", "KU"]])) == ["X.2"]
+    assert index.search(TransliterationQuery([["KU", "MA"]])) == []
+
+
+def test_is_loaded():
+    index = SignsIndex(lambda: DOCUMENTS)
+    assert index.is_loaded is False
+
+    index.search(TransliterationQuery([["KU"]]))
+
+    assert index.is_loaded is True
+
+
+def test_update_before_loading():
+    index = SignsIndex(lambda: DOCUMENTS)
+
+    index.update("X.4", ["KU"])
+
+    assert index.search(TransliterationQuery([["KU"]])) == ["X.1", "X.2", "X.3"]
+
+
+def test_update():
+    index = SignsIndex(lambda: DOCUMENTS)
+    query = TransliterationQuery([["KU"]])
+    index.search(query)
+
+    index.update("X.1", ["MA"])
+    index.update("X.4", ["KU"])
+
+    assert index.search(query) == ["X.2", "X.3", "X.4"]
+
+
+def test_rebuild():
+    index = SignsIndex(lambda: DOCUMENTS, rebuild_threshold=2)
+    query = TransliterationQuery([["KU"]])
+    index.search(query)
+
+    index.update("X.1", ["MA"])
+    index.update("X.4", ["KU"])
+    index.join()
+
+    assert index.search(query) == ["X.2", "X.3", "X.4"]
+
+
+def test_clear():
+    documents = list(DOCUMENTS)
+    index = SignsIndex(lambda: documents)
+    query = TransliterationQuery([["KU"]])
+    index.search(query)
+    documents.pop()
+
+    index.clear()
+
+    assert index.search(query) == ["X.1", "X.2"]
+
+
+def test_search_limit():
+    index = SignsIndex(lambda: DOCUMENTS, limit=2)
+    query = TransliterationQuery([["KU"]])
+
+    assert index.search(query) == ["X.1", "X.2"]
+
+    index.update("X.1", ["MA"])
+    index.update("X.4", ["KU"])
+
+    assert index.search(query) == ["X.2", "X.3"]
+
+
+def test_reload_when_version_changes():
+    documents = list(DOCUMENTS)
+    version = 0
+    now = 0.0
+    index = SignsIndex(lambda: documents, lambda: version, ttl=10, clock=lambda: now)
+    query = TransliterationQuery([["KU"]])
+    index.search(query)
+    documents.pop()
+    version = 1
+
+    now = 5.0
+    index.search(query)
+    index.join()
+    assert index.search(query) == ["X.1", "X.2", "X.3"]
+
+    now = 10.0
+    index.search(query)
+    index.join()
+    assert index.search(query) == ["X.1", "X.2"]
+
+
+def test_reload_keeps_updates_made_during_reload():
+    documents = list(DOCUMENTS)
+    version = 0
+
+    def load():
+        if index.is_loaded:
+            index.update("X.4", ["KU"])
+        return documents
+
+    index = SignsIndex(load, lambda: version, ttl=0)
+    query = TransliterationQuery([["KU"]])
+    index.search(query)
+    documents.pop()
+    version = 1
+
+    index.search(query)
+    index.join()
+
+    assert index.search(query) == ["X.1", "X.2", "X.4"]
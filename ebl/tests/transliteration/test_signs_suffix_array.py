@@ -0,0 +1,46 @@
+import pytest
+
+from ebl.transliteration.application.signs_suffix_array import DEPTH, SignsSuffixArray
+
+DOCUMENTS = ["KU NU IGI\nGI₆ DIŠ", "KUR BA/MA |U.BA|", "", "ŠU/BU KU"]
+
+
+@pytest.mark.parametrize(
+    "patterns,expected",
+    [
+        (["KU"], [0, 1, 3]),
+        (["KUR"], [1]),
+        (["KU", "BU"], [3]),
+        (["MA"], [1]),
+        (["|U.BA|"], [1]),
+        (["BA"], [1]),
+        (["GI₆", "IGI"], [0]),
+        (["NU", "MA"], []),
+        (["Ṣ"], []),
+        (["U"], [1]),
+        ([], [0, 1, 2, 3]),
+    ],
+)
+def test_find_candidates(patterns, expected):
+    suffix_array = SignsSuffixArray(DOCUMENTS)
+
+    assert suffix_array.find_candidates(patterns).tolist() == expected
+
+
+def test_count():
+    suffix_array = SignsSuffixArray(DOCUMENTS)
+
+    assert suffix_array.count("KU") == 3
+    assert suffix_array.count("NU") == 1
+    assert suffix_array.count("X") == 0
+
+
+def test_long_pattern():
+    sign = "A" * (DEPTH + 5)
+    suffix_array = SignsSuffixArray([sign, "A" * DEPTH, "A"])
+
+    assert suffix_array.find_candidates([sign]).tolist() == [0, 1]
+
+
+def test_empty():
+    assert SignsSuffixArray([]).find_candidates(["KU"]).tolist() == []
@@ -2,58 +2,59 @@ from typing import Sequence
 
 import pytest
 
-from ebl.transliteration.application.signs_visitor import SignsVisitor
+from ebl.signs.infrastructure.preloaded_sign_repository import PreloadedSignRepository
+from ebl.transliteration.application.signs_visitor import SignsVisitor, create_signs
 from ebl.transliteration.domain.lark_parser import parse_line
 
 
-@pytest.mark.parametrize(  # pyre-ignore[56]
-    "text,expected",
-    [
-        ("ku gid₂ nu ši", ["KU", "BU", "ABZ075", "ABZ207a\\u002F207b\\u0020X"]),
-        (
-            "|(4×ZA)×KUR| |(AŠ&AŠ@180)×U| NU |GA₂#*+BAD!?| |GA₂#*.BAD!?|",
-            ["ABZ531+588", "|(AŠ&AŠ@180)×U|", "ABZ075", "|GA₂+BAD|", "GA₂", "BAD"],
-        ),
-        (
-            "ummu₃ |IGI.KU| mat₃ kunga",
-            [
-                "A",
-                "ABZ168",
-                "LAL",
-                "ABZ207a\\u002F207b\\u0020X",
-                "KU",
-                "HU",
-                "HI",
-                "ŠU₂",
-                "3×AN",
-            ],
-        ),
-        ("unknwn x X", ["?", "X", "X"]),
-        (
-            "1(AŠ) 1 2 10 20 30 256",
-            ["ABZ001", "DIŠ", "2", "ABZ411", "ABZ411", "ABZ411", "30", "256"],
-        ),
-        ("| :", ["ABZ377n1"]),
-        (
-            ":/ku šu/|BI×IS|-ummu₃/|IGI.KU|/mat₃",
-            ["ABZ377n1/KU", "ŠU/|BI×IS|", "|A.EDIN.LAL|/|IGI.KU|/ABZ081"],
-        ),
-        ("ku-[nu ši]", ["KU", "ABZ075", "ABZ207a\\u002F207b\\u0020X"]),
-        ("< : ši>-ku", ["KU"]),
-        ("ku-<<nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : >>", ["KU"]),
-        ("ku-<nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : >", ["KU"]),
-        ("ku-<(nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : )>", ["KU"]),
-        ("°nu : ši\\ku°", ["KU"]),
-        ("ku-°|NU+NU|-1-nu-x-X-...-nu/ši\\ku°-ku", ["KU", "KU", "KU"]),
-        ("<{ši>-ku} {ku-<ši}>", ["KU", "KU"]),
-        ("<{+ši>-ku} {+ku-<ši}>", ["KU", "KU"]),
-        ("<{{ši>-ku}} {{ku-<ši}}>", ["KU", "KU"]),
-        ("{(ku)}", ["KU"]),
-        ("%grc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
-        ("%akkgrc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
-        ("%suxgrc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
-    ],
-)
+SIGNS_VISITOR_TEST_CASES = [
+    ("ku gid₂ nu ši", ["KU", "BU", "ABZ075", "ABZ207a\\u002F207b\\u0020X"]),
+    (
+        "|(4×ZA)×KUR| |(AŠ&AŠ@180)×U| NU |GA₂#*+BAD!?| |GA₂#*.BAD!?|",
+        ["ABZ531+588", "|(AŠ&AŠ@180)×U|", "ABZ075", "|GA₂+BAD|", "GA₂", "BAD"],
+    ),
+    (
+        "ummu₃ |IGI.KU| mat₃ kunga",
+        [
+            "A",
+            "ABZ168",
+            "LAL",
+            "ABZ207a\\u002F207b\\u0020X",
+            "KU",
+            "HU",
+            "HI",
+            "ŠU₂",
+            "3×AN",
+        ],
+    ),
+    ("unknwn x X", ["?", "X", "X"]),
+    (
+        "1(AŠ) 1 2 10 20 30 256",
+        ["ABZ001", "DIŠ", "2", "ABZ411", "ABZ411", "ABZ411", "30", "256"],
+    ),
+    ("| :", ["ABZ377n1"]),
+    (
+        ":/ku šu/|BI×IS|-ummu₃/|IGI.KU|/mat₃",
+        ["ABZ377n1/KU", "ŠU/|BI×IS|", "|A.EDIN.LAL|/|IGI.KU|/ABZ081"],
+    ),
+    ("ku-[nu ši]", ["KU", "ABZ075", "ABZ207a\\u002F207b\\u0020X"]),
+    ("< : ši>-ku", ["KU"]),
+    ("ku-<<nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : >>", ["KU"]),
+    ("ku-<nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : >", ["KU"]),
+    ("ku-<(nu ši 1 |KU+KU| nu/ši nu(KU) x X ... : )>", ["KU"]),
+    ("°nu : ši\\ku°", ["KU"]),
+    ("ku-°|NU+NU|-1-nu-x-X-...-nu/ši\\ku°-ku", ["KU", "KU", "KU"]),
+    ("<{ši>-ku} {ku-<ši}>", ["KU", "KU"]),
+    ("<{+ši>-ku} {+ku-<ši}>", ["KU", "KU"]),
+    ("<{{ši>-ku}} {{ku-<ši}}>", ["KU", "KU"]),
+    ("{(ku)}", ["KU"]),
+    ("%grc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
+    ("%akkgrc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
+    ("%suxgrc xX...ΑαΒβΓγΔδΕεΖζΗηΘθΙιΚκΛλΜμΝνΞξΟοΠπΡρΣσςΤτΥυΦφΧχΨψΩω", []),
+]
+
+
+@pytest.mark.parametrize("text,expected", SIGNS_VISITOR_TEST_CASES)
 def test_signs_visitor(text: str, expected: Sequence[str], sign_repository, signs):
     for sign in signs:
         sign_repository.create(sign)
@@ -62,3 +63,25 @@ def test_signs_visitor(text: str, expected: Sequence[str], sign_repository, sign
     parse_line(f"1. {text}").accept(visitor)
 
     assert visitor.result == expected
+
+
+def test_create_signs(sign_repository, signs):
+    for sign in signs:
+        sign_repository.create(sign)
+    lines = [parse_line(f"1. {text}") for text, _ in SIGNS_VISITOR_TEST_CASES]
+
+    assert create_signs(sign_repository, lines) == [
+        expected for _, expected in SIGNS_VISITOR_TEST_CASES
+    ]
+
+
+def test_create_signs_from_resident_repository(sign_repository, signs, when):
+    preloaded_sign_repository = PreloadedSignRepository(sign_repository, lambda: signs)
+    when(preloaded_sign_repository).find_many(...).thenRaise(
+        AssertionError("Lookups of a resident repository are not batched.")
+    )
+    lines = [parse_line(f"1. {text}") for text, _ in SIGNS_VISITOR_TEST_CASES]
+
+    assert create_signs(preloaded_sign_repository, lines) == [
+        expected for _, expected in SIGNS_VISITOR_TEST_CASES
+    ]
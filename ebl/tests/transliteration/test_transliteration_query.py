@@ -2,7 +2,12 @@ import re
 
 import pytest
 
-from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+from ebl.transliteration.domain.transliteration_query import (
+    TransliterationQuery,
+    get_line_number,
+)
+
+SIGNS = "KU NU IGI\nGI₆ DIŠ GI₆ UD MA\nKI DU U BA MA TA\nX MU TA MA UD\nŠU/BU"
 
 REGEXP_DATA = [
     ([["DU", "U"]], True),
@@ -18,14 +23,7 @@ REGEXP_DATA = [
 @pytest.mark.parametrize("signs,is_match", REGEXP_DATA)
 def test_regexp(signs, is_match):
     query = TransliterationQuery(signs)
-    match = re.search(
-        query.regexp,
-        "KU NU IGI\n"
-        "GI₆ DIŠ GI₆ UD MA\n"
-        "KI DU U BA MA TA\n"
-        "X MU TA MA UD\n"
-        "ŠU/BU",
-    )
+    match = re.search(query.regexp, SIGNS)
 
     if is_match:
         assert match is not None
@@ -47,3 +45,24 @@ GET_IS_SEQUENCE_EMPTY_DATA = [
 def test_is_sequence_empty(query, expected):
     query = TransliterationQuery(query)
     assert expected == query.is_empty()
+
+
+MATCH_DATA = [
+    ([["KU"]], [(0, 0)]),
+    ([["MA"]], [(1, 1), (2, 2), (3, 3)]),
+    ([["UD", "MA"], ["KI"]], [(1, 2)]),
+    ([["BU"]], [(4, 4)]),
+    ([["IGI", "UD"]], []),
+]
+
+
+@pytest.mark.parametrize("query, expected", MATCH_DATA)
+def test_match(query, expected):
+    assert TransliterationQuery(query).match(SIGNS) == expected
+
+
+@pytest.mark.parametrize(
+    "position, expected", [(0, 0), (9, 0), (10, 1), (len(SIGNS), 4)]
+)
+def test_get_line_number(position, expected):
+    assert get_line_number(SIGNS, position) == expected
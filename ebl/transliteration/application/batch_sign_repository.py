@@ -0,0 +1,78 @@
+from typing import Collection, Dict, Optional, Sequence, Set, Tuple
+
+from ebl.errors import NotFoundError
+from ebl.transliteration.application.sign_repository import SignRepository
+from ebl.transliteration.domain.sign import Sign, SignName
+
+Reading = Tuple[str, Optional[int]]
+
+
+class BatchSignRepository(SignRepository):
+    # Lookups of signs not resolved yet are recorded and answered as not
+    # found. resolve fetches all recorded signs with one query, after which
+    # the visit has to be repeated.
+    def __init__(self, delegate: SignRepository):
+        self._delegate = delegate
+        self._names: Dict[SignName, Optional[Sign]] = {}
+        self._readings: Dict[Reading, Optional[Sign]] = {}
+        self._pending_names: Set[SignName] = set()
+        self._pending_readings: Set[Reading] = set()
+
+    def resolve(self) -> bool:
+        if not self._pending_names and not self._pending_readings:
+            return False
+
+        signs = self._delegate.find_many(self._pending_names, self._pending_readings)
+        self._names.update({name: None for name in self._pending_names})
+        self._readings.update({reading: None for reading in self._pending_readings})
+        for sign in reversed(signs):
+            if sign.name in self._pending_names:
+                self._names[sign.name] = sign
+            for value in sign.values:
+                reading = (value.value, value.sub_index)
+                if reading in self._pending_readings:
+                    self._readings[reading] = sign
+
+        self._pending_names = set()
+        self._pending_readings = set()
+        return True
+
+    def create_indexes(self) -> None:
+        self._delegate.create_indexes()
+
+    def create(self, sign: Sign) -> str:
+        return self._delegate.create(sign)
+
+    def find(self, name: SignName) -> Sign:
+        if name not in self._names:
+            self._pending_names.add(name)
+        sign = self._names.get(name)
+        if sign is None:
+            raise NotFoundError(f"Sign {dict(_id=name)} not found.")
+        return sign
+
+    def find_many(
+        self, names: Collection[SignName], readings: Collection[Reading]
+    ) -> Sequence[Sign]:
+        return self._delegate.find_many(names, readings)
+
+    def search(self, reading: str, sub_index: Optional[int] = None) -> Optional[Sign]:
+        key = (reading, sub_index)
+        if key not in self._readings:
+            self._pending_readings.add(key)
+        return self._readings.get(key)
+
+    def search_by_id(self, query: str) -> Sequence[Sign]:
+        return self._delegate.search_by_id(query)
+
+    def search_all(self, reading: str, sub_index: int) -> Sequence[Sign]:
+        return self._delegate.search_all(reading, sub_index)
+
+    def search_by_lists_name(self, name: str, number: str) -> Sequence[Sign]:
+        return self._delegate.search_by_lists_name(name, number)
+
+    def search_composite_signs(self, reading: str, sub_index: int) -> Sequence[Sign]:
+        return self._delegate.search_composite_signs(reading, sub_index)
+
+    def search_include_homophones(self, reading: str) -> Sequence[Sign]:
+        return self._delegate.search_include_homophones(reading)
@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Sequence
+from typing import Collection, Optional, Sequence, Tuple
 
 from ebl.transliteration.domain.sign import Sign, SignName
 
 
 class SignRepository(ABC):
+    @property
+    def is_resident(self) -> bool:
+        # Resident repositories answer lookups from memory, so batching the
+        # lookups saves nothing.
+        return False
+
+    @abstractmethod
+    def create_indexes(self) -> None:
+        ...
+
     @abstractmethod
     def create(self, sign: Sign) -> str:
         ...
@@ -13,6 +23,14 @@ class SignRepository(ABC):
     def find(self, name: SignName) -> Sign:
         ...
 
+    @abstractmethod
+    def find_many(
+        self,
+        names: Collection[SignName],
+        readings: Collection[Tuple[str, Optional[int]]],
+    ) -> Sequence[Sign]:
+        ...
+
     @abstractmethod
     def search_by_id(self, query: str) -> Sequence[Sign]:
         ...
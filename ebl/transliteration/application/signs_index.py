@@ -0,0 +1,212 @@
+import itertools
+import math
+import os
+import threading
+import time
+from typing import (
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+import attr
+
+from ebl.transliteration.application.signs_suffix_array import SignsSuffixArray
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+
+REBUILD_THRESHOLD = 100
+SEARCH_LIMIT = 100
+VERSION_TTL = float(os.environ.get("EBL_SIGNS_INDEX_TTL", 10))
+
+Key = TypeVar("Key")
+
+
+def is_match(query: TransliterationQuery, signs: Sequence[str]) -> bool:
+    return any(query.match(document) for document in signs)
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class SignsSnapshot(Generic[Key]):
+    keys: Sequence[Key]
+    documents: Sequence[str]
+    owners: Sequence[int]
+    suffix_array: SignsSuffixArray
+    version: int
+
+    @staticmethod
+    def of(
+        entries: Iterable[Tuple[Key, Sequence[str]]], version: int
+    ) -> "SignsSnapshot[Key]":
+        keys = []
+        documents = []
+        owners = []
+        for owner, (key, signs) in enumerate(entries):
+            keys.append(key)
+            documents.extend(signs)
+            owners.extend(owner for _ in signs)
+        return SignsSnapshot(
+            keys, documents, owners, SignsSuffixArray(documents), version
+        )
+
+    def search(self, query: TransliterationQuery) -> List[Key]:
+        owners = sorted(
+            {
+                self.owners[index]
+                for index in self.suffix_array.find_candidates(query.literals).tolist()
+                if query.match(self.documents[index])
+            }
+        )
+        return [self.keys[owner] for owner in owners]
+
+
+class SignsIndex(Generic[Key]):
+    # Updates made through the index are searched directly until the next
+    # rebuild. Changes made by other processes are found by checking the
+    # stored version at most once per ttl seconds, the documents are then
+    # reloaded in the background.
+    def __init__(
+        self,
+        load: Callable[[], Iterable[Tuple[Key, Sequence[str]]]],
+        load_version: Callable[[], int] = lambda: 0,
+        rebuild_threshold: int = REBUILD_THRESHOLD,
+        limit: int = SEARCH_LIMIT,
+        ttl: float = VERSION_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._load = load
+        self._load_version = load_version
+        self._rebuild_threshold = rebuild_threshold
+        self._limit = limit
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._documents: Optional[Mapping[Key, Sequence[str]]] = None
+        self._snapshot: Optional[SignsSnapshot[Key]] = None
+        self._updated: Mapping[Key, int] = {}
+        self._version = 0
+        self._stored_version = 0
+        self._checked_at = -math.inf
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._reload_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def search(self, query: TransliterationQuery) -> List[Key]:
+        snapshot, documents, updated = self._get_state()
+        return list(
+            itertools.islice(
+                itertools.chain(
+                    (key for key in snapshot.search(query) if key not in updated),
+                    (key for key in updated if is_match(query, documents[key])),
+                ),
+                self._limit,
+            )
+        )
+
+    def update(self, key: Key, signs: Sequence[str]) -> None:
+        with self._lock:
+            if self._documents is not None:
+                # Copy on write so that readers can iterate without locking.
+                self._documents = {**self._documents, key: tuple(signs)}
+                self._version += 1
+                self._updated = {**self._updated, key: self._version}
+                if (
+                    len(self._updated) >= self._rebuild_threshold
+                    and self._rebuild_thread is None
+                ):
+                    self._rebuild_thread = threading.Thread(
+                        target=self._rebuild, daemon=True
+                    )
+                    self._rebuild_thread.start()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents = None
+            self._snapshot = None
+            self._updated = {}
+            self._checked_at = -math.inf
+
+    def join(self) -> None:
+        for thread in [self._reload_thread, self._rebuild_thread]:
+            if thread is not None:
+                thread.join()
+
+    def _get_state(
+        self,
+    ) -> Tuple[SignsSnapshot[Key], Mapping[Key, Sequence[str]], Mapping[Key, int]]:
+        with self._lock:
+            now = self._clock()
+            if self._documents is None or self._snapshot is None:
+                self._stored_version = self._load_version()
+                self._checked_at = now
+                self._documents = {key: tuple(signs) for key, signs in self._load()}
+                self._updated = {}
+                self._snapshot = SignsSnapshot.of(
+                    self._documents.items(), self._version
+                )
+            elif now >= self._checked_at + self._ttl and self._reload_thread is None:
+                self._checked_at = now
+                stored_version = self._load_version()
+                if stored_version != self._stored_version:
+                    self._reload_thread = threading.Thread(
+                        target=self._reload, args=(stored_version,), daemon=True
+                    )
+                    self._reload_thread.start()
+            return self._snapshot, self._documents, self._updated
+
+    def _reload(self, stored_version: int) -> None:
+        try:
+            with self._lock:
+                version = self._version
+            documents = {key: tuple(signs) for key, signs in self._load()}
+            snapshot = SignsSnapshot.of(documents.items(), version)
+            with self._lock:
+                if self._documents is not None:
+                    # Updates made during the reload are kept and searched
+                    # directly. The new version prevents a rebuild started
+                    # before the reload from replacing the snapshot.
+                    updated = {
+                        key: updated_version
+                        for key, updated_version in self._updated.items()
+                        if updated_version > version
+                    }
+                    self._documents = {
+                        **documents,
+                        **{key: self._documents[key] for key in updated},
+                    }
+                    self._version += 1
+                    self._snapshot = attr.evolve(snapshot, version=self._version)
+                    self._updated = updated
+                    self._stored_version = stored_version
+        finally:
+            with self._lock:
+                self._reload_thread = None
+
+    def _rebuild(self) -> None:
+        while True:
+            with self._lock:
+                documents = self._documents
+                version = self._version
+            snapshot = SignsSnapshot.of((documents or {}).items(), version)
+            with self._lock:
+                if self._snapshot is not None and self._snapshot.version < version:
+                    self._snapshot = snapshot
+                    self._updated = {
+                        key: updated_version
+                        for key, updated_version in self._updated.items()
+                        if updated_version > version
+                    }
+                if (
+                    self._snapshot is None
+                    or len(self._updated) < self._rebuild_threshold
+                ):
+                    self._rebuild_thread = None
+                    return
@@ -0,0 +1,97 @@
+from typing import Iterable, Mapping, Sequence, Tuple
+
+import numpy as np
+
+DEPTH = 32
+SEPARATOR = "\0"
+DELIMITERS = frozenset("/|")
+
+
+def encode_text(text: str) -> Tuple[np.ndarray, Mapping[str, int]]:
+    code_points = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    characters = np.unique(code_points)
+    characters = characters[characters != ord(SEPARATOR)]
+    # The largest code is kept free as the upper bound of prefix searches.
+    dtype = np.dtype(np.uint8 if len(characters) < 255 else ">u2")
+    codes = np.searchsorted(characters, code_points) + 1
+    codes[code_points == ord(SEPARATOR)] = 0
+    alphabet = {chr(character): code for code, character in enumerate(characters, 1)}
+    return codes.astype(dtype), alphabet
+
+
+def find_part_starts(codes: np.ndarray, alphabet: Mapping[str, int]) -> np.ndarray:
+    delimiter_codes = [
+        code
+        for character, code in alphabet.items()
+        if character in DELIMITERS or character.isspace()
+    ]
+    is_delimiter = np.isin(codes, [0, *delimiter_codes])
+    follows_delimiter = np.ones_like(is_delimiter)
+    follows_delimiter[1:] = is_delimiter[:-1]
+    return np.flatnonzero(~is_delimiter & follows_delimiter)
+
+
+class SignsSuffixArray:
+    # Only suffixes starting a sign part are sorted and only by their first
+    # DEPTH characters. Longer patterns are truncated, so the documents found
+    # are candidates which have to be verified.
+    def __init__(self, documents: Sequence[str]):
+        text = "".join(f"{document}{SEPARATOR}" for document in documents)
+        codes, self._alphabet = encode_text(text)
+        self._dtype = codes.dtype
+        self._document_starts = np.zeros(len(documents), dtype=np.int64)
+        np.cumsum(
+            [len(document) + 1 for document in documents[:-1]],
+            out=self._document_starts[1:],
+        )
+
+        positions = find_part_starts(codes, self._alphabet)
+        windows = np.zeros((len(positions), DEPTH), dtype=self._dtype)
+        for offset in range(DEPTH):
+            windows[:, offset] = codes[np.minimum(positions + offset, len(codes) - 1)]
+        keys = windows.view(f"S{DEPTH * self._dtype.itemsize}").ravel()
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._positions = positions[order]
+
+    def __len__(self) -> int:
+        return len(self._document_starts)
+
+    def count(self, pattern: str) -> int:
+        start, stop = self._find_range(pattern)
+        return stop - start
+
+    def find_documents(self, pattern: str) -> np.ndarray:
+        start, stop = self._find_range(pattern)
+        return np.unique(
+            np.searchsorted(
+                self._document_starts, self._positions[start:stop], side="right"
+            )
+            - 1
+        )
+
+    def find_candidates(self, patterns: Iterable[str]) -> np.ndarray:
+        # Patterns are matched at the start of a part, after any delimiters.
+        parts = {pattern.lstrip("".join(DELIMITERS)) for pattern in patterns}
+        candidates = np.arange(len(self))
+        for pattern in sorted(parts - {""}, key=self.count):
+            candidates = np.intersect1d(
+                candidates, self.find_documents(pattern), assume_unique=True
+            )
+            if not candidates.size:
+                break
+        return candidates
+
+    def _find_range(self, pattern: str) -> Tuple[int, int]:
+        try:
+            codes = [self._alphabet[character] for character in pattern[:DEPTH]]
+        except KeyError:
+            return 0, 0
+        prefix = np.array(codes, dtype=self._dtype).tobytes()
+        maximum = np.array(
+            [np.iinfo(self._dtype).max] * (DEPTH - len(codes)), dtype=self._dtype
+        ).tobytes()
+        return (
+            int(np.searchsorted(self._keys, prefix, side="left")),
+            int(np.searchsorted(self._keys, prefix + maximum, side="right")),
+        )
@@ -1,14 +1,16 @@
 import re
-from typing import Callable, MutableSequence, Optional, Sequence, TypeVar
+from typing import Callable, List, MutableSequence, Optional, Sequence, TypeVar
 
 import attr
 
 from ebl.errors import NotFoundError
+from ebl.transliteration.application.batch_sign_repository import BatchSignRepository
 from ebl.transliteration.application.sign_repository import SignRepository
 from ebl.transliteration.domain.atf import Flag, VARIANT_SEPARATOR
 from ebl.transliteration.domain.enclosure_tokens import Gloss
 from ebl.transliteration.domain.enclosure_type import EnclosureType
 from ebl.transliteration.domain.lark_parser import parse_compound_grapheme
+from ebl.transliteration.domain.line import Line
 from ebl.transliteration.domain.sign import Sign, SignName
 from ebl.transliteration.domain.sign_tokens import (
     CompoundGrapheme,
@@ -174,3 +176,25 @@ class SignsVisitor(TokenVisitor):
         for token in tokens:
             token.accept(sub_visitor)
         self._standardizations.extend(sub_visitor._standardizations)
+
+
+def _create_line_signs(sign_repository: SignRepository, line: Line) -> Sequence[str]:
+    visitor = SignsVisitor(sign_repository)
+    line.accept(visitor)
+    return visitor.result
+
+
+def create_signs(
+    sign_repository: SignRepository, lines: Sequence[Line]
+) -> List[Sequence[str]]:
+    if sign_repository.is_resident:
+        return [_create_line_signs(sign_repository, line) for line in lines]
+
+    # Signs are fetched in batches. A batch can reveal more signs to fetch,
+    # e.g. the parts of a compound sign, so the lines are visited until
+    # nothing is missing.
+    batch_repository = BatchSignRepository(sign_repository)
+    while True:
+        results = [_create_line_signs(batch_repository, line) for line in lines]
+        if not batch_repository.resolve():
+            return results
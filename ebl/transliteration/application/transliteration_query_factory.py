@@ -1,8 +1,8 @@
-from typing import Sequence, cast
+from typing import cast
 
 from ebl.errors import DataError
 from ebl.transliteration.application.sign_repository import SignRepository
-from ebl.transliteration.application.signs_visitor import SignsVisitor
+from ebl.transliteration.application.signs_visitor import create_signs
 from ebl.transliteration.domain.lark_parser import PARSE_ERRORS, parse_line
 from ebl.transliteration.domain.text_line import TextLine
 from ebl.transliteration.domain.transliteration_query import TransliterationQuery
@@ -13,14 +13,8 @@ class TransliterationQueryFactory:
         self._sign_repositoy = sign_repositoy
 
     def create(self, transliteration: str) -> TransliterationQuery:
-        signs = [self._create_signs(line) for line in transliteration.split("\n")]
-        return TransliterationQuery(signs)
-
-    def _create_signs(self, line: str) -> Sequence[str]:
-        visitor = SignsVisitor(self._sign_repositoy)
-        self._parse_line(line).accept(visitor)
-
-        return visitor.result
+        lines = [self._parse_line(line) for line in transliteration.split("\n")]
+        return TransliterationQuery(create_signs(self._sign_repositoy, lines))
 
     def _parse_line(self, line: str) -> TextLine:
         try:
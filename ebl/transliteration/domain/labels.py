@@ -5,11 +5,11 @@ from typing import Iterable, Sequence, Tuple, Union
 import attr
 import pydash
 import roman
-from lark.lark import Lark
 from lark.lexer import Token
 from lark.visitors import Transformer, v_args
 
 from ebl.transliteration.domain.atf import Object, Status, Surface
+from ebl.transliteration.domain.lark_parser_cache import get_atf_parser
 
 
 class DuplicateStatusError(ValueError):
@@ -200,14 +200,9 @@ class LabelTransformer(Transformer):
         return tuple(Status(token) for token in children)
 
 
-LABEL_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="labels"
-)
-
-
 def parse_labels(label: str) -> Sequence[Label]:
     if label:
-        tree = LABEL_PARSER.parse(label)
+        tree = get_atf_parser().parse(label, start="labels")
         return LabelTransformer().transform(tree)
     else:
         return tuple()
@@ -1,9 +1,10 @@
+from concurrent.futures import Executor
 from itertools import dropwhile
-from typing import Sequence, Tuple, Type
+from typing import List, Optional, Sequence, Tuple, Type, TypeVar
 
 import pydash
 from lark.exceptions import ParseError, UnexpectedInput, VisitError
-from lark.lark import Lark
+from lark.tree import Tree
 from lark.visitors import v_args
 
 from ebl.errors import DataError
@@ -14,12 +15,17 @@ from ebl.transliteration.domain.enclosure_error import EnclosureError
 from ebl.transliteration.domain.enclosure_visitor import EnclosureValidator
 from ebl.transliteration.domain.greek_tokens import GreekWord
 from ebl.transliteration.domain.labels import DuplicateStatusError
+from ebl.transliteration.domain.lark_parser_cache import (
+    get_atf_parser,
+    get_dollar_line_parser,
+)
 from ebl.transliteration.domain.line import ControlLine, EmptyLine, Line
 from ebl.transliteration.domain.line_number import AbstractLineNumber
 from ebl.transliteration.domain.note_line import NoteLine
 from ebl.transliteration.domain.note_line_transformer import NoteLineTransformer
 from ebl.transliteration.domain.parallel_line import ParallelLine
 from ebl.transliteration.domain.parallel_line_transformer import ParallelLineTransformer
+from ebl.transliteration.domain.parse_cache import PARSE_CACHE
 from ebl.transliteration.domain.sign_tokens import CompoundGrapheme
 from ebl.transliteration.domain.text import Text
 from ebl.transliteration.domain.text_line import TextLine
@@ -31,6 +37,12 @@ from ebl.transliteration.domain.translation_line_transformer import (
 )
 from ebl.transliteration.domain.word_tokens import Word
 
+# Smaller texts are parsed sequentially as the IPC would cost more than it saves.
+PARALLEL_THRESHOLD = 500
+PARALLEL_BATCH_SIZE = 100
+
+T = TypeVar("T")
+
 PARSE_ERRORS: Tuple[Type[Exception], ...] = (
     UnexpectedInput,
     ParseError,
@@ -55,79 +67,77 @@ class LineTransformer(
         return ControlLine(prefix, content)
 
 
-WORD_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="any_word"
-)
-NOTE_LINE_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="note_line"
-)
-PARALLEL_LINE_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="parallel_line"
-)
-TRANSLATION_LINE_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="translation_line"
-)
-PARATEXT_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="paratext"
-)
-CHAPTER_PARSER = Lark.open(
-    "ebl_atf.lark", maybe_placeholders=True, rel_to=__file__, start="chapter"
-)
-LINE_PARSER = Lark.open("ebl_atf.lark", maybe_placeholders=True, rel_to=__file__)
-
-
 def parse_word(atf: str) -> Word:
-    tree = WORD_PARSER.parse(atf)
+    tree = get_atf_parser().parse(atf, start="any_word")
     return LineTransformer().transform(tree)
 
 
 def parse_normalized_akkadian_word(atf: str) -> Word:
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__akkadian_word")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__akkadian_word")
     return LineTransformer().transform(tree)
 
 
 def parse_greek_word(atf: str) -> GreekWord:
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__greek_word")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__greek_word")
     return LineTransformer().transform(tree)
 
 
 def parse_compound_grapheme(atf: str) -> CompoundGrapheme:
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__compound_grapheme")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__compound_grapheme")
     return LineTransformer().transform(tree)
 
 
 def parse_erasure(atf: str) -> Sequence[EblToken]:
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__erasure")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__erasure")
     return LineTransformer().transform(tree)
 
 
 def parse_line(atf: str) -> Line:
-    tree = LINE_PARSER.parse(atf)
+    return PARSE_CACHE.get("start", atf, lambda: parse_line_uncached(atf))
+
+
+def parse_line_uncached(atf: str) -> Line:
+    tree = parse_dollar_line_lalr(atf)
+    if tree is None:
+        tree = get_atf_parser().parse(atf, start="start")
     return LineTransformer().transform(tree)
 
 
+def parse_dollar_line_lalr(atf: str) -> Optional[Tree]:
+    # Text and at lines stay on Earley: through _markup the strict and loose
+    # joiners collide (reduce/reduce) under LALR. So does "surface", which is
+    # both a scope and a generic surface. Dollar lines LALR cannot handle
+    # (e.g. loose ones) are left to Earley as well.
+    if not atf.startswith("$") or "surface" in atf:
+        return None
+    try:
+        return get_dollar_line_parser().parse(atf)
+    except (UnexpectedInput, ParseError):
+        return None
+
+
 def parse_note_line(atf: str) -> NoteLine:
-    tree = NOTE_LINE_PARSER.parse(atf)
+    tree = get_atf_parser().parse(atf, start="note_line")
     return LineTransformer().transform(tree)
 
 
 def parse_parallel_line(atf: str) -> ParallelLine:
-    tree = PARALLEL_LINE_PARSER.parse(atf)
+    tree = get_atf_parser().parse(atf, start="parallel_line")
     return LineTransformer().transform(tree)
 
 
 def parse_translation_line(atf: str) -> ParallelLine:
-    tree = TRANSLATION_LINE_PARSER.parse(atf)
+    tree = get_atf_parser().parse(atf, start="translation_line")
     return LineTransformer().transform(tree)
 
 
 def parse_text_line(atf: str) -> TextLine:
-    tree = LINE_PARSER.parse(atf, start="text_line")
+    tree = get_atf_parser().parse(atf, start="text_line")
     return LineTransformer().transform(tree)
 
 
 def parse_line_number(atf: str) -> AbstractLineNumber:
-    tree = LINE_PARSER.parse(atf, start="ebl_atf_text_line__line_number")
+    tree = get_atf_parser().parse(atf, start="ebl_atf_text_line__line_number")
     return LineTransformer().transform(tree)
 
 
@@ -137,7 +147,9 @@ def validate_line(line: Line) -> None:
     visitor.done()
 
 
-def parse_atf_lark(atf_):
+def parse_lines(
+    lines: Sequence[str], first_line_number: int
+) -> List[Tuple[Optional[Line], Optional[dict]]]:
     def parse_line_(line: str, line_number: int):
         try:
             parsed_line = parse_line(line) if line else EmptyLine()
@@ -146,6 +158,29 @@ def parse_atf_lark(atf_):
         except PARSE_ERRORS as ex:
             return (None, create_transliteration_error_data(ex, line, line_number))
 
+    return [
+        parse_line_(line, number)
+        for number, line in enumerate(lines, first_line_number)
+    ]
+
+
+def parse_lines_in_parallel(
+    lines: Sequence[str], executor: Executor
+) -> List[Tuple[Optional[Line], Optional[dict]]]:
+    batches = executor.map(
+        parse_lines, create_batches(lines), range(0, len(lines), PARALLEL_BATCH_SIZE)
+    )
+    return [pair for batch in batches for pair in batch]
+
+
+def create_batches(items: Sequence[T]) -> List[Sequence[T]]:
+    return [
+        items[start : start + PARALLEL_BATCH_SIZE]
+        for start in range(0, len(items), PARALLEL_BATCH_SIZE)
+    ]
+
+
+def parse_atf_lark(atf_, executor: Optional[Executor] = None):
     def check_errors(pairs):
         errors = [error for line, error in pairs if error is not None]
         if any(errors):
@@ -154,7 +189,11 @@ def parse_atf_lark(atf_):
     lines = atf_.split("\n")
     lines = list(dropwhile(lambda line: line == "", reversed(lines)))
     lines.reverse()
-    lines = [parse_line_(line, number) for number, line in enumerate(lines)]
+    lines = (
+        parse_lines_in_parallel(lines, executor)
+        if executor is not None and len(lines) >= PARALLEL_THRESHOLD
+        else parse_lines(lines, 0)
+    )
     check_errors(lines)
     lines = tuple(pair[0] for pair in lines)
 
@@ -0,0 +1,115 @@
+import functools
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+from typing import Sequence, Tuple
+
+import lark
+from lark.lark import Lark
+from lark.load_grammar import Grammar, load_grammar
+
+CACHE_DIRECTORY = os.environ.get(
+    "EBL_LARK_CACHE",
+    os.path.join(
+        os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        ),
+        "ebl-lark",
+    ),
+)
+ATF_GRAMMAR = os.path.join(os.path.dirname(__file__), "ebl_atf.lark")
+ATF_START_SYMBOLS = (
+    "start",
+    "any_word",
+    "chapter",
+    "labels",
+    "note_line",
+    "parallel_line",
+    "paratext",
+    "translation_line",
+    "ebl_atf_text_line__text",
+)
+
+
+class CompiledGrammar(Grammar):
+    def __init__(self, compiled: tuple):
+        self._compiled = compiled
+
+    def compile(self, start, terminals_to_keep) -> tuple:
+        return self._compiled
+
+
+def hash_grammar(path: str, start: Sequence[str], **options) -> str:
+    # Grammars import their siblings, so all of them are part of the key.
+    directory = os.path.dirname(path)
+    digest = hashlib.sha256()
+    digest.update(
+        f"{lark.__version__}|{path}|{start}|{sorted(options.items())}".encode()
+    )
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".lark"):
+            with open(os.path.join(directory, name), "rb") as file:
+                digest.update(name.encode())
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def compile_grammar(path: str, start: Sequence[str], **options) -> tuple:
+    with open(path, encoding="utf-8") as file:
+        grammar = load_grammar(
+            file.read(), path, [], options.get("keep_all_tokens", False)
+        )
+    return grammar.compile(list(start), set())
+
+
+def is_private(path: str) -> bool:
+    # Pickles can execute code, so only files nobody else can write are loaded.
+    status = os.stat(path)
+    return status.st_uid == os.getuid() and not status.st_mode & (
+        stat.S_IWGRP | stat.S_IWOTH
+    )
+
+
+def load_compiled_grammar(path: str, start: Sequence[str], **options) -> tuple:
+    cache_path = os.path.join(
+        CACHE_DIRECTORY, f"{hash_grammar(path, start, **options)}.pickle"
+    )
+    try:
+        if is_private(CACHE_DIRECTORY) and is_private(cache_path):
+            with open(cache_path, "rb") as file:
+                return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    compiled = compile_grammar(path, start, **options)
+
+    try:
+        os.makedirs(CACHE_DIRECTORY, mode=0o700, exist_ok=True)
+        if is_private(CACHE_DIRECTORY):
+            descriptor, temporary_path = tempfile.mkstemp(dir=CACHE_DIRECTORY)
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(compiled, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+    return compiled
+
+
+@functools.lru_cache(maxsize=None)
+def open_parser(path: str, start: Tuple[str, ...], **options) -> Lark:
+    return Lark(
+        CompiledGrammar(load_compiled_grammar(path, start, **options)),
+        start=list(start),
+        **options,
+    )
+
+
+def get_atf_parser() -> Lark:
+    return open_parser(ATF_GRAMMAR, ATF_START_SYMBOLS, maybe_placeholders=True)
+
+
+def get_dollar_line_parser() -> Lark:
+    return open_parser(
+        ATF_GRAMMAR, ("dollar_line",), parser="lalr", maybe_placeholders=True
+    )
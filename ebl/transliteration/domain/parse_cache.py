@@ -0,0 +1,60 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Tuple, TypeVar
+
+from ebl.cache import CacheInfo
+from ebl.transliteration.domain import atf
+
+MAX_SIZE = int(os.environ.get("EBL_PARSE_CACHE_SIZE", 5_000))
+
+T = TypeVar("T")
+
+
+class ParseCache:
+    # Parse results are keyed by the parser version, so that a version bump
+    # makes all earlier results unreachable.
+    def __init__(self, maxsize: int = MAX_SIZE):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+        self._version = atf.ATF_PARSER_VERSION
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, start: str, text: str, parse: Callable[[], T]) -> T:
+        key = (start, text, atf.ATF_PARSER_VERSION)
+        with self._lock:
+            if key[2] != self._version:
+                self._entries.clear()
+                self._version = key[2]
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+
+        result = parse()
+
+        with self._lock:
+            if self._maxsize > 0 and key[2] == self._version:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+        return result
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+PARSE_CACHE = ParseCache()
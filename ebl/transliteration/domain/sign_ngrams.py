@@ -0,0 +1,44 @@
+import re
+from typing import AbstractSet, Iterable, List, Sequence
+
+SIGN_SEPARATOR = re.compile(r"[/|]")
+WILDCARD = "*"
+
+
+def split_sign(sign: str) -> AbstractSet[str]:
+    return {part for part in SIGN_SEPARATOR.split(sign) if part}
+
+
+def create_line_ngrams(signs: Iterable[AbstractSet[str]]) -> AbstractSet[str]:
+    ngrams = set()
+    previous: AbstractSet[str] = set()
+    for current in signs:
+        ngrams |= current
+        ngrams |= {f"{first} {second}" for first in previous for second in current}
+        previous = current
+    return ngrams
+
+
+def create_sign_ngrams(signs: Iterable[str]) -> List[str]:
+    return sorted(
+        {
+            ngram
+            for text in signs
+            for line in text.split("\n")
+            for ngram in create_line_ngrams(split_sign(sign) for sign in line.split())
+        }
+    )
+
+
+def create_query_ngrams(signs: Sequence[Sequence[str]]) -> List[str]:
+    # A query sign matches alternatives and compound parts delimited by "/"
+    # or "|", so each of its parts is a part of the matched sign as well.
+    ngrams = {
+        ngram
+        for line in signs
+        for ngram in create_line_ngrams(
+            set() if sign == WILDCARD or re.search(r"\s", sign) else split_sign(sign)
+            for sign in line
+        )
+    }
+    return sorted(ngrams, key=lambda ngram: (" " not in ngram, ngram))
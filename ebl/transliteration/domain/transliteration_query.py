@@ -1,9 +1,11 @@
 import re
-from itertools import chain
-from typing import Sequence, Tuple
+from bisect import bisect_left
+from typing import AbstractSet, List, Pattern, Sequence, Tuple
 
 import attr
 
+from ebl.transliteration.domain.sign_ngrams import WILDCARD, create_query_ngrams
+
 
 def create_sign_regexp(sign):
     return r"[^\s]+" if sign == "*" else fr"([^\s]+\/)*{re.escape(sign)}(\/[^\s]+)*"
@@ -14,27 +16,58 @@ def create_line_regexp(line):
     return fr"(?<![^|\s]){signs_regexp}"
 
 
+def create_regexp(signs: Sequence[Sequence[str]]) -> str:
+    lines_regexp = r"( .*)?\n.*".join(create_line_regexp(line) for line in signs)
+
+    return fr"{lines_regexp}(?![^|\s])"
+
+
+def create_line_offsets(signs: str) -> Sequence[int]:
+    return [match.start() for match in re.finditer("\n", signs)]
+
+
 def get_line_number(signs: str, position: int) -> int:
-    return len([char for char in chain.from_iterable(signs[:position]) if char == "\n"])
+    return bisect_left(create_line_offsets(signs), position)
 
 
 @attr.s(auto_attribs=True, frozen=True)
 class TransliterationQuery:
     _signs: Sequence[Sequence[str]]
+    _pattern: Pattern = attr.ib(
+        init=False,
+        eq=False,
+        repr=False,
+        default=attr.Factory(
+            lambda self: re.compile(create_regexp(self._signs)), takes_self=True
+        ),
+    )
 
     @property
     def regexp(self) -> str:
-        lines_regexp = r"( .*)?\n.*".join(
-            create_line_regexp(line) for line in self._signs
-        )
+        return self._pattern.pattern
+
+    @property
+    def ngrams(self) -> List[str]:
+        return create_query_ngrams(self._signs)
 
-        return fr"{lines_regexp}(?![^|\s])"
+    @property
+    def literals(self) -> AbstractSet[str]:
+        return {
+            sign
+            for line in self._signs
+            for sign in line
+            if sign and sign != WILDCARD and not re.search(r"\s", sign)
+        }
 
     def is_empty(self) -> bool:
         return "".join(token for row in self._signs for token in row).strip() == ""
 
     def match(self, signs: str) -> Sequence[Tuple[int, int]]:
+        line_offsets = create_line_offsets(signs)
         return [
-            (get_line_number(signs, match.start()), get_line_number(signs, match.end()))
-            for match in re.finditer(self.regexp, signs)
+            (
+                bisect_left(line_offsets, match.start()),
+                bisect_left(line_offsets, match.end()),
+            )
+            for match in self._pattern.finditer(signs)
         ]
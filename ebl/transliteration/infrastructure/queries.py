@@ -0,0 +1,24 @@
+from typing import Iterable
+
+from ebl.transliteration.domain.sign_ngrams import create_sign_ngrams
+from ebl.transliteration.domain.transliteration_query import TransliterationQuery
+
+SIGN_NGRAMS = "signNgrams"
+
+
+def sign_ngrams(signs: Iterable[str]) -> dict:
+    return {SIGN_NGRAMS: create_sign_ngrams(signs)}
+
+
+def match_signs(query: TransliterationQuery) -> dict:
+    ngrams = query.ngrams
+    # Documents saved before the n-grams were added are checked with the
+    # regular expression only.
+    return {
+        "signs": {"$regex": query.regexp},
+        **(
+            {"$or": [{SIGN_NGRAMS: {"$all": ngrams}}, {SIGN_NGRAMS: None}]}
+            if ngrams
+            else {}
+        ),
+    }
@@ -0,0 +1,27 @@
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from ebl.mongo_collection import MongoCollection
+
+COLLECTION = "signs_versions"
+
+
+class SignsVersions:
+    # Counts the changes of the signs stored in a collection so that
+    # in-memory indexes of other processes can tell when to reload.
+    def __init__(self, database: Database, collection: str):
+        self._versions = MongoCollection(database, COLLECTION)
+        self._collection = collection
+
+    def find(self) -> int:
+        document = next(self._versions.find_many({"_id": self._collection}), None)
+        return document["version"] if document else 0
+
+    def bump(self) -> None:
+        self._versions.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": self._collection}, {"$inc": {"version": 1}}, upsert=True
+                )
+            ]
+        )
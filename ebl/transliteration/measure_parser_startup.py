@@ -0,0 +1,45 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+IMPORT = "import ebl.transliteration.domain.lark_parser"
+PARSE = f"{IMPORT} as lark_parser; lark_parser.parse_atf_lark('1. a')"
+
+
+def measure(script: str, cache_directory: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        env={**os.environ, "EBL_LARK_CACHE": cache_directory},
+    )
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Number of runs per case"
+    )
+    args = parser.parse_args()
+
+    cold = []
+    warm = []
+    imports = []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_directory = os.path.join(directory, "cache")
+            cold.append(measure(PARSE, cache_directory))
+            warm.append(measure(PARSE, cache_directory))
+            imports.append(measure(IMPORT, cache_directory))
+
+    for name, times in [
+        ("import", imports),
+        ("first parse, empty cache", cold),
+        ("first parse, warm cache", warm),
+    ]:
+        print(f"{name}: {statistics.median(times):.2f} s")